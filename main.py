@@ -13,6 +13,7 @@ sys.path.append(str(Path(__file__).parent / "src"))
 
 from utils.logger import setup_logger
 from utils.config import load_config
+from crawlers.base_crawler import BaseCrawler
 from crawlers.github_crawler import GitHubCrawler
 from crawlers.producthunt_crawler import ProductHuntCrawler
 from ai_analysis.classifier import AIProjectClassifier
@@ -54,8 +55,12 @@ class AITrendingRadar:
         try:
             # 1. 数据抓取
             self.logger.info("步骤1: 开始数据抓取...")
-            github_data = await self.github_crawler.crawl()
-            producthunt_data = await self.producthunt_crawler.crawl()
+            try:
+                github_data = await self.github_crawler.crawl()
+                producthunt_data = await self.producthunt_crawler.crawl()
+            finally:
+                # 所有爬虫共用一个会话，抓取结束后统一关闭
+                await BaseCrawler.close_shared_session()
             
             # 2. 数据合并和清洗
             self.logger.info("步骤2: 数据清洗和标准化...")
@@ -140,6 +145,12 @@ class AITrendingRadar:
                 'error': str(e)
             }
     
+    def close(self):
+        """释放数据库连接等资源"""
+        self.storage.close()
+        self.daily_records.close()
+        self.history_generator.records_manager.close()
+    
     async def run_analysis_only(self, data_file: str):
         """仅运行AI分析（用于测试）"""
         self.logger.info(f"开始分析数据文件: {data_file}")
@@ -184,22 +195,26 @@ async def main():
     
     radar = AITrendingRadar()
     
-    if args.mode == "daily":
-        result = await radar.run_daily_update()
-        if result['success']:
-            print(f"✅ 每日更新成功！发现 {result['ai_projects_count']} 个AI项目")
-            print(f"📊 报告路径: {result['report_path']}")
-        else:
-            print(f"❌ 更新失败: {result['error']}")
-            sys.exit(1)
-    
-    elif args.mode == "analysis":
-        if not args.data_file:
-            print("❌ 分析模式需要指定 --data-file 参数")
-            sys.exit(1)
+    try:
+        if args.mode == "daily":
+            result = await radar.run_daily_update()
+            
+            if result['success']:
+                print(f"✅ 每日更新成功！发现 {result['ai_projects_count']} 个AI项目")
+                print(f"📊 报告路径: {result['report_path']}")
+            else:
+                print(f"❌ 更新失败: {result['error']}")
+                sys.exit(1)
         
-        ai_projects = await radar.run_analysis_only(args.data_file)
-        print(f"✅ 分析完成！发现 {len(ai_projects)} 个AI项目")
+        elif args.mode == "analysis":
+            if not args.data_file:
+                print("❌ 分析模式需要指定 --data-file 参数")
+                sys.exit(1)
+            
+            ai_projects = await radar.run_analysis_only(args.data_file)
+            print(f"✅ 分析完成！发现 {len(ai_projects)} 个AI项目")
+    finally:
+        radar.close()
 
 
 if __name__ == "__main__":
@@ -15,6 +15,7 @@ sys.path.append(str(Path(__file__).parent / "src"))
 from utils.config import load_config
 from utils.logger import setup_logger
 from utils.data_cleaner import DataCleaner
+from crawlers.base_crawler import BaseCrawler
 from crawlers.github_crawler import GitHubCrawler
 from ai_analysis.free_classifier import FreeAIClassifier
 from visualization.report_generator import ReportGenerator
@@ -59,7 +60,11 @@ class FreeAITrendingRadar:
             
             # 1. 爬取数据
             self.logger.info("🕷️ 开始爬取GitHub数据...")
-            github_data = await self.github_crawler.crawl()
+            try:
+                github_data = await self.github_crawler.crawl()
+            finally:
+                # 爬虫共用的HTTP会话在抓取结束后关闭
+                await BaseCrawler.close_shared_session()
             self.logger.info(f"GitHub爬取完成: {len(github_data)} 个项目")
             
             # 2. 数据清洗
@@ -2,19 +2,61 @@
 基础爬虫类
 """
 
+import os
 import asyncio
 import aiohttp
 import time
+from concurrent.futures import ProcessPoolExecutor
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from loguru import logger
 
+try:
+    from ..utils.bloom_filter import BloomFilter
+except ImportError:
+    # 如果相对导入失败，尝试绝对导入
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).parent.parent))
+    from utils.bloom_filter import BloomFilter
+
+
+# 子进程内缓存的爬虫实例，避免每页重复初始化
+_worker_crawlers: Dict[type, "BaseCrawler"] = {}
+
+
+def _parse_project_list_in_worker(crawler_cls: type, config: Dict[str, Any],
+                                  html: str, now_iso: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    在解析进程池中执行项目列表解析（模块级函数，便于pickle）
+    
+    Args:
+        crawler_cls: 爬虫类
+        config: 配置字典
+        html: HTML内容
+        now_iso: 本批次统一使用的ISO时间戳
+    
+    Returns:
+        项目数据列表
+    """
+    crawler = _worker_crawlers.get(crawler_cls)
+    if crawler is None:
+        # 子进程只负责解析：不加载跨运行去重过滤器，也不再创建嵌套的进程池
+        crawler_config = {**config.get('crawler', {}), 'parse_only': True}
+        crawler = crawler_cls({**config, 'crawler': crawler_config})
+        _worker_crawlers[crawler_cls] = crawler
+    return crawler.parse_project_list(html, now_iso)
+
 
 class BaseCrawler(ABC):
     """基础爬虫抽象类"""
     
+    # 所有爬虫共享的HTTP会话，复用连接池中的keep-alive连接
+    _shared_session: Optional[aiohttp.ClientSession] = None
+    _shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+    
     def __init__(self, config: Dict[str, Any]):
         """
         初始化爬虫
@@ -30,9 +72,31 @@ class BaseCrawler(ABC):
         self.timeout = self.request_config.get('timeout', 30)
         self.retry_times = self.request_config.get('retry_times', 3)
         self.delay = self.request_config.get('delay_between_requests', 1)
+        self.max_concurrency = self.request_config.get('max_concurrency', 10)
         self.user_agent = self.request_config.get('user_agent', 
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
         
+        # 仅用于解析的实例（解析子进程内创建），跳过过滤器加载与初始化日志
+        self.parse_only = self.crawler_config.get('parse_only', False)
+        
+        # 解析进程池配置（0表示在事件循环中直接解析）
+        self.parse_workers = self.crawler_config.get('parse_workers', os.cpu_count() or 1)
+        if self.parse_only:
+            self.parse_workers = 0
+        self._parse_pool = None
+        
+        # 跨运行URL去重配置（默认关闭，开启后只保留之前运行未见过的项目）
+        self.seen_filter_config = self.crawler_config.get('seen_filter', {})
+        self.seen_filter_enabled = self.seen_filter_config.get('enabled', False) and not self.parse_only
+        self.seen_filter_path = self.seen_filter_config.get('path', 'data/seen_urls.bloom')
+        self.seen_urls = None
+        if self.seen_filter_enabled:
+            self.seen_urls = BloomFilter.load(
+                self.seen_filter_path,
+                capacity=self.seen_filter_config.get('capacity', 100000),
+                error_rate=self.seen_filter_config.get('error_rate', 0.001)
+            )
+        
         # 会话配置
         self.session = None
         self.headers = {
@@ -43,18 +107,81 @@ class BaseCrawler(ABC):
             'Connection': 'keep-alive',
         }
     
+    @classmethod
+    async def get_shared_session(cls, max_concurrency: int = 10) -> aiohttp.ClientSession:
+        """
+        获取整个爬取过程共享的会话，不存在、已失效或属于其他事件循环时创建
+        
+        Args:
+            max_concurrency: 连接池最大连接数
+        
+        Returns:
+            共享的ClientSession
+        """
+        loop = asyncio.get_running_loop()
+        session = BaseCrawler._shared_session
+        
+        if session is not None and BaseCrawler._shared_session_loop is not loop:
+            # 旧会话绑定在其他事件循环上，替换前先关闭
+            await cls.close_shared_session()
+            session = None
+        
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=max_concurrency, keepalive_timeout=30)
+            BaseCrawler._shared_session = aiohttp.ClientSession(connector=connector)
+            BaseCrawler._shared_session_loop = loop
+            logger.debug(f"创建共享HTTP会话 - 最大连接数: {max_concurrency}")
+        
+        return BaseCrawler._shared_session
+    
+    @classmethod
+    async def close_shared_session(cls) -> None:
+        """关闭共享会话，应在程序退出前调用一次"""
+        session = BaseCrawler._shared_session
+        BaseCrawler._shared_session = None
+        BaseCrawler._shared_session_loop = None
+        
+        if session and not session.closed:
+            try:
+                await session.close()
+            except RuntimeError as e:
+                # 会话所属的事件循环已关闭，其连接已随之失效
+                logger.debug(f"关闭共享HTTP会话失败: {e}")
+    
     async def __aenter__(self):
         """异步上下文管理器入口"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout),
-            headers=self.headers
-        )
+        self.session = await self.get_shared_session(self.max_concurrency)
+        if self.parse_workers > 0:
+            self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """异步上下文管理器出口"""
-        if self.session:
-            await self.session.close()
+        """异步上下文管理器出口（共享会话由close_shared_session统一关闭）"""
+        self.session = None
+        if self._parse_pool:
+            self._parse_pool.shutdown(wait=True)
+            self._parse_pool = None
+    
+    async def parse_project_list_async(self, html: str,
+                                       now_iso: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        异步解析项目列表，HTML解析是CPU密集型任务，放到进程池中执行以免阻塞事件循环
+        
+        Args:
+            html: HTML内容
+            now_iso: 本批次统一使用的ISO时间戳
+        
+        Returns:
+            项目数据列表
+        """
+        if self._parse_pool is None:
+            return self.parse_project_list(html, now_iso)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._parse_pool, _parse_project_list_in_worker,
+            type(self), self.config, html, now_iso
+        )
     
     async def fetch_page(self, url: str, **kwargs) -> Optional[str]:
         """
@@ -71,6 +198,9 @@ class BaseCrawler(ABC):
             try:
                 logger.debug(f"正在获取页面: {url} (尝试 {attempt + 1}/{self.retry_times})")
                 
+                kwargs.setdefault('headers', self.headers)
+                kwargs.setdefault('timeout', aiohttp.ClientTimeout(total=self.timeout))
+                
                 async with self.session.get(url, **kwargs) as response:
                     if response.status == 200:
                         content = await response.text()
@@ -96,17 +226,18 @@ class BaseCrawler(ABC):
         logger.error(f"获取页面失败，已达到最大重试次数: {url}")
         return None
     
-    def parse_html(self, html: str) -> BeautifulSoup:
+    def parse_html(self, html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
         """
         解析HTML内容
         
         Args:
             html: HTML字符串
+            parse_only: 只构建匹配部分的SoupStrainer，默认解析整个页面
         
         Returns:
             BeautifulSoup对象
         """
-        return BeautifulSoup(html, 'lxml')
+        return BeautifulSoup(html, 'lxml', parse_only=parse_only)
     
     def extract_text(self, element, default: str = "") -> str:
         """
@@ -162,6 +293,32 @@ class BaseCrawler(ABC):
         
         return url
     
+    def filter_seen_projects(self, projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        过滤之前运行中已见过的项目，并记录本次新项目的URL
+        
+        Args:
+            projects: 已去重的项目列表
+        
+        Returns:
+            新项目列表（未开启时原样返回）
+        """
+        if self.seen_urls is None:
+            return projects
+        
+        seen_urls = self.seen_urls
+        new_projects = [p for p in projects if p.get('url') and p['url'] not in seen_urls]
+        seen_urls.update(p['url'] for p in new_projects)
+        seen_urls.save(self.seen_filter_path)
+        
+        logger.info(f"跨运行去重: 跳过 {len(projects) - len(new_projects)} 个已见过的项目")
+        
+        # 过滤器容量固定，超出后误判率持续升高，需要调大capacity并删除旧文件重建
+        capacity = self.seen_filter_config.get('capacity', 100000)
+        if len(seen_urls) > capacity:
+            logger.warning(f"跨运行去重过滤器已记录 {len(seen_urls)} 个URL，超过容量 {capacity}，误判率将升高")
+        return new_projects
+    
     def standardize_project_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         标准化项目数据格式
@@ -198,12 +355,13 @@ class BaseCrawler(ABC):
         pass
     
     @abstractmethod
-    def parse_project_list(self, html: str) -> List[Dict[str, Any]]:
+    def parse_project_list(self, html: str, now_iso: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         解析项目列表页面（抽象方法）
         
         Args:
             html: HTML内容
+            now_iso: 本批次统一使用的ISO时间戳，默认为当前时间
         
         Returns:
             项目数据列表
@@ -4,14 +4,20 @@ GitHub Trending爬虫
 
 import re
 import asyncio
+from functools import lru_cache
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from urllib.parse import urljoin
+from bs4 import SoupStrainer
 from loguru import logger
 
 from .base_crawler import BaseCrawler
 
 
+# 只构建项目条目的子树，跳过导航、页脚等无关内容
+PROJECT_ITEM_STRAINER = SoupStrainer('article', attrs={'class': re.compile(r'\bBox-row\b')})
+
+
 class GitHubCrawler(BaseCrawler):
     """GitHub Trending爬虫"""
     
@@ -31,7 +37,8 @@ class GitHubCrawler(BaseCrawler):
         self.time_ranges = self.github_config.get('time_ranges', ['daily'])
         self.max_pages = self.github_config.get('max_pages', 1)
         
-        logger.info(f"GitHub爬虫初始化完成 - 语言: {self.languages}, 时间范围: {self.time_ranges}")
+        if not self.parse_only:
+            logger.info(f"GitHub爬虫初始化完成 - 语言: {self.languages}, 时间范围: {self.time_ranges}")
     
     async def crawl(self) -> List[Dict[str, Any]]:
         """
@@ -58,6 +65,7 @@ class GitHubCrawler(BaseCrawler):
         
         # 去重（基于URL）
         unique_projects = self._deduplicate_projects(all_projects)
+        unique_projects = self.filter_seen_projects(unique_projects)
         
         logger.info(f"GitHub爬取完成，共获取 {len(unique_projects)} 个项目")
         return unique_projects
@@ -83,7 +91,10 @@ class GitHubCrawler(BaseCrawler):
                 logger.warning(f"无法获取页面: {url}")
                 break
             
-            page_projects = self.parse_project_list(html)
+            # 同一页的项目共用一个时间戳
+            now_iso = datetime.now().isoformat()
+            
+            page_projects = await self.parse_project_list_async(html, now_iso)
             if not page_projects:
                 logger.info(f"第 {page} 页没有更多项目，停止爬取")
                 break
@@ -94,7 +105,7 @@ class GitHubCrawler(BaseCrawler):
                     'source': 'github',
                     'language_filter': language,
                     'time_range': time_range,
-                    'crawled_at': datetime.now().isoformat()
+                    'crawled_at': now_iso
                 })
             
             projects.extend(page_projects)
@@ -131,17 +142,21 @@ class GitHubCrawler(BaseCrawler):
         
         return url
 
-    def parse_project_list(self, html: str) -> List[Dict[str, Any]]:
+    def parse_project_list(self, html: str, now_iso: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         解析GitHub Trending项目列表页面
 
         Args:
             html: HTML内容
+            now_iso: 本批次统一使用的ISO时间戳，默认为当前时间
 
         Returns:
             项目数据列表
         """
-        soup = self.parse_html(html)
+        if now_iso is None:
+            now_iso = datetime.now().isoformat()
+
+        soup = self.parse_html(html, parse_only=PROJECT_ITEM_STRAINER)
         projects = []
 
         # 查找项目容器
@@ -149,7 +164,7 @@ class GitHubCrawler(BaseCrawler):
 
         for item in project_items:
             try:
-                project_data = self._parse_project_item(item)
+                project_data = self._parse_project_item(item, now_iso)
                 if project_data:
                     projects.append(project_data)
             except Exception as e:
@@ -158,12 +173,13 @@ class GitHubCrawler(BaseCrawler):
 
         return projects
 
-    def _parse_project_item(self, item) -> Dict[str, Any]:
+    def _parse_project_item(self, item, now_iso: Optional[str] = None) -> Dict[str, Any]:
         """
         解析单个项目条目
 
         Args:
             item: BeautifulSoup项目元素
+            now_iso: ISO时间戳，默认为当前时间
 
         Returns:
             项目数据字典
@@ -225,13 +241,15 @@ class GitHubCrawler(BaseCrawler):
             'language': language,
             'author': author,
             'tags': [language] if language else [],
-            'updated_at': datetime.now().isoformat(),
+            'updated_at': now_iso or datetime.now().isoformat(),
             'source': 'github'
         })
 
-    def _parse_star_count(self, text: str) -> int:
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _parse_star_count(text: str) -> int:
         """
-        解析星标数文本
+        解析星标数文本（纯函数，结果按文本缓存）
 
         Args:
             text: 星标数文本 (如 "1.2k", "15", "3.4m")
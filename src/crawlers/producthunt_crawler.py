@@ -4,14 +4,44 @@ Product Hunt爬虫
 
 import re
 import asyncio
+from functools import lru_cache
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from urllib.parse import urljoin
+import soupsieve as sv
 from loguru import logger
 
 from .base_crawler import BaseCrawler
 
 
+def _compile_selector_chain(*levels: str):
+    """
+    编译按优先级排列的CSS选择器链
+    
+    联合选择器只遍历一次子树，再按优先级从匹配结果中挑选，
+    语义与 find(...) or find(...) 一致
+    
+    Args:
+        *levels: 按优先级排列的选择器（单级内可用逗号并列）
+    
+    Returns:
+        (联合选择器, 各级选择器列表)
+    """
+    return sv.compile(', '.join(levels)), [sv.compile(level) for level in levels]
+
+
+ITEM_SELECTORS = _compile_selector_chain(
+    'div[data-test="post-item"]', 'div[class*="post"], div[class*="product"]')
+TITLE_SELECTORS = _compile_selector_chain('a[href*="/posts/"]', 'h3', 'h2')
+DESCRIPTION_SELECTORS = _compile_selector_chain(
+    'p', 'div[class*="description"], div[class*="tagline"]')
+VOTE_SELECTORS = _compile_selector_chain('span[class*="vote"]', 'div[data-test="vote-button"]')
+TAG_SELECTORS = _compile_selector_chain(
+    'span[class*="tag"], span[class*="topic"]', 'a[href*="/topics/"]')
+AUTHOR_SELECTORS = _compile_selector_chain(
+    'a[href*="/@"]', 'span[class*="maker"], span[class*="author"]')
+
+
 class ProductHuntCrawler(BaseCrawler):
     """Product Hunt爬虫"""
     
@@ -30,7 +60,8 @@ class ProductHuntCrawler(BaseCrawler):
         self.categories = self.ph_config.get('categories', ['artificial-intelligence'])
         self.max_items = self.ph_config.get('max_items', 50)
         
-        logger.info(f"Product Hunt爬虫初始化完成 - 分类: {self.categories}")
+        if not self.parse_only:
+            logger.info(f"Product Hunt爬虫初始化完成 - 分类: {self.categories}")
     
     async def crawl(self) -> List[Dict[str, Any]]:
         """
@@ -60,6 +91,7 @@ class ProductHuntCrawler(BaseCrawler):
         
         # 去重（基于URL）
         unique_projects = self._deduplicate_projects(all_projects)
+        unique_projects = self.filter_seen_projects(unique_projects)
         
         logger.info(f"Product Hunt爬取完成，共获取 {len(unique_projects)} 个项目")
         return unique_projects
@@ -78,14 +110,15 @@ class ProductHuntCrawler(BaseCrawler):
             logger.warning(f"无法获取今日页面: {url}")
             return []
         
-        projects = self.parse_project_list(html)
+        now_iso = datetime.now().isoformat()
+        projects = await self.parse_project_list_async(html, now_iso)
         
         # 添加元数据
         for project in projects:
             project.update({
                 'source': 'producthunt',
                 'category': 'today',
-                'crawled_at': datetime.now().isoformat()
+                'crawled_at': now_iso
             })
         
         logger.debug(f"今日页面获取到 {len(projects)} 个项目")
@@ -108,40 +141,44 @@ class ProductHuntCrawler(BaseCrawler):
             logger.warning(f"无法获取分类页面: {url}")
             return []
         
-        projects = self.parse_project_list(html)
+        now_iso = datetime.now().isoformat()
+        projects = await self.parse_project_list_async(html, now_iso)
         
         # 添加元数据
         for project in projects:
             project.update({
                 'source': 'producthunt',
                 'category': category,
-                'crawled_at': datetime.now().isoformat()
+                'crawled_at': now_iso
             })
         
         logger.debug(f"分类 {category} 获取到 {len(projects)} 个项目")
         return projects
     
-    def parse_project_list(self, html: str) -> List[Dict[str, Any]]:
+    def parse_project_list(self, html: str, now_iso: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         解析Product Hunt项目列表页面
         
         Args:
             html: HTML内容
+            now_iso: 本批次统一使用的ISO时间戳，默认为当前时间
         
         Returns:
             项目数据列表
         """
+        if now_iso is None:
+            now_iso = datetime.now().isoformat()
+        
         soup = self.parse_html(html)
         projects = []
         
         # 查找项目容器 - Product Hunt的结构可能会变化，这里提供基础解析
         # 实际使用时可能需要根据页面结构调整选择器
-        project_items = soup.find_all('div', {'data-test': 'post-item'}) or \
-                       soup.find_all('div', class_=re.compile(r'post|product'))
+        project_items = self._select_all_first(soup, ITEM_SELECTORS)
         
         for item in project_items[:self.max_items]:
             try:
-                project_data = self._parse_project_item(item)
+                project_data = self._parse_project_item(item, now_iso)
                 if project_data:
                     projects.append(project_data)
             except Exception as e:
@@ -150,19 +187,19 @@ class ProductHuntCrawler(BaseCrawler):
         
         return projects
     
-    def _parse_project_item(self, item) -> Dict[str, Any]:
+    def _parse_project_item(self, item, now_iso: Optional[str] = None) -> Dict[str, Any]:
         """
         解析单个项目条目
         
         Args:
             item: BeautifulSoup项目元素
+            now_iso: ISO时间戳，默认为当前时间
         
         Returns:
             项目数据字典
         """
         # 项目名称和URL
-        title_elem = item.find('a', href=re.compile(r'/posts/')) or \
-                    item.find('h3') or item.find('h2')
+        title_elem = self._select_first(item, TITLE_SELECTORS)
         
         if not title_elem:
             return None
@@ -171,21 +208,19 @@ class ProductHuntCrawler(BaseCrawler):
         url = self.normalize_url(self.extract_attr(title_elem, 'href'), self.base_url)
         
         # 项目描述
-        desc_elem = item.find('p') or item.find('div', class_=re.compile(r'description|tagline'))
+        desc_elem = self._select_first(item, DESCRIPTION_SELECTORS)
         description = self.extract_text(desc_elem)
         
         # 投票数/点赞数
         votes = 0
-        vote_elem = item.find('span', class_=re.compile(r'vote|upvote')) or \
-                   item.find('div', {'data-test': 'vote-button'})
+        vote_elem = self._select_first(item, VOTE_SELECTORS)
         if vote_elem:
             vote_text = self.extract_text(vote_elem)
             votes = self._parse_vote_count(vote_text)
         
         # 标签
         tags = []
-        tag_elems = item.find_all('span', class_=re.compile(r'tag|topic')) or \
-                   item.find_all('a', href=re.compile(r'/topics/'))
+        tag_elems = self._select_all_first(item, TAG_SELECTORS)
         for tag_elem in tag_elems:
             tag = self.extract_text(tag_elem)
             if tag and tag not in tags:
@@ -193,8 +228,7 @@ class ProductHuntCrawler(BaseCrawler):
         
         # 作者/制作者
         author = ""
-        author_elem = item.find('a', href=re.compile(r'/@')) or \
-                     item.find('span', class_=re.compile(r'maker|author'))
+        author_elem = self._select_first(item, AUTHOR_SELECTORS)
         if author_elem:
             author = self.extract_text(author_elem)
         
@@ -207,13 +241,55 @@ class ProductHuntCrawler(BaseCrawler):
             'language': '',  # Product Hunt通常不显示编程语言
             'author': author,
             'tags': tags,
-            'updated_at': datetime.now().isoformat(),
+            'updated_at': now_iso or datetime.now().isoformat(),
             'source': 'producthunt'
         })
     
-    def _parse_vote_count(self, text: str) -> int:
+    @staticmethod
+    def _select_first(element, chain):
+        """
+        按优先级选择第一个匹配的元素
+        
+        Args:
+            element: BeautifulSoup元素
+            chain: _compile_selector_chain编译的选择器链
+        
+        Returns:
+            匹配的元素，没有则返回None
+        """
+        union, levels = chain
+        matches = union.select(element)
+        for level in levels:
+            for match in matches:
+                if level.match(match):
+                    return match
+        return None
+    
+    @staticmethod
+    def _select_all_first(element, chain) -> list:
+        """
+        返回优先级最高的非空匹配组
+        
+        Args:
+            element: BeautifulSoup元素
+            chain: _compile_selector_chain编译的选择器链
+        
+        Returns:
+            匹配的元素列表
+        """
+        union, levels = chain
+        matches = union.select(element)
+        for level in levels:
+            group = [match for match in matches if level.match(match)]
+            if group:
+                return group
+        return []
+    
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _parse_vote_count(text: str) -> int:
         """
-        解析投票数文本
+        解析投票数文本（纯函数，结果按文本缓存）
         
         Args:
             text: 投票数文本
@@ -0,0 +1,166 @@
+"""
+布隆过滤器模块
+"""
+
+import os
+import math
+import struct
+import hashlib
+from pathlib import Path
+from typing import Iterable, Optional, Tuple, Union
+
+from loguru import logger
+
+
+class BloomFilter:
+    """基于bytearray的布隆过滤器，用于跨运行记录已见过的URL"""
+
+    # 文件头: 位数组长度(m) + 哈希函数个数(k) + 已添加元素数
+    _HEADER = struct.Struct('<QII')
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        """
+        初始化布隆过滤器
+
+        Args:
+            capacity: 预期容纳的元素数量
+            error_rate: 可接受的误判率
+        """
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        
+        # 从文件加载或上次保存时的元素数，保存时据此合并其他实例新增的元素数
+        self._saved_count = 0
+
+    def _positions(self, item: str):
+        """
+        计算元素对应的位位置（双重哈希）
+
+        Args:
+            item: 元素字符串
+
+        Returns:
+            位位置生成器
+        """
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, item: str) -> None:
+        """
+        添加元素
+
+        Args:
+            item: 元素字符串
+        """
+        bits = self.bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        """
+        批量添加元素
+
+        Args:
+            items: 元素可迭代对象
+        """
+        for item in items:
+            self.add(item)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        保存到文件，文件已存在且参数相同时先与其按位或合并，
+        避免多个实例（如不同爬虫）先后保存时覆盖彼此新增的元素
+
+        Args:
+            path: 文件路径
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        saved = self._read(path)
+        if saved is not None:
+            num_bits, num_hashes, count, bits = saved
+            if (num_bits, num_hashes) == (self.num_bits, self.num_hashes) and len(bits) == len(self.bits):
+                merged = int.from_bytes(self.bits, 'little') | int.from_bytes(bits, 'little')
+                self.bits = bytearray(merged.to_bytes(len(self.bits), 'little'))
+                self.count = count + self.count - self._saved_count
+            else:
+                logger.warning(f"布隆过滤器文件参数不一致，无法合并，将覆盖原文件中的 {count} 个元素: {path} "
+                               f"(文件 m={num_bits}, k={num_hashes}; 当前 m={self.num_bits}, k={self.num_hashes})")
+        
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(self._HEADER.pack(self.num_bits, self.num_hashes, self.count))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+        self._saved_count = self.count
+    
+    @classmethod
+    def _read(cls, path: Path) -> Optional[Tuple[int, int, int, bytes]]:
+        """
+        读取过滤器文件
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            (位数组长度, 哈希函数个数, 元素数, 位数组)，文件不存在或已损坏时返回None
+        """
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        
+        try:
+            num_bits, num_hashes, count = cls._HEADER.unpack_from(data)
+        except struct.error as e:
+            logger.warning(f"布隆过滤器文件头损坏，忽略该文件: {path} - {e}")
+            return None
+        
+        bits = data[cls._HEADER.size:]
+        if num_bits <= 0 or num_hashes <= 0 or len(bits) != (num_bits + 7) // 8:
+            logger.warning(f"布隆过滤器文件大小与文件头不符，忽略该文件: {path} "
+                           f"(m={num_bits}, k={num_hashes}, 位数组 {len(bits)} 字节)")
+            return None
+        
+        return num_bits, num_hashes, count, bits
+
+    @classmethod
+    def load(cls, path: Union[str, Path], capacity: int = 100000,
+             error_rate: float = 0.001) -> 'BloomFilter':
+        """
+        从文件加载，文件不存在或已损坏时创建空过滤器
+
+        Args:
+            path: 文件路径
+            capacity: 新建时的预期容量
+            error_rate: 新建时的误判率
+
+        Returns:
+            布隆过滤器实例
+        """
+        bloom = cls(capacity, error_rate)
+        saved = cls._read(Path(path))
+        if saved is None:
+            return bloom
+
+        num_bits, num_hashes, count, bits = saved
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.count = count
+        bloom._saved_count = count
+        bloom.bits = bytearray(bits)
+        return bloom
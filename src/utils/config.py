@@ -4,11 +4,35 @@
 
 import os
 import yaml
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple, Union
 from dotenv import load_dotenv
 
 
+# 预先拆分好的配置路径
+_API_KEY_PATH = ("api", "openai", "api_key")
+
+_REQUIRED_KEYS = (
+    _API_KEY_PATH,
+    ("crawler", "request", "timeout"),
+    ("data", "paths", "raw_data"),
+    ("logging", "level"),
+)
+
+_DIRECTORY_KEYS = (
+    ("data", "paths", "raw_data"),
+    ("data", "paths", "processed_data"),
+    ("data", "paths", "archive_data"),
+    ("data", "paths", "output"),
+)
+
+_PROMPTS_PATH = Path(__file__).parent.parent.parent / "config" / "prompts.yaml"
+
+# 优先使用libyaml的C实现解析YAML，不可用时回退到纯Python实现
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
 def load_config(config_path: str = None) -> Dict[str, Any]:
     """
     加载配置文件
@@ -41,6 +65,40 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
     return config
 
 
+def load_prompts(prompts_path: Union[str, Path, None] = None) -> Dict[str, Any]:
+    """
+    加载提示词配置，文件未变化时复用上次的解析结果
+    
+    Args:
+        prompts_path: 提示词文件路径，默认为 config/prompts.yaml
+    
+    Returns:
+        提示词字典（调用方不应修改），文件不存在时返回空字典
+    """
+    path = Path(prompts_path) if prompts_path is not None else _PROMPTS_PATH
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    return _parse_prompts(str(path), mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _parse_prompts(prompts_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    解析提示词文件（按路径与修改时间缓存）
+    
+    Args:
+        prompts_path: 提示词文件路径
+        mtime_ns: 文件修改时间，仅用于缓存键
+    
+    Returns:
+        提示词字典
+    """
+    with open(prompts_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
+
 def _replace_env_vars(obj: Any) -> Any:
     """
     递归替换配置中的环境变量
@@ -63,19 +121,34 @@ def _replace_env_vars(obj: Any) -> Any:
         return obj
 
 
-def get_config_value(config: Dict[str, Any], key_path: str, default: Any = None) -> Any:
+@lru_cache(maxsize=256)
+def _split_key_path(key_path: str) -> Tuple[str, ...]:
+    """
+    拆分点分隔的配置路径（结果缓存）
+    
+    Args:
+        key_path: 配置路径，如 "api.openai.api_key"
+    
+    Returns:
+        路径元组
+    """
+    return tuple(key_path.split('.'))
+
+
+def get_config_value(config: Dict[str, Any], key_path: Union[str, Tuple[str, ...]],
+                     default: Any = None) -> Any:
     """
     通过点分隔的路径获取配置值
     
     Args:
         config: 配置字典
-        key_path: 配置路径，如 "api.openai.api_key"
+        key_path: 配置路径，如 "api.openai.api_key"，或预先拆分的路径元组
         default: 默认值
     
     Returns:
         配置值
     """
-    keys = key_path.split('.')
+    keys = _split_key_path(key_path) if isinstance(key_path, str) else key_path
     value = config
     
     try:
@@ -96,21 +169,14 @@ def validate_config(config: Dict[str, Any]) -> bool:
     Returns:
         是否有效
     """
-    required_keys = [
-        "api.openai.api_key",
-        "crawler.request.timeout",
-        "data.paths.raw_data",
-        "logging.level"
-    ]
-    
-    for key_path in required_keys:
+    for key_path in _REQUIRED_KEYS:
         value = get_config_value(config, key_path)
         if value is None:
-            print(f"❌ 缺少必需的配置项: {key_path}")
+            print(f"❌ 缺少必需的配置项: {'.'.join(key_path)}")
             return False
     
     # 检查OpenAI API密钥
-    api_key = get_config_value(config, "api.openai.api_key")
+    api_key = get_config_value(config, _API_KEY_PATH)
     if not api_key or api_key.startswith("${"):
         print("❌ 请设置有效的OpenAI API密钥")
         return False
@@ -126,10 +192,7 @@ def create_directories(config: Dict[str, Any]) -> None:
         config: 配置字典
     """
     paths_to_create = [
-        get_config_value(config, "data.paths.raw_data"),
-        get_config_value(config, "data.paths.processed_data"),
-        get_config_value(config, "data.paths.archive_data"),
-        get_config_value(config, "data.paths.output"),
+        *(get_config_value(config, key_path) for key_path in _DIRECTORY_KEYS),
         "logs",
         "output/reports",
         "output/charts",
@@ -2,14 +2,192 @@
 每日推荐记录管理模块
 """
 
-import json
 import sqlite3
-from datetime import datetime, timedelta
+import orjson
+import threading
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from loguru import logger
 
 
+# 连接级PRAGMA：WAL日志 + NORMAL同步（WAL下仍可保证一致性），加大缓存与mmap，
+# 放宽自动检查点阈值，避免大批量写入过程中触发检查点
+_CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA wal_autocheckpoint=10000;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+"""
+
+# 只读连接PRAGMA：禁止写入，加大mmap让B树页直接从页缓存读取
+_READ_ONLY_PRAGMAS = """
+    PRAGMA query_only=1;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=1073741824;
+"""
+
+# SQL语句定义为模块级常量，文本固定，便于命中连接的语句缓存
+_INSERT_DAILY_RECORD_SQL = """
+    INSERT OR REPLACE INTO daily_records 
+    (date, total_projects, ai_projects, top_project_name, 
+     top_project_stars, top_project_url, summary, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+_DELETE_DAILY_PROJECTS_SQL = "DELETE FROM daily_projects WHERE date = ?"
+
+_INSERT_DAILY_PROJECT_SQL = """
+    INSERT INTO daily_projects 
+    (date, project_name, project_url, stars, language, description,
+     ai_categories, confidence_score, rank_in_day)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_DELETE_TREND_STATS_SQL = "DELETE FROM trend_stats WHERE date = ?"
+
+_INSERT_TREND_STAT_SQL = """
+    INSERT INTO trend_stats (date, stat_type, stat_name, stat_value, percentage)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_SELECT_DAILY_RECORD_SQL = "SELECT * FROM daily_records WHERE date = ?"
+
+_SELECT_DAILY_PROJECTS_SQL = """
+    SELECT * FROM daily_projects WHERE date = ? 
+    ORDER BY rank_in_day ASC
+"""
+
+_SELECT_TREND_STATS_SQL = """
+    SELECT * FROM trend_stats WHERE date = ? 
+    ORDER BY stat_type ASC, id ASC
+"""
+
+_SELECT_RECORDS_RANGE_SQL = """
+    SELECT * FROM daily_records 
+    WHERE date BETWEEN ? AND ?
+    ORDER BY date ASC
+"""
+
+_SELECT_PROJECTS_RANGE_SQL = """
+    SELECT * FROM daily_projects 
+    WHERE date BETWEEN ? AND ?
+    ORDER BY date ASC, rank_in_day ASC
+"""
+
+_SELECT_STATS_RANGE_SQL = """
+    SELECT * FROM trend_stats 
+    WHERE date BETWEEN ? AND ?
+    ORDER BY date ASC, stat_type ASC, id ASC
+"""
+
+_SELECT_RECENT_RECORDS_SQL = """
+    SELECT * FROM daily_records 
+    WHERE date >= ? AND date <= ?
+    ORDER BY date DESC
+"""
+
+_SELECT_DAILY_COUNTS_SQL = """
+    SELECT date, ai_projects FROM daily_records 
+    WHERE date >= ? AND date <= ?
+    ORDER BY date ASC
+"""
+
+_SELECT_STAT_TRENDS_SQL = """
+    SELECT stat_name, AVG(percentage) as avg_percentage
+    FROM trend_stats 
+    WHERE date >= ? AND date <= ? AND stat_type = ?
+    GROUP BY stat_name
+    ORDER BY avg_percentage DESC
+    LIMIT 10
+"""
+
+
+# 流式查询时每次从游标取出的行数
+_FETCH_BATCH_SIZE = 500
+
+
+def _fetch_dicts(cursor) -> List[Dict[str, Any]]:
+    """
+    将游标结果转换为字典列表，列名只读取一次
+    
+    Args:
+        cursor: 已执行查询的游标
+    
+    Returns:
+        字典列表
+    """
+    cols = tuple(column[0] for column in cursor.description)
+    return [dict(zip(cols, row)) for row in cursor.fetchall()]
+
+
+def _iter_dicts(cursor) -> Iterator[Dict[str, Any]]:
+    """
+    分批从游标取出结果并逐行转换为字典
+    
+    Args:
+        cursor: 已执行查询的游标
+    
+    Returns:
+        字典迭代器
+    """
+    cols = tuple(column[0] for column in cursor.description)
+    while True:
+        rows = cursor.fetchmany(_FETCH_BATCH_SIZE)
+        if not rows:
+            return
+        for row in rows:
+            yield dict(zip(cols, row))
+
+
+class _DateGroups:
+    """按日期升序逐组读取行，供多个范围查询按日期同步推进"""
+    
+    def __init__(self, rows: Iterator[Dict[str, Any]]):
+        self._groups = groupby(rows, itemgetter('date'))
+        self._pending = next(self._groups, None)
+    
+    def take(self, date_str: str) -> List[Dict[str, Any]]:
+        """
+        取出指定日期的行，跳过更早的日期
+        
+        Args:
+            date_str: 日期 (YYYY-MM-DD)
+        
+        Returns:
+            该日期的行列表
+        """
+        while self._pending is not None and self._pending[0] < date_str:
+            self._pending = next(self._groups, None)
+        
+        if self._pending is None or self._pending[0] != date_str:
+            return []
+        
+        rows = list(self._pending[1])
+        self._pending = next(self._groups, None)
+        return rows
+
+
+def _date_range(days: int) -> Tuple[date, date]:
+    """
+    计算截至今天的最近几天日期范围
+    
+    Args:
+        days: 天数
+    
+    Returns:
+        (开始日期, 结束日期)
+    """
+    end_date = datetime.now().date()
+    return end_date - timedelta(days=days-1), end_date
+
+
 class DailyRecordsManager:
     """每日推荐记录管理器"""
     
@@ -31,14 +209,39 @@ class DailyRecordsManager:
         # 数据库文件路径
         self.db_path = self.data_dir / "daily_records.db"
         
+        # 复用同一个连接（自动提交模式，事务显式控制），由锁保证线程安全
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        
         # 初始化数据库
         self._init_database()
+        
+        # 读路径使用独立的只读连接（WAL模式下读写互不阻塞）
+        self._ro_lock = threading.Lock()
+        self._ro_conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro",
+                                        uri=True, check_same_thread=False)
+        self._ro_conn.executescript(_READ_ONLY_PRAGMAS)
+    
+    def close(self):
+        """关闭数据库连接"""
+        with self._ro_lock:
+            if self._ro_conn is not None:
+                self._ro_conn.close()
+                self._ro_conn = None
+        
+        with self._lock:
+            if self._conn is not None:
+                # 关闭前让SQLite按需更新查询规划器统计信息（ANALYZE）
+                self._conn.execute("PRAGMA optimize")
+                self._conn.close()
+                self._conn = None
     
     def _init_database(self):
         """初始化数据库表"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                self._conn.executescript(_CONNECTION_PRAGMAS)
+                cursor = self._conn.cursor()
                 
                 # 创建每日记录表
                 cursor.execute("""
@@ -87,7 +290,14 @@ class DailyRecordsManager:
                     )
                 """)
                 
-                conn.commit()
+                # 创建索引（按日期查询/删除以及按类型分组统计）
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_daily_projects_date '
+                               'ON daily_projects(date)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_trend_stats_date_type '
+                               'ON trend_stats(date, stat_type)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_trend_stats_type_name '
+                               'ON trend_stats(stat_type, stat_name, date)')
+                
                 logger.info("数据库初始化完成")
                 
         except Exception as e:
@@ -107,29 +317,37 @@ class DailyRecordsManager:
         Returns:
             是否保存成功
         """
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
+            try:
+                # 整个保存过程放在一个写事务中
+                cursor.execute("BEGIN IMMEDIATE")
                 
                 # 准备每日汇总数据
                 total_projects = len(projects)
                 ai_projects_count = len(ai_projects)
                 
-                # 找出最热门的AI项目
+                # 一次遍历得到最热门项目、星标总数和语言分布
                 top_project = None
-                if ai_projects:
-                    top_project = max(ai_projects, key=lambda x: x.get('stars', 0))
+                stars_sum = 0
+                languages = Counter()
+                for project in ai_projects:
+                    stars = project.get('stars', 0)
+                    stars_sum += stars
+                    if top_project is None or stars > top_project.get('stars', 0):
+                        top_project = project
+                    languages[project.get('language', 'Unknown')] += 1
+                
+                avg_stars = stars_sum / ai_projects_count if ai_projects_count else 0
+                top_language = max(languages.items(), key=lambda x: x[1])[0] if languages else "Unknown"
                 
                 # 生成每日总结
-                summary = self._generate_daily_summary(projects, ai_projects)
+                summary = self._generate_daily_summary(
+                    total_projects, ai_projects_count, top_project, avg_stars, top_language
+                )
                 
                 # 插入或更新每日记录
-                cursor.execute("""
-                    INSERT OR REPLACE INTO daily_records 
-                    (date, total_projects, ai_projects, top_project_name, 
-                     top_project_stars, top_project_url, summary, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (
+                cursor.execute(_INSERT_DAILY_RECORD_SQL, (
                     date,
                     total_projects,
                     ai_projects_count,
@@ -140,63 +358,50 @@ class DailyRecordsManager:
                 ))
                 
                 # 删除当天的旧项目记录
-                cursor.execute("DELETE FROM daily_projects WHERE date = ?", (date,))
+                cursor.execute(_DELETE_DAILY_PROJECTS_SQL, (date,))
                 
-                # 插入AI项目详情
+                # 批量插入AI项目详情
+                project_rows = []
                 for rank, project in enumerate(ai_projects, 1):
                     ai_classification = project.get('ai_classification', {})
-                    cursor.execute("""
-                        INSERT INTO daily_projects 
-                        (date, project_name, project_url, stars, language, description,
-                         ai_categories, confidence_score, rank_in_day)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
+                    project_rows.append((
                         date,
                         project.get('name', ''),
                         project.get('url', ''),
                         project.get('stars', 0),
                         project.get('language', ''),
                         project.get('description', ''),
-                        json.dumps(ai_classification.get('ai_categories', []), ensure_ascii=False),
+                        orjson.dumps(ai_classification.get('ai_categories', [])).decode(),
                         ai_classification.get('confidence_score', 0.0),
                         rank
                     ))
                 
+                cursor.executemany(_INSERT_DAILY_PROJECT_SQL, project_rows)
+                
                 # 保存趋势统计
-                self._save_trend_stats(cursor, date, ai_projects)
+                self._save_trend_stats(cursor, date, ai_projects, languages)
                 
-                conn.commit()
+                cursor.execute("COMMIT")
                 logger.info(f"每日记录保存成功: {date}")
                 return True
                 
-        except Exception as e:
-            logger.error(f"保存每日记录失败: {e}")
-            return False
+            except Exception as e:
+                if self._conn.in_transaction:
+                    cursor.execute("ROLLBACK")
+                logger.error(f"保存每日记录失败: {e}")
+                return False
     
-    def _generate_daily_summary(self, projects: List[Dict[str, Any]], 
-                               ai_projects: List[Dict[str, Any]]) -> str:
-        """生成每日总结"""
+    def _generate_daily_summary(self, total_count: int, ai_count: int,
+                               top_project: Optional[Dict[str, Any]],
+                               avg_stars: float, top_language: str) -> str:
+        """生成每日总结（统计值由save_daily_record一次遍历预先算好）"""
         try:
-            total_count = len(projects)
-            ai_count = len(ai_projects)
             ai_percentage = (ai_count / total_count * 100) if total_count > 0 else 0
             
-            # 统计编程语言
-            languages = {}
-            for project in ai_projects:
-                lang = project.get('language', 'Unknown')
-                languages[lang] = languages.get(lang, 0) + 1
-            
-            top_language = max(languages.items(), key=lambda x: x[1])[0] if languages else "Unknown"
-            
-            # 计算平均星标数
-            avg_stars = sum(p.get('stars', 0) for p in ai_projects) / len(ai_projects) if ai_projects else 0
-            
             summary = f"今日发现 {total_count} 个项目，其中 {ai_count} 个AI相关项目（{ai_percentage:.1f}%）。"
             summary += f"主要编程语言为 {top_language}，平均星标数 {avg_stars:.0f}。"
             
-            if ai_projects:
-                top_project = max(ai_projects, key=lambda x: x.get('stars', 0))
+            if top_project:
                 summary += f"最热门项目：{top_project['name']}（{top_project.get('stars', 0)}⭐）。"
             
             return summary
@@ -205,43 +410,30 @@ class DailyRecordsManager:
             logger.error(f"生成每日总结失败: {e}")
             return "数据处理中遇到问题，无法生成总结。"
     
-    def _save_trend_stats(self, cursor, date: str, ai_projects: List[Dict[str, Any]]):
-        """保存趋势统计数据"""
+    def _save_trend_stats(self, cursor, date: str, ai_projects: List[Dict[str, Any]],
+                          languages: Counter):
+        """保存趋势统计数据（languages为已统计好的编程语言分布）"""
         try:
             # 删除当天的旧统计数据
-            cursor.execute("DELETE FROM trend_stats WHERE date = ?", (date,))
+            cursor.execute(_DELETE_TREND_STATS_SQL, (date,))
             
-            # 统计编程语言
-            languages = {}
-            categories = {}
-            
-            for project in ai_projects:
-                # 编程语言统计
-                lang = project.get('language', 'Unknown')
-                languages[lang] = languages.get(lang, 0) + 1
-                
-                # AI分类统计
-                ai_classification = project.get('ai_classification', {})
-                for category in ai_classification.get('ai_categories', []):
-                    categories[category] = categories.get(category, 0) + 1
+            # AI分类统计
+            categories = Counter(
+                category
+                for project in ai_projects
+                for category in project.get('ai_classification', {}).get('ai_categories', [])
+            )
             
             total_projects = len(ai_projects)
             
-            # 保存语言统计
-            for lang, count in languages.items():
-                percentage = (count / total_projects * 100) if total_projects > 0 else 0
-                cursor.execute("""
-                    INSERT INTO trend_stats (date, stat_type, stat_name, stat_value, percentage)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (date, 'language', lang, count, percentage))
+            # 语言统计和分类统计合并为一次批量插入
+            stat_rows = []
+            for stat_type, counts in (('language', languages), ('category', categories)):
+                for name, count in counts.items():
+                    percentage = (count / total_projects * 100) if total_projects > 0 else 0
+                    stat_rows.append((date, stat_type, name, count, percentage))
             
-            # 保存分类统计
-            for category, count in categories.items():
-                percentage = (count / total_projects * 100) if total_projects > 0 else 0
-                cursor.execute("""
-                    INSERT INTO trend_stats (date, stat_type, stat_name, stat_value, percentage)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (date, 'category', category, count, percentage))
+            cursor.executemany(_INSERT_TREND_STAT_SQL, stat_rows)
                 
         except Exception as e:
             logger.error(f"保存趋势统计失败: {e}")
@@ -249,36 +441,28 @@ class DailyRecordsManager:
     def get_daily_record(self, date: str) -> Optional[Dict[str, Any]]:
         """获取指定日期的记录"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
+            with self._ro_lock:
+                cursor = self._ro_conn.cursor()
                 
                 # 获取每日汇总
-                cursor.execute("""
-                    SELECT * FROM daily_records WHERE date = ?
-                """, (date,))
+                cursor.execute(_SELECT_DAILY_RECORD_SQL, (date,))
                 
-                record = cursor.fetchone()
-                if not record:
+                records = _fetch_dicts(cursor)
+                if not records:
                     return None
                 
                 # 获取项目详情
-                cursor.execute("""
-                    SELECT * FROM daily_projects WHERE date = ? 
-                    ORDER BY rank_in_day ASC
-                """, (date,))
+                cursor.execute(_SELECT_DAILY_PROJECTS_SQL, (date,))
                 
-                projects = [dict(row) for row in cursor.fetchall()]
+                projects = _fetch_dicts(cursor)
                 
                 # 获取趋势统计
-                cursor.execute("""
-                    SELECT * FROM trend_stats WHERE date = ?
-                """, (date,))
+                cursor.execute(_SELECT_TREND_STATS_SQL, (date,))
                 
-                stats = [dict(row) for row in cursor.fetchall()]
+                stats = _fetch_dicts(cursor)
                 
                 return {
-                    'summary': dict(record),
+                    'summary': records[0],
                     'projects': projects,
                     'stats': stats
                 }
@@ -287,24 +471,60 @@ class DailyRecordsManager:
             logger.error(f"获取每日记录失败: {e}")
             return None
     
+    def iter_records_between(self, start_date: str, end_date: str) -> Iterator[Dict[str, Any]]:
+        """
+        逐日生成日期范围内的完整记录，三个范围查询的游标按日期同步推进，
+        不一次性载入整个范围；迭代期间持有只读连接并保持同一个读事务
+        
+        Args:
+            start_date: 开始日期 (YYYY-MM-DD)
+            end_date: 结束日期 (YYYY-MM-DD)
+        
+        Returns:
+            按日期升序排列的记录迭代器，结构与get_daily_record相同
+        """
+        with self._ro_lock:
+            conn = self._ro_conn
+            conn.execute("BEGIN")
+            try:
+                params = (start_date, end_date)
+                summaries = _iter_dicts(conn.execute(_SELECT_RECORDS_RANGE_SQL, params))
+                projects = _DateGroups(_iter_dicts(conn.execute(_SELECT_PROJECTS_RANGE_SQL, params)))
+                stats = _DateGroups(_iter_dicts(conn.execute(_SELECT_STATS_RANGE_SQL, params)))
+                
+                for summary in summaries:
+                    yield {
+                        'summary': summary,
+                        'projects': projects.take(summary['date']),
+                        'stats': stats.take(summary['date'])
+                    }
+            finally:
+                conn.execute("COMMIT")
+    
+    def get_records_between(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """
+        获取日期范围内的完整记录（三次范围查询，按日期分组组装）
+        
+        Args:
+            start_date: 开始日期 (YYYY-MM-DD)
+            end_date: 结束日期 (YYYY-MM-DD)
+        
+        Returns:
+            按日期升序排列的记录列表，结构与get_daily_record相同
+        """
+        try:
+            return list(self.iter_records_between(start_date, end_date))
+            
+        except Exception as e:
+            logger.error(f"获取日期范围记录失败: {e}")
+            return []
+    
     def get_recent_records(self, days: int = 7) -> List[Dict[str, Any]]:
         """获取最近几天的记录"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                # 计算日期范围
-                end_date = datetime.now().date()
-                start_date = end_date - timedelta(days=days-1)
-                
-                cursor.execute("""
-                    SELECT * FROM daily_records 
-                    WHERE date >= ? AND date <= ?
-                    ORDER BY date DESC
-                """, (start_date.isoformat(), end_date.isoformat()))
-                
-                return [dict(row) for row in cursor.fetchall()]
+            start_date, end_date = _date_range(days)
+            with self._ro_lock:
+                return self._query_recent_records(self._ro_conn.cursor(), start_date, end_date)
                 
         except Exception as e:
             logger.error(f"获取最近记录失败: {e}")
@@ -313,71 +533,72 @@ class DailyRecordsManager:
     def get_trend_analysis(self, days: int = 30) -> Dict[str, Any]:
         """获取趋势分析数据"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                # 计算日期范围
-                end_date = datetime.now().date()
-                start_date = end_date - timedelta(days=days-1)
-                
-                # 获取每日AI项目数量趋势
-                cursor.execute("""
-                    SELECT date, ai_projects FROM daily_records 
-                    WHERE date >= ? AND date <= ?
-                    ORDER BY date ASC
-                """, (start_date.isoformat(), end_date.isoformat()))
-                
-                daily_counts = [dict(row) for row in cursor.fetchall()]
-                
-                # 获取语言趋势
-                cursor.execute("""
-                    SELECT stat_name, AVG(percentage) as avg_percentage
-                    FROM trend_stats 
-                    WHERE date >= ? AND date <= ? AND stat_type = 'language'
-                    GROUP BY stat_name
-                    ORDER BY avg_percentage DESC
-                    LIMIT 10
-                """, (start_date.isoformat(), end_date.isoformat()))
-                
-                language_trends = [dict(row) for row in cursor.fetchall()]
-                
-                # 获取分类趋势
-                cursor.execute("""
-                    SELECT stat_name, AVG(percentage) as avg_percentage
-                    FROM trend_stats 
-                    WHERE date >= ? AND date <= ? AND stat_type = 'category'
-                    GROUP BY stat_name
-                    ORDER BY avg_percentage DESC
-                    LIMIT 10
-                """, (start_date.isoformat(), end_date.isoformat()))
-                
-                category_trends = [dict(row) for row in cursor.fetchall()]
-                
-                return {
-                    'daily_counts': daily_counts,
-                    'language_trends': language_trends,
-                    'category_trends': category_trends,
-                    'period': f"{start_date} to {end_date}"
-                }
+            start_date, end_date = _date_range(days)
+            with self._ro_lock:
+                return self._query_trend_analysis(self._ro_conn.cursor(), start_date, end_date)
                 
         except Exception as e:
             logger.error(f"获取趋势分析失败: {e}")
             return {}
     
+    def get_recent_and_trend(self, days: int = 30) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        一次加锁读取最近记录与趋势分析，供需要两者的调用方使用
+        
+        Args:
+            days: 天数
+        
+        Returns:
+            (最近记录列表, 趋势分析数据)
+        """
+        try:
+            start_date, end_date = _date_range(days)
+            with self._ro_lock:
+                cursor = self._ro_conn.cursor()
+                return (self._query_recent_records(cursor, start_date, end_date),
+                        self._query_trend_analysis(cursor, start_date, end_date))
+                
+        except Exception as e:
+            logger.error(f"获取最近记录与趋势分析失败: {e}")
+            return [], {}
+    
+    def _query_recent_records(self, cursor, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """查询日期范围内的每日记录（调用方需持有只读锁）"""
+        cursor.execute(_SELECT_RECENT_RECORDS_SQL, (start_date.isoformat(), end_date.isoformat()))
+        return _fetch_dicts(cursor)
+    
+    def _query_trend_analysis(self, cursor, start_date: date, end_date: date) -> Dict[str, Any]:
+        """查询日期范围内的趋势数据（调用方需持有只读锁）"""
+        start, end = start_date.isoformat(), end_date.isoformat()
+        
+        # 获取每日AI项目数量趋势
+        cursor.execute(_SELECT_DAILY_COUNTS_SQL, (start, end))
+        daily_counts = _fetch_dicts(cursor)
+        
+        # 获取语言趋势
+        cursor.execute(_SELECT_STAT_TRENDS_SQL, (start, end, 'language'))
+        language_trends = _fetch_dicts(cursor)
+        
+        # 获取分类趋势
+        cursor.execute(_SELECT_STAT_TRENDS_SQL, (start, end, 'category'))
+        category_trends = _fetch_dicts(cursor)
+        
+        return {
+            'daily_counts': daily_counts,
+            'language_trends': language_trends,
+            'category_trends': category_trends,
+            'period': f"{start_date} to {end_date}"
+        }
+    
     def export_records(self, start_date: str, end_date: str, 
                       format: str = 'json') -> Optional[str]:
-        """导出记录数据"""
+        """导出记录数据（json为数组格式，ndjson每天一行），逐日读取并序列化写入"""
+        if format not in ('json', 'ndjson'):
+            logger.error(f"不支持的导出格式: {format}")
+            return None
+        
         try:
-            records = []
-            current_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-            end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-            
-            while current_date <= end_date_obj:
-                record = self.get_daily_record(current_date.isoformat())
-                if record:
-                    records.append(record)
-                current_date += timedelta(days=1)
+            records = self.iter_records_between(start_date, end_date)
             
             # 生成导出文件
             export_dir = self.output_dir / "exports"
@@ -386,9 +607,19 @@ class DailyRecordsManager:
             filename = f"ai_trends_{start_date}_to_{end_date}.{format}"
             file_path = export_dir / filename
             
-            if format == 'json':
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(records, f, ensure_ascii=False, indent=2)
+            if format == 'ndjson':
+                with open(file_path, 'wb') as f:
+                    for record in records:
+                        f.write(orjson.dumps(record))
+                        f.write(b'\n')
+            else:
+                with open(file_path, 'wb') as f:
+                    f.write(b'[\n')
+                    for index, record in enumerate(records):
+                        if index:
+                            f.write(b',\n')
+                        f.write(orjson.dumps(record, option=orjson.OPT_INDENT_2))
+                    f.write(b'\n]')
             
             logger.info(f"记录导出成功: {file_path}")
             return str(file_path)
@@ -37,14 +37,6 @@ def setup_logger(
         "<level>{message}</level>"
     )
     
-    # 文件输出格式
-    file_format = (
-        "{time:YYYY-MM-DD HH:mm:ss} | "
-        "{level: <8} | "
-        "{name}:{function}:{line} | "
-        "{message}"
-    )
-    
     # 添加控制台handler
     logger.add(
         sys.stdout,
@@ -58,13 +50,16 @@ def setup_logger(
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # 文件输出为结构化JSON（每条记录一行），由后台线程写入，不阻塞调用方
         logger.add(
             log_file,
-            format=file_format,
+            format="{message}",
             level=log_level,
             rotation=rotation,
             retention=retention,
-            encoding="utf-8"
+            encoding="utf-8",
+            serialize=True,
+            enqueue=True
         )
     
     return logger
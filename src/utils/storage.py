@@ -2,15 +2,212 @@
 数据存储模块
 """
 
-import json
+import os
 import sqlite3
+import orjson
+import threading
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Sequence
 from datetime import datetime, timedelta
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from loguru import logger
 
 
+# 连接级PRAGMA：WAL日志 + NORMAL同步，64MB页缓存，临时表放内存，开启mmap，
+# 写锁冲突时最多等待5秒
+_CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=1073741824;
+    PRAGMA busy_timeout=5000;
+"""
+
+# 只读连接的PRAGMA：流式查询使用独立只读连接，在单个读事务内看到一致快照
+_READ_ONLY_PRAGMAS = """
+    PRAGMA query_only=1;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-16384;
+    PRAGMA mmap_size=1073741824;
+    PRAGMA busy_timeout=5000;
+"""
+
+# projects表的全部列（用于校验查询字段）及其中以JSON文本存储的字段
+_PROJECT_COLUMNS = (
+    'id', 'name', 'description', 'url', 'stars', 'forks', 'votes', 'language', 'author',
+    'source', 'category', 'tags', 'ai_classification', 'keywords', 'summary',
+    'created_at', 'updated_at', 'crawled_at'
+)
+_PROJECT_JSON_FIELDS = ('tags', 'ai_classification', 'keywords', 'summary')
+
+# cleanup_old_data归档的数据文件扩展名
+_ARCHIVE_SUFFIXES = ('.parquet', '.json')
+
+# JSON文件写入缓冲区大小与orjson序列化选项
+_JSON_WRITE_BUFFER = 65536
+_JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# Parquet归档压缩设置，以及记录JSON编码列名的元数据键
+_PARQUET_COMPRESSION = 'zstd'
+_PARQUET_COMPRESSION_LEVEL = 3
+_JSON_COLUMNS_KEY = b'json_columns'
+_OPTIONAL_COLUMNS_KEY = b'optional_columns'
+
+# 可按原生Arrow类型精确还原的Python标量类型
+_NATIVE_TYPES = (str, int, float, bool)
+
+# 批量写入时每次executemany的最大行数
+_INSERT_CHUNK_SIZE = 10000
+
+# 流式查询时每次从游标取出的行数
+_FETCH_BATCH_SIZE = 500
+
+# projects表的写入列：标量列在前，JSON列在后
+_PROJECT_SCALAR_COLUMNS = (
+    'name', 'description', 'url', 'stars', 'forks', 'votes', 'language', 'author',
+    'source', 'category', 'created_at', 'updated_at', 'crawled_at'
+)
+_PROJECT_INSERT_COLUMNS = _PROJECT_SCALAR_COLUMNS + _PROJECT_JSON_FIELDS
+
+# url冲突时原地更新；数据未变化且当天已抓取过的行跳过写入，减少WAL写放大
+_PROJECT_COMPARE_COLUMNS = tuple(
+    column for column in _PROJECT_INSERT_COLUMNS if column not in ('url', 'crawled_at')
+)
+
+_INSERT_PROJECT_SQL = (
+    f"INSERT INTO projects ({', '.join(_PROJECT_INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_PROJECT_INSERT_COLUMNS))}) "
+    f"ON CONFLICT(url) DO UPDATE SET "
+    f"{', '.join(f'{column} = excluded.{column}' for column in _PROJECT_INSERT_COLUMNS if column != 'url')} "
+    f"WHERE ({', '.join(f'projects.{column}' for column in _PROJECT_COMPARE_COLUMNS)}) "
+    f"IS NOT ({', '.join(f'excluded.{column}' for column in _PROJECT_COMPARE_COLUMNS)}) "
+    f"OR substr(projects.crawled_at, 1, 10) IS NOT substr(excluded.crawled_at, 1, 10)"
+)
+
+# 写入时缺失字段的默认值（crawled_at默认为写入时间，按批次填充）
+_PROJECT_DEFAULTS = {
+    'name': '', 'description': '', 'url': '', 'stars': 0, 'forks': 0, 'votes': 0,
+    'language': '', 'author': '', 'source': '', 'category': '',
+    'created_at': '', 'updated_at': '',
+    'tags': [], 'ai_classification': {}, 'keywords': {}, 'summary': {}
+}
+
+_get_scalar_values = itemgetter(*_PROJECT_SCALAR_COLUMNS)
+_get_json_values = itemgetter(*_PROJECT_JSON_FIELDS)
+
+_INSERT_DAILY_STATS_SQL = '''
+    INSERT OR REPLACE INTO daily_stats 
+    (date, total_projects, ai_projects, top_languages, top_keywords, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+
+def _native_array(values: List[Any]) -> Optional[pa.Array]:
+    """
+    尝试将一列值转换为原生Arrow数组
+    
+    Args:
+        values: 列值列表
+    
+    Returns:
+        标量或标量列表类型的Arrow数组；类型不一致（如int与float混合，
+        读回时会变成float）或含嵌套结构时返回None
+    """
+    value_types = {type(value) for value in values if value is not None}
+    if value_types == {list}:
+        value_types = {type(element) for value in values if value is not None
+                       for element in value if element is not None}
+    if len(value_types) > 1 or not value_types <= set(_NATIVE_TYPES):
+        return None
+    
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        return None
+
+
+def _records_to_table(data: List[Dict[str, Any]]) -> pa.Table:
+    """
+    将字典列表转换为Arrow表
+    
+    标量列和标量列表列（如tags）按原生类型存储；嵌套字典或类型不一致的列
+    编码为JSON文本，列名记录在表的元数据中，读取时还原。部分记录缺少的列
+    也记录在元数据中，读取时这些列的空值表示字段缺失；既有缺失又有显式None
+    的列编码为JSON文本，以区分两者。
+    
+    Args:
+        data: 数据列表
+    
+    Returns:
+        Arrow表
+    """
+    columns = list(dict.fromkeys(key for item in data for key in item))
+    
+    arrays = {}
+    json_columns = []
+    optional_columns = []
+    for column in columns:
+        values = [item.get(column) for item in data]
+        missing = any(column not in item for item in data)
+        has_none = any(value is None and column in item for item, value in zip(data, values))
+        
+        array = None if missing and has_none else _native_array(values)
+        if array is None:
+            # JSON列中显式的None编码为'null'，缺失字段为空值
+            array = pa.array(
+                [orjson.dumps(item[column]).decode() if column in item else None for item in data],
+                type=pa.string()
+            )
+            json_columns.append(column)
+        elif missing:
+            optional_columns.append(column)
+        arrays[column] = array
+    
+    table = pa.table(arrays)
+    return table.replace_schema_metadata({
+        _JSON_COLUMNS_KEY: orjson.dumps(json_columns),
+        _OPTIONAL_COLUMNS_KEY: orjson.dumps(optional_columns)
+    })
+
+
+def _table_to_records(table: pa.Table) -> List[Dict[str, Any]]:
+    """
+    将Arrow表还原为字典列表
+    
+    Args:
+        table: 由_records_to_table生成的Arrow表
+    
+    Returns:
+        数据列表（写入时因字段缺失补上的空值会被去除，显式的None保留）
+    """
+    metadata = table.schema.metadata or {}
+    json_columns = orjson.loads(metadata.get(_JSON_COLUMNS_KEY, b'[]'))
+    
+    # 空值表示字段缺失的列；旧文件没有该元数据时，所有空值都视为缺失
+    if _OPTIONAL_COLUMNS_KEY in metadata:
+        missing_columns = set(orjson.loads(metadata[_OPTIONAL_COLUMNS_KEY])).union(json_columns)
+    else:
+        missing_columns = set(table.column_names)
+    
+    records = []
+    for row in table.to_pylist():
+        missing = [column for column in missing_columns if row[column] is None]
+        for column in json_columns:
+            if row[column] is not None:
+                row[column] = orjson.loads(row[column])
+        for column in missing:
+            del row[column]
+        records.append(row)
+    
+    return records
+
+
 class DataStorage:
     """数据存储管理器"""
     
@@ -32,13 +229,22 @@ class DataStorage:
         # 数据保留配置
         self.retention_days = config.get('data', {}).get('retention_days', 30)
         
+        # 归档以Parquet为主，开启后额外保留JSON副本
+        self.keep_json = config.get('data', {}).get('keep_json', False)
+        
         # 创建目录
         self._create_directories()
         
-        # 初始化数据库
+        # 初始化数据库：复用同一个连接（自动提交模式，事务显式控制），由锁保证线程安全
         self.db_path = self.processed_data_path / "projects.db"
+        self._lock = threading.Lock()
+        self._conn = self._connect()
         self._init_database()
         
+        # 读路径使用独立的只读连接（WAL模式下读写互不阻塞），每次查询在其上开启一个读事务
+        self._ro_lock = threading.Lock()
+        self._ro_conn = self._connect_read_only()
+        
         logger.info("数据存储管理器初始化完成")
     
     def _create_directories(self):
@@ -46,10 +252,46 @@ class DataStorage:
         for path in [self.raw_data_path, self.processed_data_path, self.archive_data_path]:
             path.mkdir(parents=True, exist_ok=True)
     
+    def _connect(self) -> sqlite3.Connection:
+        """
+        打开数据库连接并应用连接级PRAGMA
+        
+        Returns:
+            数据库连接
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False,
+                               cached_statements=256)
+        conn.executescript(_CONNECTION_PRAGMAS)
+        return conn
+    
+    def _connect_read_only(self) -> sqlite3.Connection:
+        """
+        打开只读数据库连接（WAL模式下读写互不阻塞）
+        
+        Returns:
+            只读数据库连接
+        """
+        conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True,
+                               isolation_level=None, check_same_thread=False)
+        conn.executescript(_READ_ONLY_PRAGMAS)
+        return conn
+    
+    def close(self):
+        """关闭数据库连接"""
+        with self._ro_lock:
+            if self._ro_conn is not None:
+                self._ro_conn.close()
+                self._ro_conn = None
+        
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
     def _init_database(self):
         """初始化SQLite数据库"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
             
             # 创建项目表
             cursor.execute('''
@@ -93,8 +335,9 @@ class DataStorage:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_projects_source ON projects(source)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_projects_date ON projects(crawled_at)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_projects_ai ON projects(ai_classification)')
-            
-            conn.commit()
+            # 覆盖get_recent_projects的范围条件和排序，免去排序步骤
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_projects_crawled_stars '
+                           'ON projects(crawled_at DESC, stars DESC)')
     
     def save_raw_data(self, data: List[Dict[str, Any]], source: str, timestamp: str = None) -> str:
         """
@@ -111,11 +354,11 @@ class DataStorage:
         if timestamp is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        filename = f"{source}_{timestamp}.json"
-        filepath = self.raw_data_path / filename
+        filepath = self.raw_data_path / f"{source}_{timestamp}.parquet"
+        self._write_parquet(data, filepath)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if self.keep_json:
+            self._write_json(data, filepath.with_suffix('.json'))
         
         logger.info(f"原始数据已保存: {filepath} ({len(data)} 条记录)")
         return str(filepath)
@@ -128,117 +371,131 @@ class DataStorage:
             projects: 项目列表
             date: 日期字符串 (YYYY-MM-DD)
         """
-        # 保存到JSON文件
-        filename = f"ai_projects_{date}.json"
-        filepath = self.processed_data_path / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(projects, f, ensure_ascii=False, indent=2)
+        # 保存到Parquet文件
+        filepath = self.processed_data_path / f"ai_projects_{date}.parquet"
+        self._write_parquet(projects, filepath)
+        
+        if self.keep_json:
+            self._write_json(projects, filepath.with_suffix('.json'))
+        
+        # 项目和每日统计在同一个写事务中保存到数据库
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                self._save_to_database(cursor, projects)
+                
+                # 生成每日统计
+                self._generate_daily_stats(cursor, projects, date)
+                
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
         
-        # 保存到数据库
-        self._save_to_database(projects)
+        logger.info(f"每日数据已保存: {filepath} ({len(projects)} 个AI项目)")
+    
+    def _write_parquet(self, data: List[Dict[str, Any]], filepath: Path) -> None:
+        """
+        以zstd压缩的Parquet格式写入数据
         
-        # 生成每日统计
-        self._generate_daily_stats(projects, date)
+        Args:
+            data: 数据列表
+            filepath: 文件路径
+        """
+        pq.write_table(
+            _records_to_table(data),
+            filepath,
+            compression=_PARQUET_COMPRESSION,
+            compression_level=_PARQUET_COMPRESSION_LEVEL
+        )
+    
+    def _write_json(self, data: List[Dict[str, Any]], filepath: Path) -> None:
+        """
+        以JSON格式写入数据（orjson直接输出UTF-8字节，一次性写入缓冲文件）
         
-        logger.info(f"每日数据已保存: {filepath} ({len(projects)} 个AI项目)")
+        Args:
+            data: 数据列表
+            filepath: 文件路径
+        """
+        with open(filepath, 'wb', buffering=_JSON_WRITE_BUFFER) as f:
+            f.write(orjson.dumps(data, option=_JSON_DUMP_OPTIONS))
     
-    def _save_to_database(self, projects: List[Dict[str, Any]]) -> None:
+    def _save_to_database(self, cursor: sqlite3.Cursor, projects: List[Dict[str, Any]]) -> None:
         """
-        保存项目到数据库
+        保存项目到数据库（在调用方开启的事务中批量写入）
         
         Args:
+            cursor: 数据库游标
             projects: 项目列表
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            for project in projects:
-                try:
-                    # 准备数据
-                    data = (
-                        project.get('name', ''),
-                        project.get('description', ''),
-                        project.get('url', ''),
-                        project.get('stars', 0),
-                        project.get('forks', 0),
-                        project.get('votes', 0),
-                        project.get('language', ''),
-                        project.get('author', ''),
-                        project.get('source', ''),
-                        project.get('category', ''),
-                        json.dumps(project.get('tags', []), ensure_ascii=False),
-                        json.dumps(project.get('ai_classification', {}), ensure_ascii=False),
-                        json.dumps(project.get('keywords', {}), ensure_ascii=False),
-                        json.dumps(project.get('summary', {}), ensure_ascii=False),
-                        project.get('created_at', ''),
-                        project.get('updated_at', ''),
-                        project.get('crawled_at', datetime.now().isoformat())
-                    )
-                    
-                    # 插入或更新
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO projects 
-                        (name, description, url, stars, forks, votes, language, author, 
-                         source, category, tags, ai_classification, keywords, summary,
-                         created_at, updated_at, crawled_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', data)
-                    
-                except Exception as e:
-                    logger.warning(f"保存项目到数据库失败: {project.get('name', 'Unknown')} - {e}")
-            
-            conn.commit()
+        defaults = {**_PROJECT_DEFAULTS, 'crawled_at': datetime.now().isoformat()}
+        
+        # 先整体准备数据，跳过无法序列化的项目，避免中断批量插入
+        rows = []
+        for project in projects:
+            try:
+                values = {**defaults, **project}
+                rows.append(_get_scalar_values(values) + tuple(
+                    orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+                    for value in _get_json_values(values)
+                ))
+                
+            except Exception as e:
+                logger.warning(f"保存项目到数据库失败: {project.get('name', 'Unknown')} - {e}")
+        
+        # 插入或更新；某一批写入失败时逐行重试，跳过违反约束或无法绑定的项目，其余项目照常保存
+        # （批内失败行之前的行已经写入，重试时数据未变化会被冲突更新条件跳过）
+        for start in range(0, len(rows), _INSERT_CHUNK_SIZE):
+            chunk = rows[start:start + _INSERT_CHUNK_SIZE]
+            try:
+                cursor.executemany(_INSERT_PROJECT_SQL, chunk)
+            except sqlite3.Error:
+                for row in chunk:
+                    try:
+                        cursor.execute(_INSERT_PROJECT_SQL, row)
+                    except sqlite3.Error as e:
+                        logger.warning(f"保存项目到数据库失败: {row[0] or 'Unknown'} - {e}")
     
-    def _generate_daily_stats(self, projects: List[Dict[str, Any]], date: str) -> None:
+    def _generate_daily_stats(self, cursor: sqlite3.Cursor, projects: List[Dict[str, Any]],
+                              date: str) -> None:
         """
         生成每日统计数据
         
         Args:
+            cursor: 数据库游标
             projects: 项目列表
             date: 日期字符串
         """
         # 统计编程语言
-        languages = {}
-        for project in projects:
-            lang = project.get('language', '').lower()
-            if lang:
-                languages[lang] = languages.get(lang, 0) + 1
-        
-        top_languages = sorted(languages.items(), key=lambda x: x[1], reverse=True)[:10]
+        languages = Counter(
+            project['language'].lower() for project in projects if project.get('language')
+        )
+        top_languages = languages.most_common(10)
         
         # 统计关键词
-        keywords = {}
-        for project in projects:
-            project_keywords = project.get('keywords', {}).get('keywords', [])
-            for keyword in project_keywords:
-                if keyword:
-                    keywords[keyword] = keywords.get(keyword, 0) + 1
-        
-        top_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)[:20]
+        keywords = Counter(
+            keyword
+            for keyword in chain.from_iterable(
+                project.get('keywords', {}).get('keywords', ()) for project in projects
+            )
+            if keyword
+        )
+        top_keywords = keywords.most_common(20)
         
         # 保存统计数据
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO daily_stats 
-                (date, total_projects, ai_projects, top_languages, top_keywords, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                date,
-                len(projects),
-                len(projects),  # 这里的projects已经是AI项目了
-                json.dumps(top_languages, ensure_ascii=False),
-                json.dumps(top_keywords, ensure_ascii=False),
-                datetime.now().isoformat()
-            ))
-            
-            conn.commit()
+        cursor.execute(_INSERT_DAILY_STATS_SQL, (
+            date,
+            len(projects),
+            len(projects),  # 这里的projects已经是AI项目了
+            orjson.dumps(top_languages).decode(),
+            orjson.dumps(top_keywords).decode(),
+            datetime.now().isoformat()
+        ))
     
     def load_data(self, filepath: str) -> List[Dict[str, Any]]:
         """
-        加载数据文件
+        加载数据文件（按扩展名区分Parquet和JSON）
         
         Args:
             filepath: 文件路径
@@ -253,8 +510,10 @@ class DataStorage:
             return []
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if filepath.suffix == '.parquet':
+                data = _table_to_records(pq.read_table(filepath))
+            else:
+                data = orjson.loads(filepath.read_bytes())
             
             logger.info(f"数据加载成功: {filepath} ({len(data)} 条记录)")
             return data
@@ -263,83 +522,136 @@ class DataStorage:
             logger.error(f"数据加载失败: {filepath} - {e}")
             return []
     
-    def get_projects_by_date(self, date: str) -> List[Dict[str, Any]]:
+    def get_projects_by_date(self, date: str,
+                             fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         """
         获取指定日期的项目
         
         Args:
             date: 日期字符串 (YYYY-MM-DD)
+            fields: 需要返回的列，默认返回全部列
         
         Returns:
             项目列表
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT * FROM projects 
-                WHERE DATE(crawled_at) = ?
-                ORDER BY stars DESC
-            ''', (date,))
-            
-            rows = cursor.fetchall()
-            columns = [description[0] for description in cursor.description]
-            
-            projects = []
-            for row in rows:
-                project = dict(zip(columns, row))
-                
-                # 解析JSON字段
-                for field in ['tags', 'ai_classification', 'keywords', 'summary']:
-                    if project.get(field):
-                        try:
-                            project[field] = json.loads(project[field])
-                        except json.JSONDecodeError:
-                            project[field] = {}
-                
-                projects.append(project)
-            
-            return projects
+        next_date = (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+        
+        # 用半开区间代替DATE(crawled_at) = ?，使查询能走crawled_at索引范围扫描
+        return self._query_projects('crawled_at >= ? AND crawled_at < ?', 'stars DESC',
+                                    (date, next_date), fields)
     
-    def get_recent_projects(self, days: int = 7) -> List[Dict[str, Any]]:
+    def get_recent_projects(self, days: int = 7,
+                            fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         """
         获取最近几天的项目
         
         Args:
             days: 天数
+            fields: 需要返回的列，默认返回全部列
         
         Returns:
             项目列表
         """
+        return list(self.iter_recent_projects(days, fields))
+    
+    def iter_recent_projects(self, days: int = 7,
+                             fields: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        逐条迭代最近几天的项目，结果分批从数据库读取，不一次性载入内存
+        
+        Args:
+            days: 天数
+            fields: 需要返回的列，默认返回全部列
+        
+        Returns:
+            项目迭代器
+        """
         start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT * FROM projects 
-                WHERE DATE(crawled_at) >= ?
-                ORDER BY crawled_at DESC, stars DESC
-            ''', (start_date,))
-            
-            rows = cursor.fetchall()
-            columns = [description[0] for description in cursor.description]
-            
-            projects = []
-            for row in rows:
-                project = dict(zip(columns, row))
-                
-                # 解析JSON字段
-                for field in ['tags', 'ai_classification', 'keywords', 'summary']:
-                    if project.get(field):
-                        try:
-                            project[field] = json.loads(project[field])
-                        except json.JSONDecodeError:
-                            project[field] = {}
+        # crawled_at为ISO格式文本，直接与日期字符串比较即可走索引范围扫描
+        return self._iter_projects('crawled_at >= ?', 'crawled_at DESC, stars DESC',
+                                   (start_date,), fields)
+    
+    def _query_projects(self, condition: str, order_by: str, params: tuple,
+                        fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        查询项目并解析其中的JSON字段
+        
+        Args:
+            condition: WHERE条件
+            order_by: 排序子句
+            params: 查询参数
+            fields: 需要返回的列，默认返回全部列；未选择的JSON字段不做解析
+        
+        Returns:
+            项目列表
+        """
+        return list(self._iter_projects(condition, order_by, params, fields))
+    
+    def _iter_projects(self, condition: str, order_by: str, params: tuple,
+                       fields: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        流式查询项目并解析其中的JSON字段
+        
+        Args:
+            condition: WHERE条件
+            order_by: 排序子句
+            params: 查询参数
+            fields: 需要返回的列，默认返回全部列；未选择的JSON字段不做解析
+        
+        Returns:
+            项目迭代器
+        """
+        if fields is None:
+            columns = '*'
+        else:
+            unknown = set(fields).difference(_PROJECT_COLUMNS)
+            if unknown:
+                raise ValueError(f"未知的项目字段: {sorted(unknown)}")
+            columns = ', '.join(fields)
+        
+        sql = f"SELECT {columns} FROM projects WHERE {condition} ORDER BY {order_by}"
+        return self._stream_projects(sql, params)
+    
+    def _stream_projects(self, sql: str, params: tuple) -> Iterator[Dict[str, Any]]:
+        """
+        在只读连接上执行查询，分批读取结果并逐条生成项目字典；
+        迭代期间持有只读连接并保持同一个读事务，迭代中途写入的数据不会出现在结果中
+        
+        Args:
+            sql: 查询语句
+            params: 查询参数
+        
+        Returns:
+            项目迭代器
+        """
+        with self._ro_lock:
+            conn = self._ro_conn
+            conn.execute("BEGIN")
+            try:
+                cursor = conn.execute(sql, params)
+                column_names = [description[0] for description in cursor.description]
+                json_fields = [field for field in _PROJECT_JSON_FIELDS if field in column_names]
                 
-                projects.append(project)
-            
-            return projects
+                while True:
+                    rows = cursor.fetchmany(_FETCH_BATCH_SIZE)
+                    if not rows:
+                        break
+                    
+                    for row in rows:
+                        project = dict(zip(column_names, row))
+                        
+                        # 解析JSON字段（orjson比标准库json快数倍）
+                        for field in json_fields:
+                            if project[field]:
+                                try:
+                                    project[field] = orjson.loads(project[field])
+                                except orjson.JSONDecodeError:
+                                    project[field] = {}
+                        
+                        yield project
+            finally:
+                conn.execute("COMMIT")
     
     def get_daily_stats(self, date: str) -> Optional[Dict[str, Any]]:
         """
@@ -351,8 +663,8 @@ class DataStorage:
         Returns:
             统计数据字典
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
             
             cursor.execute('''
                 SELECT * FROM daily_stats WHERE date = ?
@@ -369,8 +681,8 @@ class DataStorage:
             for field in ['top_languages', 'top_keywords']:
                 if stats.get(field):
                     try:
-                        stats[field] = json.loads(stats[field])
-                    except json.JSONDecodeError:
+                        stats[field] = orjson.loads(stats[field])
+                    except orjson.JSONDecodeError:
                         stats[field] = []
             
             return stats
@@ -379,29 +691,37 @@ class DataStorage:
         """清理过期数据"""
         cutoff_date = datetime.now() - timedelta(days=self.retention_days)
         
-        # 归档旧的JSON文件
+        cutoff_ts = cutoff_date.timestamp()
+        
+        # 归档旧的数据文件（scandir的目录项自带类型和stat缓存，只需遍历一次目录）
         for data_path in [self.raw_data_path, self.processed_data_path]:
-            for file_path in data_path.glob("*.json"):
-                if file_path.stat().st_mtime < cutoff_date.timestamp():
-                    # 移动到归档目录
-                    archive_path = self.archive_data_path / file_path.name
-                    file_path.rename(archive_path)
-                    logger.info(f"文件已归档: {file_path} -> {archive_path}")
+            with os.scandir(data_path) as entries:
+                for entry in entries:
+                    if (entry.name.endswith(_ARCHIVE_SUFFIXES) and entry.is_file()
+                            and entry.stat().st_mtime < cutoff_ts):
+                        # 移动到归档目录
+                        archive_path = self.archive_data_path / entry.name
+                        os.rename(entry.path, archive_path)
+                        logger.info(f"文件已归档: {entry.path} -> {archive_path}")
         
         # 清理数据库中的旧数据
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cutoff_date_str = cutoff_date.strftime('%Y-%m-%d')
-            
-            cursor.execute('''
-                DELETE FROM projects WHERE DATE(crawled_at) < ?
-            ''', (cutoff_date_str,))
-            
-            cursor.execute('''
-                DELETE FROM daily_stats WHERE date < ?
-            ''', (cutoff_date_str,))
-            
-            conn.commit()
+        cutoff_date_str = cutoff_date.strftime('%Y-%m-%d')
+        
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute('''
+                    DELETE FROM projects WHERE crawled_at < ?
+                ''', (cutoff_date_str,))
+                
+                cursor.execute('''
+                    DELETE FROM daily_stats WHERE date < ?
+                ''', (cutoff_date_str,))
+                
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
         
         logger.info(f"清理完成，删除 {cutoff_date_str} 之前的数据")
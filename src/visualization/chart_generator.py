@@ -3,12 +3,11 @@
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
-from collections import Counter
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+from typing import List, Dict, Any, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 from loguru import logger
 
@@ -54,23 +53,37 @@ class ChartGenerator:
         charts = {}
         
         try:
-            # 1. 编程语言分布图
-            charts['language_distribution'] = self.create_language_distribution_chart(projects)
+            # 只构建一次DataFrame，各图表的统计都基于它按列计算
+            df = self._project_frame(projects)
             
-            # 2. 星标数分布图
-            charts['stars_distribution'] = self.create_stars_distribution_chart(projects)
+            # 单项图表与仪表板共用的统计只计算一次
+            language_counts = self._language_counts(df)
+            stars = self._stars(df)
+            source_counts = self._source_counts(df)
             
-            # 3. 关键词云图
-            charts['keyword_cloud'] = self.create_keyword_chart(projects)
+            builders = [
+                # 编程语言分布图
+                ('language_distribution', partial(self.create_language_distribution_chart,
+                                                  language_counts=language_counts)),
+                # 星标数分布图
+                ('stars_distribution', partial(self.create_stars_distribution_chart, stars=stars)),
+                # 关键词云图
+                ('keyword_cloud', self.create_keyword_chart),
+                # AI分类分布图
+                ('ai_categories', self.create_ai_categories_chart),
+                # 数据源分布图
+                ('source_distribution', partial(self.create_source_distribution_chart,
+                                                source_counts=source_counts)),
+                # 综合仪表板
+                ('dashboard', partial(self.create_dashboard, language_counts=language_counts,
+                                      stars=stars, source_counts=source_counts)),
+            ]
             
-            # 4. AI分类分布图
-            charts['ai_categories'] = self.create_ai_categories_chart(projects)
-            
-            # 5. 数据源分布图
-            charts['source_distribution'] = self.create_source_distribution_chart(projects)
-            
-            # 6. 综合仪表板
-            charts['dashboard'] = self.create_dashboard(projects)
+            # 各图表互不依赖，并行构建与写文件；按原顺序收集结果
+            with ThreadPoolExecutor(max_workers=len(builders)) as executor:
+                futures = [(name, executor.submit(builder, df)) for name, builder in builders]
+                for name, future in futures:
+                    charts[name] = future.result()
             
             logger.info(f"图表生成完成，共生成 {len(charts)} 个图表")
             
@@ -79,27 +92,132 @@ class ChartGenerator:
         
         return charts
     
-    def create_language_distribution_chart(self, projects: List[Dict[str, Any]]) -> str:
+    def _project_frame(self, projects: Union[List[Dict[str, Any]], pd.DataFrame]) -> pd.DataFrame:
+        """
+        将项目列表转换为DataFrame
+        
+        Args:
+            projects: 项目列表或已构建的DataFrame
+        
+        Returns:
+            项目DataFrame
+        """
+        if isinstance(projects, pd.DataFrame):
+            return projects
+        return pd.DataFrame(projects)
+    
+    def _column(self, df: pd.DataFrame, name: str) -> pd.Series:
+        """
+        获取列，所有项目都缺少该字段时返回全空列
+        
+        Args:
+            df: 项目DataFrame
+            name: 列名
+        
+        Returns:
+            列数据
+        """
+        if name in df.columns:
+            return df[name]
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+    
+    def _top_counts(self, values: pd.Series, n: int = None) -> pd.Series:
+        """
+        统计取值频次
+        
+        Args:
+            values: 取值序列
+            n: 只保留前n个，默认全部保留
+        
+        Returns:
+            频次序列；并列时按首次出现顺序，与Counter.most_common一致
+        """
+        counts = values.value_counts(sort=False)
+        return counts.nlargest(n) if n else counts
+    
+    def _language_counts(self, df: pd.DataFrame, n: int = None) -> pd.Series:
+        """统计编程语言（忽略空值），按频次降序排列"""
+        languages = self._column(df, 'language')
+        counts = languages[languages.notna() & (languages != '')].value_counts(sort=False)
+        return counts.nlargest(n or len(counts))
+    
+    def _source_counts(self, df: pd.DataFrame) -> pd.Series:
+        """统计数据源"""
+        return self._top_counts(self._column(df, 'source').fillna('未知'))
+    
+    def _stars(self, df: pd.DataFrame) -> np.ndarray:
+        """获取星标数数组"""
+        return self._column(df, 'stars').fillna(0).to_numpy()
+    
+    def _histogram_bar(self, values: np.ndarray, bins: int, **kwargs) -> 'go.Bar':
+        """
+        用numpy预先分箱并生成柱状图，HTML中只保存各箱计数而不是全部原始数据
+        
+        Args:
+            values: 数值数组
+            bins: 分箱数量
+            **kwargs: 传给go.Bar的其他参数
+        
+        Returns:
+            柱状图对象
+        """
+        import plotly.graph_objects as go
+        
+        counts, edges = np.histogram(np.asarray(values, dtype=float), bins=bins)
+        
+        return go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            customdata=np.column_stack([edges[:-1], edges[1:]]),
+            hovertemplate='%{customdata[0]:.0f} - %{customdata[1]:.0f}<br>%{y}<extra></extra>',
+            **kwargs
+        )
+    
+    def _write_chart(self, fig: 'go.Figure', filename: str) -> str:
+        """
+        保存图表为HTML文件，plotly.js通过CDN引用而不内联到每个文件
+        
+        同时保存同名的图表JSON，报告直接嵌入图表数据而无需解析HTML
+        
+        Args:
+            fig: 图表对象
+            filename: 文件名
+        
+        Returns:
+            图表文件路径
+        """
+        filepath = self.charts_path / filename
+        fig.write_html(str(filepath), include_plotlyjs='cdn')
+        filepath.with_suffix('.json').write_text(fig.to_json(), encoding='utf-8')
+        
+        return str(filepath)
+    
+    def create_language_distribution_chart(self, projects: Union[List[Dict[str, Any]], pd.DataFrame],
+                                           language_counts: Optional[pd.Series] = None) -> str:
         """
         创建编程语言分布图
         
         Args:
             projects: 项目列表
+            language_counts: 预先计算的编程语言频次，默认由projects统计
         
         Returns:
             图表文件路径
         """
-        # 统计编程语言
-        languages = [p.get('language', '未知') for p in projects if p.get('language')]
-        language_counts = Counter(languages)
+        # plotly导入较慢，仅在生成图表时加载
+        import plotly.graph_objects as go
+        
+        if language_counts is None:
+            language_counts = self._language_counts(self._project_frame(projects))
         
-        # 取前10个
-        top_languages = dict(language_counts.most_common(10))
+        # 统计编程语言，取前10个
+        top_languages = language_counts.head(10)
         
         # 创建饼图
         fig = go.Figure(data=[go.Pie(
-            labels=list(top_languages.keys()),
-            values=list(top_languages.values()),
+            labels=top_languages.index.tolist(),
+            values=top_languages.tolist(),
             hole=0.3,
             textinfo='label+percent',
             textfont_size=self.font_size
@@ -118,28 +236,28 @@ class ChartGenerator:
         )
         
         # 保存图表
-        filepath = self.charts_path / "language_distribution.html"
-        fig.write_html(str(filepath))
-        
-        return str(filepath)
+        return self._write_chart(fig, "language_distribution.html")
     
-    def create_stars_distribution_chart(self, projects: List[Dict[str, Any]]) -> str:
+    def create_stars_distribution_chart(self, projects: Union[List[Dict[str, Any]], pd.DataFrame],
+                                        stars: Optional[np.ndarray] = None) -> str:
         """
         创建星标数分布图
         
         Args:
             projects: 项目列表
+            stars: 预先计算的星标数数组，默认由projects提取
         
         Returns:
             图表文件路径
         """
+        import plotly.graph_objects as go
+        
         # 获取星标数据
-        stars_data = [p.get('stars', 0) for p in projects]
+        stars_data = stars if stars is not None else self._stars(self._project_frame(projects))
         
         # 创建直方图
-        fig = go.Figure(data=[go.Histogram(
-            x=stars_data,
-            nbinsx=20,
+        fig = go.Figure(data=[self._histogram_bar(
+            stars_data, 20,
             opacity=0.7,
             marker_color='skyblue'
         )])
@@ -158,12 +276,9 @@ class ChartGenerator:
         )
         
         # 保存图表
-        filepath = self.charts_path / "stars_distribution.html"
-        fig.write_html(str(filepath))
-        
-        return str(filepath)
+        return self._write_chart(fig, "stars_distribution.html")
     
-    def create_keyword_chart(self, projects: List[Dict[str, Any]]) -> str:
+    def create_keyword_chart(self, projects: Union[List[Dict[str, Any]], pd.DataFrame]) -> str:
         """
         创建关键词图表
         
@@ -173,20 +288,18 @@ class ChartGenerator:
         Returns:
             图表文件路径
         """
-        # 收集所有关键词
-        all_keywords = []
-        for project in projects:
-            keywords = project.get('keywords', {}).get('keywords', [])
-            all_keywords.extend(keywords)
+        import plotly.graph_objects as go
+        
+        df = self._project_frame(projects)
         
-        # 统计关键词频率
-        keyword_counts = Counter(all_keywords)
-        top_keywords = dict(keyword_counts.most_common(20))
+        # 展开所有关键词并统计频率
+        all_keywords = self._column(df, 'keywords').str.get('keywords').explode().dropna()
+        top_keywords = self._top_counts(all_keywords, 20)
         
         # 创建条形图
         fig = go.Figure(data=[go.Bar(
-            x=list(top_keywords.values()),
-            y=list(top_keywords.keys()),
+            x=top_keywords.tolist(),
+            y=top_keywords.index.tolist(),
             orientation='h',
             marker_color='lightcoral'
         )])
@@ -205,12 +318,9 @@ class ChartGenerator:
         )
         
         # 保存图表
-        filepath = self.charts_path / "keyword_chart.html"
-        fig.write_html(str(filepath))
-        
-        return str(filepath)
+        return self._write_chart(fig, "keyword_chart.html")
     
-    def create_ai_categories_chart(self, projects: List[Dict[str, Any]]) -> str:
+    def create_ai_categories_chart(self, projects: Union[List[Dict[str, Any]], pd.DataFrame]) -> str:
         """
         创建AI分类分布图
         
@@ -220,17 +330,15 @@ class ChartGenerator:
         Returns:
             图表文件路径
         """
-        # 收集AI分类
-        all_categories = []
-        for project in projects:
-            ai_classification = project.get('ai_classification', {})
-            categories = ai_classification.get('ai_categories', [])
-            all_categories.extend(categories)
+        import plotly.graph_objects as go
         
-        # 统计分类
-        category_counts = Counter(all_categories)
+        df = self._project_frame(projects)
         
-        if not category_counts:
+        # 展开AI分类并统计
+        all_categories = self._column(df, 'ai_classification').str.get('ai_categories').explode().dropna()
+        category_counts = self._top_counts(all_categories)
+        
+        if category_counts.empty:
             # 如果没有分类数据，创建一个默认图表
             fig = go.Figure()
             fig.add_annotation(
@@ -242,8 +350,8 @@ class ChartGenerator:
         else:
             # 创建条形图
             fig = go.Figure(data=[go.Bar(
-                x=list(category_counts.keys()),
-                y=list(category_counts.values()),
+                x=category_counts.index.tolist(),
+                y=category_counts.tolist(),
                 marker_color='lightgreen'
             )])
         
@@ -261,29 +369,30 @@ class ChartGenerator:
         )
         
         # 保存图表
-        filepath = self.charts_path / "ai_categories.html"
-        fig.write_html(str(filepath))
-        
-        return str(filepath)
+        return self._write_chart(fig, "ai_categories.html")
     
-    def create_source_distribution_chart(self, projects: List[Dict[str, Any]]) -> str:
+    def create_source_distribution_chart(self, projects: Union[List[Dict[str, Any]], pd.DataFrame],
+                                         source_counts: Optional[pd.Series] = None) -> str:
         """
         创建数据源分布图
         
         Args:
             projects: 项目列表
+            source_counts: 预先计算的数据源频次，默认由projects统计
         
         Returns:
             图表文件路径
         """
+        import plotly.graph_objects as go
+        
         # 统计数据源
-        sources = [p.get('source', '未知') for p in projects]
-        source_counts = Counter(sources)
+        if source_counts is None:
+            source_counts = self._source_counts(self._project_frame(projects))
         
         # 创建饼图
         fig = go.Figure(data=[go.Pie(
-            labels=list(source_counts.keys()),
-            values=list(source_counts.values()),
+            labels=source_counts.index.tolist(),
+            values=source_counts.tolist(),
             textinfo='label+value',
             textfont_size=self.font_size
         )])
@@ -300,61 +409,68 @@ class ChartGenerator:
         )
         
         # 保存图表
-        filepath = self.charts_path / "source_distribution.html"
-        fig.write_html(str(filepath))
-        
-        return str(filepath)
+        return self._write_chart(fig, "source_distribution.html")
     
-    def create_dashboard(self, projects: List[Dict[str, Any]]) -> str:
+    def create_dashboard(self, projects: Union[List[Dict[str, Any]], pd.DataFrame],
+                         language_counts: Optional[pd.Series] = None,
+                         stars: Optional[np.ndarray] = None,
+                         source_counts: Optional[pd.Series] = None) -> str:
         """
         创建综合仪表板
         
         Args:
             projects: 项目列表
+            language_counts: 预先计算的编程语言频次，默认由projects统计
+            stars: 预先计算的星标数数组，默认由projects提取
+            source_counts: 预先计算的数据源频次，默认由projects统计
         
         Returns:
             图表文件路径
         """
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        
+        df = self._project_frame(projects)
+        
         # 创建子图
         fig = make_subplots(
             rows=2, cols=2,
             subplot_titles=('编程语言分布', '星标数分布', '数据源分布', '项目统计'),
-            specs=[[{"type": "pie"}, {"type": "histogram"}],
+            specs=[[{"type": "pie"}, {"type": "bar"}],
                    [{"type": "pie"}, {"type": "bar"}]]
         )
         
         # 1. 编程语言分布
-        languages = [p.get('language', '未知') for p in projects if p.get('language')]
-        language_counts = Counter(languages)
-        top_languages = dict(language_counts.most_common(5))
+        if language_counts is None:
+            language_counts = self._language_counts(df)
+        top_languages = language_counts.head(5)
         
         fig.add_trace(go.Pie(
-            labels=list(top_languages.keys()),
-            values=list(top_languages.values()),
+            labels=top_languages.index.tolist(),
+            values=top_languages.tolist(),
             name="编程语言"
         ), row=1, col=1)
         
         # 2. 星标数分布
-        stars_data = [p.get('stars', 0) for p in projects]
-        fig.add_trace(go.Histogram(
-            x=stars_data,
-            name="星标数",
-            nbinsx=10
+        stars_data = stars if stars is not None else self._stars(df)
+        fig.add_trace(self._histogram_bar(
+            stars_data, 10,
+            name="星标数"
         ), row=1, col=2)
         
         # 3. 数据源分布
-        sources = [p.get('source', '未知') for p in projects]
-        source_counts = Counter(sources)
+        if source_counts is None:
+            source_counts = self._source_counts(df)
         
         fig.add_trace(go.Pie(
-            labels=list(source_counts.keys()),
-            values=list(source_counts.values()),
+            labels=source_counts.index.tolist(),
+            values=source_counts.tolist(),
             name="数据源"
         ), row=2, col=1)
         
         # 4. 项目统计
-        total_projects = len(projects)
-        avg_stars = sum(p.get('stars', 0) for p in projects) / len(projects) if projects else 0
+        total_projects = len(df)
+        avg_stars = float(stars_data.mean()) if total_projects else 0
         
         fig.add_trace(go.Bar(
             x=['总项目数', '平均星标数'],
@@ -375,7 +491,4 @@ class ChartGenerator:
         )
         
         # 保存图表
-        filepath = self.charts_path / "dashboard.html"
-        fig.write_html(str(filepath))
-        
-        return str(filepath)
+        return self._write_chart(fig, "dashboard.html")
@@ -3,226 +3,25 @@
 """
 
 import json
-from datetime import datetime, timedelta
+import math
+import os
+import hashlib
+from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+import orjson
+from jinja2 import BaseLoader, Environment, Template
+from jinja2.environment import TemplateStream
 from loguru import logger
+from markupsafe import Markup
 
 from utils.daily_records import DailyRecordsManager
 
 
-class HistoryPageGenerator:
-    """历史记录页面生成器"""
-    
-    def __init__(self, config: Dict[str, Any]):
-        """初始化"""
-        self.config = config
-        self.records_manager = DailyRecordsManager(config)
-        self.output_dir = Path(config.get('data', {}).get('paths', {}).get('output', 'output'))
-    
-    def generate_history_page(self, days: int = 30) -> str:
-        """生成历史记录页面"""
-        try:
-            # 获取最近的记录
-            recent_records = self.records_manager.get_recent_records(days)
-            
-            # 获取趋势分析数据
-            trend_data = self.records_manager.get_trend_analysis(days)
-            
-            # 生成HTML页面
-            html_content = self._generate_html(recent_records, trend_data)
-            
-            # 保存页面
-            output_path = self.output_dir / "history.html"
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            logger.info(f"历史记录页面生成成功: {output_path}")
-            return str(output_path)
-            
-        except Exception as e:
-            logger.error(f"生成历史记录页面失败: {e}")
-            return ""
-    
-    def _generate_html(self, records: List[Dict[str, Any]], 
-                      trend_data: Dict[str, Any]) -> str:
-        """生成HTML内容"""
-        
-        # 生成记录卡片
-        records_html = ""
-        for record in records:
-            records_html += self._generate_record_card(record)
-        
-        # 生成趋势图表数据
-        chart_data = self._prepare_chart_data(trend_data)
-        
-        html_template = f"""
-<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI项目雷达 - 历史记录</title>
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <style>
-        {self._get_css_styles()}
-    </style>
-</head>
-<body>
-    <div class="bg-gradient"></div>
-    
-    <div class="container">
-        <header class="header">
-            <h1><i class="fas fa-history"></i> AI项目雷达历史记录</h1>
-            <p>追踪每日AI项目发现趋势</p>
-            <div class="nav-buttons">
-                <a href="index.html" class="btn btn-secondary">
-                    <i class="fas fa-home"></i> 返回首页
-                </a>
-                <a href="#trends" class="btn">
-                    <i class="fas fa-chart-line"></i> 查看趋势
-                </a>
-            </div>
-        </header>
-        
-        <!-- 趋势图表区域 -->
-        <section id="trends" class="trends-section">
-            <h2><i class="fas fa-chart-line"></i> 趋势分析</h2>
-            <div class="charts-grid">
-                <div class="chart-container">
-                    <h3>每日AI项目发现数量</h3>
-                    <canvas id="dailyChart"></canvas>
-                </div>
-                <div class="chart-container">
-                    <h3>编程语言分布</h3>
-                    <canvas id="languageChart"></canvas>
-                </div>
-            </div>
-        </section>
-        
-        <!-- 历史记录列表 -->
-        <section class="records-section">
-            <h2><i class="fas fa-calendar-alt"></i> 每日记录</h2>
-            <div class="records-grid">
-                {records_html}
-            </div>
-        </section>
-        
-        <footer class="footer">
-            <p>数据更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p>
-                <a href="https://github.com/huangzhongping/AIProjectCrawler" target="_blank">
-                    <i class="fab fa-github"></i> 项目源码
-                </a>
-            </p>
-        </footer>
-    </div>
-    
-    <script>
-        {self._get_javascript(chart_data)}
-    </script>
-</body>
-</html>
-        """
-        
-        return html_template
-    
-    def _generate_record_card(self, record: Dict[str, Any]) -> str:
-        """生成单个记录卡片"""
-        date = record.get('date', '')
-        total_projects = record.get('total_projects', 0)
-        ai_projects = record.get('ai_projects', 0)
-        top_project_name = record.get('top_project_name', '')
-        top_project_stars = record.get('top_project_stars', 0)
-        top_project_url = record.get('top_project_url', '')
-        summary = record.get('summary', '')
-        
-        # 计算AI项目比例
-        ai_percentage = (ai_projects / total_projects * 100) if total_projects > 0 else 0
-        
-        # 格式化日期
-        try:
-            date_obj = datetime.strptime(date, '%Y-%m-%d')
-            formatted_date = date_obj.strftime('%m月%d日')
-            weekday = ['周一', '周二', '周三', '周四', '周五', '周六', '周日'][date_obj.weekday()]
-        except:
-            formatted_date = date
-            weekday = ''
-        
-        return f"""
-        <div class="record-card" data-date="{date}">
-            <div class="record-header">
-                <div class="record-date">
-                    <span class="date-main">{formatted_date}</span>
-                    <span class="date-sub">{weekday}</span>
-                </div>
-                <div class="record-stats">
-                    <div class="stat-item">
-                        <span class="stat-number">{ai_projects}</span>
-                        <span class="stat-label">AI项目</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="stat-number">{ai_percentage:.1f}%</span>
-                        <span class="stat-label">占比</span>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="record-content">
-                <div class="record-summary">{summary}</div>
-                
-                {f'''
-                <div class="top-project">
-                    <div class="project-label">🏆 今日最热</div>
-                    <div class="project-info">
-                        <a href="{top_project_url}" target="_blank" class="project-name">
-                            {top_project_name}
-                        </a>
-                        <span class="project-stars">
-                            <i class="fas fa-star"></i> {top_project_stars:,}
-                        </span>
-                    </div>
-                </div>
-                ''' if top_project_name else ''}
-            </div>
-            
-            <div class="record-actions">
-                <button class="btn-small" onclick="viewDetails('{date}')">
-                    <i class="fas fa-eye"></i> 查看详情
-                </button>
-                <span class="record-total">{total_projects} 个项目</span>
-            </div>
-        </div>
-        """
-    
-    def _prepare_chart_data(self, trend_data: Dict[str, Any]) -> Dict[str, Any]:
-        """准备图表数据"""
-        daily_counts = trend_data.get('daily_counts', [])
-        language_trends = trend_data.get('language_trends', [])
-        
-        # 每日数量数据
-        daily_labels = [item['date'] for item in daily_counts]
-        daily_values = [item['ai_projects'] for item in daily_counts]
-        
-        # 语言分布数据
-        language_labels = [item['stat_name'] for item in language_trends[:8]]
-        language_values = [item['avg_percentage'] for item in language_trends[:8]]
-        
-        return {
-            'daily': {
-                'labels': daily_labels,
-                'values': daily_values
-            },
-            'languages': {
-                'labels': language_labels,
-                'values': language_values
-            }
-        }
-    
-    def _get_css_styles(self) -> str:
-        """获取CSS样式"""
-        return """
+# 页面样式，每次生成页面时原样复用
+_CSS_STYLES = """
         * {
             margin: 0;
             padding: 0;
@@ -349,10 +148,17 @@ class HistoryPageGenerator:
             color: #fff;
         }
         
-        .chart-container canvas {
+        .chart-container svg {
+            display: block;
+            width: 100%;
             max-height: 300px;
         }
         
+        .chart-container text {
+            fill: #fff;
+            font-size: 12px;
+        }
+        
         .records-section h2 {
             font-size: 2.5rem;
             margin-bottom: 40px;
@@ -520,88 +326,552 @@ class HistoryPageGenerator:
             }
         }
         """
+
+# 页面脚本（图表已在服务端渲染为SVG）
+_JAVASCRIPT = """
+        function viewDetails(date) {
+            // 这里可以添加查看详情的功能
+            alert('查看 ' + date + ' 的详细记录');
+        }
+        """
+
+
+# 星期名称，按date.weekday()索引
+_WEEKDAYS = ('周一', '周二', '周三', '周四', '周五', '周六', '周日')
+
+
+# 趋势数据中图表需要的(标签, 数值)
+_get_daily_point = itemgetter('date', 'ai_projects')
+_get_language_point = itemgetter('stat_name', 'avg_percentage')
+
+
+def _split_pairs(pairs: Iterable[Tuple[Any, Any]]) -> Tuple[list, list]:
+    """
+    将(标签, 数值)序列拆分为标签列表和数值列表
     
-    def _get_javascript(self, chart_data: Dict[str, Any]) -> str:
-        """获取JavaScript代码"""
-        return f"""
-        // 图表数据
-        const chartData = {json.dumps(chart_data)};
-        
-        // 初始化图表
-        document.addEventListener('DOMContentLoaded', function() {{
-            initDailyChart();
-            initLanguageChart();
-        }});
-        
-        function initDailyChart() {{
-            const ctx = document.getElementById('dailyChart');
-            if (!ctx) return;
+    Args:
+        pairs: (标签, 数值)序列
+    
+    Returns:
+        (标签列表, 数值列表)
+    """
+    labels, values = tuple(zip(*pairs)) or ((), ())
+    return list(labels), list(values)
+
+
+# 图表配色（与页面主题一致）
+_CHART_COLORS = ('#ff006e', '#8338ec', '#3a86ff', '#06ffa5', '#ffbe0b', '#fb5607', '#ff006e', '#8338ec')
+
+# 折线图画布尺寸与边距
+_LINE_WIDTH, _LINE_HEIGHT = 600, 300
+_LINE_PADDING = (20, 20, 30, 40)  # 上、右、下、左
+
+# 环形图圆心、半径与环宽
+_DOUGHNUT_CENTER, _DOUGHNUT_RADIUS, _DOUGHNUT_THICKNESS = 150, 95, 50
+
+
+def _render_line_svg(labels: List[str], values: List[float]) -> Markup:
+    """
+    在服务端渲染折线面积图
+    
+    Args:
+        labels: 横轴标签（日期）
+        values: 数值
+    
+    Returns:
+        SVG标记
+    """
+    top, right, bottom, left = _LINE_PADDING
+    plot_width = _LINE_WIDTH - left - right
+    plot_height = _LINE_HEIGHT - top - bottom
+    baseline = top + plot_height
+    max_value = max(values, default=0) or 1
+    
+    step = plot_width / (len(values) - 1) if len(values) > 1 else 0
+    points = [
+        (left + (index * step if step else plot_width / 2), baseline - value / max_value * plot_height)
+        for index, value in enumerate(values)
+    ]
+    
+    parts = [Markup('<svg viewBox="0 0 {} {}" role="img" aria-label="每日AI项目发现数量">').format(
+        _LINE_WIDTH, _LINE_HEIGHT)]
+    
+    # 横向网格线与纵轴刻度
+    for tick in range(5):
+        y = baseline - tick / 4 * plot_height
+        parts.append(Markup(
+            '<line x1="{}" y1="{:.1f}" x2="{}" y2="{:.1f}" stroke="rgba(255,255,255,0.1)"/>'
+            '<text x="{}" y="{:.1f}" text-anchor="end" dominant-baseline="middle">{:g}</text>'
+        ).format(left, y, _LINE_WIDTH - right, y, left - 6, y, round(max_value * tick / 4, 1)))
+    
+    if points:
+        coords = ' '.join(f'{x:.1f},{y:.1f}' for x, y in points)
+        parts.append(Markup(
+            '<polygon points="{:.1f},{} {} {:.1f},{}" fill="rgba(255, 0, 110, 0.1)"/>'
+            '<polyline points="{}" fill="none" stroke="#ff006e" stroke-width="2"/>'
+        ).format(points[0][0], baseline, coords, points[-1][0], baseline, coords))
+        
+        for label, value, (x, y) in zip(labels, values, points):
+            parts.append(Markup(
+                '<circle cx="{:.1f}" cy="{:.1f}" r="3" fill="#ff006e"><title>{}: {}</title></circle>'
+            ).format(x, y, label, value))
+        
+        # 横轴标签最多显示7个，避免重叠
+        label_step = max(1, math.ceil(len(labels) / 7))
+        for label, (x, _) in list(zip(labels, points))[::label_step]:
+            parts.append(Markup('<text x="{:.1f}" y="{}" text-anchor="middle">{}</text>').format(
+                x, _LINE_HEIGHT - 8, label))
+    
+    parts.append(Markup('</svg>'))
+    return Markup('').join(parts)
+
+
+def _render_doughnut_svg(labels: List[str], values: List[float]) -> Markup:
+    """
+    在服务端渲染环形图（每段为一个按比例设置描边虚线的圆）
+    
+    Args:
+        labels: 分类标签
+        values: 数值
+    
+    Returns:
+        SVG标记
+    """
+    circumference = 2 * math.pi * _DOUGHNUT_RADIUS
+    total = sum(values)
+    
+    parts = [Markup(
+        '<svg viewBox="0 0 {} {}" role="img" aria-label="编程语言分布">'
+        '<g transform="rotate(-90 {} {})" fill="none" stroke-width="{}">'
+        '<circle cx="{}" cy="{}" r="{}" stroke="rgba(255,255,255,0.1)"/>'
+    ).format(_LINE_WIDTH, _LINE_HEIGHT, _DOUGHNUT_CENTER, _DOUGHNUT_CENTER, _DOUGHNUT_THICKNESS,
+             _DOUGHNUT_CENTER, _DOUGHNUT_CENTER, _DOUGHNUT_RADIUS)]
+    
+    offset = 0.0
+    if total > 0:
+        for label, value, color in zip(labels, values, _CHART_COLORS):
+            length = value / total * circumference
+            parts.append(Markup(
+                '<circle cx="{}" cy="{}" r="{}" stroke="{}" '
+                'stroke-dasharray="{:.2f} {:.2f}" stroke-dashoffset="{:.2f}"><title>{}: {}</title></circle>'
+            ).format(_DOUGHNUT_CENTER, _DOUGHNUT_CENTER, _DOUGHNUT_RADIUS, color,
+                     length, circumference - length, -offset, label, value))
+            offset += length
+    parts.append(Markup('</g>'))
+    
+    # 图例
+    for index, (label, color) in enumerate(zip(labels, _CHART_COLORS)):
+        y = 40 + index * 30
+        parts.append(Markup(
+            '<rect x="320" y="{}" width="14" height="14" rx="3" fill="{}"/>'
+            '<text x="344" y="{}" dominant-baseline="middle">{}</text>'
+        ).format(y - 7, color, y, label))
+    
+    parts.append(Markup('</svg>'))
+    return Markup('').join(parts)
+
+
+def _format_record_date(date: str) -> Tuple[str, str]:
+    """
+    格式化记录日期
+    
+    Args:
+        date: 日期字符串 (YYYY-MM-DD)
+    
+    Returns:
+        (月日, 星期)，无法解析时返回原字符串和空星期
+    """
+    try:
+        date_obj = datetime.fromisoformat(date)
+    except (TypeError, ValueError):
+        return date, ''
+    
+    return f"{date_obj.month:02d}月{date_obj.day:02d}日", _WEEKDAYS[date_obj.weekday()]
+
+
+# 记录卡片字段的默认值
+_CARD_DEFAULTS = {
+    'date': '', 'total_projects': 0, 'ai_projects': 0, 'summary': '',
+    'top_project_name': '', 'top_project_stars': 0, 'top_project_url': ''
+}
+
+
+def _card_context(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    构建记录卡片的模板上下文（扁平字典，模板中按变量名直接取值）
+    
+    Args:
+        record: 每日记录
+    
+    Returns:
+        模板上下文
+    """
+    context = {**_CARD_DEFAULTS, **record}
+    
+    # 计算AI项目比例
+    total_projects = context['total_projects']
+    context['ai_percentage'] = (context['ai_projects'] / total_projects * 100) if total_projects > 0 else 0
+    
+    # 格式化日期
+    context['formatted_date'], context['weekday'] = _format_record_date(context['date'])
+    
+    return context
+
+
+def _dumps_json(obj: Any, sort_keys: bool = False, indent: Optional[int] = None, **kwargs) -> str:
+    """
+    用orjson序列化为UTF-8 JSON文本（中文不转义为\\uXXXX），供tojson过滤器使用
+    
+    Args:
+        obj: 待序列化对象
+        sort_keys: 是否按键排序
+        indent: 缩进（orjson只支持2个空格）
+        **kwargs: 其他json.dumps参数
+    
+    Returns:
+        JSON文本
+    """
+    # orjson无法表达的参数交给标准库处理
+    if kwargs or indent not in (None, 0, 2):
+        return json.dumps(obj, sort_keys=sort_keys, indent=indent, ensure_ascii=False, **kwargs)
+    
+    option = (orjson.OPT_SORT_KEYS if sort_keys else 0) | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(obj, option=option).decode()
+
+
+# 记录卡片与页面模板，由_get_template编译一次后复用
+_CARD_SOURCE = """
+        <div class="record-card" data-date="{{ date }}">
+            <div class="record-header">
+                <div class="record-date">
+                    <span class="date-main">{{ formatted_date }}</span>
+                    <span class="date-sub">{{ weekday }}</span>
+                </div>
+                <div class="record-stats">
+                    <div class="stat-item">
+                        <span class="stat-number">{{ ai_projects }}</span>
+                        <span class="stat-label">AI项目</span>
+                    </div>
+                    <div class="stat-item">
+                        <span class="stat-number">{{ '%.1f'|format(ai_percentage) }}%</span>
+                        <span class="stat-label">占比</span>
+                    </div>
+                </div>
+            </div>
             
-            new Chart(ctx, {{
-                type: 'line',
-                data: {{
-                    labels: chartData.daily.labels,
-                    datasets: [{{
-                        label: 'AI项目数量',
-                        data: chartData.daily.values,
-                        borderColor: '#ff006e',
-                        backgroundColor: 'rgba(255, 0, 110, 0.1)',
-                        tension: 0.4,
-                        fill: true
-                    }}]
-                }},
-                options: {{
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    plugins: {{
-                        legend: {{
-                            labels: {{ color: '#fff' }}
-                        }}
-                    }},
-                    scales: {{
-                        x: {{
-                            ticks: {{ color: '#fff' }},
-                            grid: {{ color: 'rgba(255,255,255,0.1)' }}
-                        }},
-                        y: {{
-                            ticks: {{ color: '#fff' }},
-                            grid: {{ color: 'rgba(255,255,255,0.1)' }}
-                        }}
-                    }}
-                }}
-            }});
-        }}
-        
-        function initLanguageChart() {{
-            const ctx = document.getElementById('languageChart');
-            if (!ctx) return;
+            <div class="record-content">
+                <div class="record-summary">{{ summary }}</div>
+                
+                {% if top_project_name %}
+                <div class="top-project">
+                    <div class="project-label">🏆 今日最热</div>
+                    <div class="project-info">
+                        <a href="{{ top_project_url }}" target="_blank" class="project-name">
+                            {{ top_project_name }}
+                        </a>
+                        <span class="project-stars">
+                            <i class="fas fa-star"></i> {{ top_project_stars|thousands }}
+                        </span>
+                    </div>
+                </div>
+                {% endif %}
+            </div>
             
-            new Chart(ctx, {{
-                type: 'doughnut',
-                data: {{
-                    labels: chartData.languages.labels,
-                    datasets: [{{
-                        data: chartData.languages.values,
-                        backgroundColor: [
-                            '#ff006e', '#8338ec', '#3a86ff', '#06ffa5',
-                            '#ffbe0b', '#fb5607', '#ff006e', '#8338ec'
-                        ]
-                    }}]
-                }},
-                options: {{
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    plugins: {{
-                        legend: {{
-                            labels: {{ color: '#fff' }}
-                        }}
-                    }}
-                }}
-            }});
-        }}
-        
-        function viewDetails(date) {{
-            // 这里可以添加查看详情的功能
-            alert('查看 ' + date + ' 的详细记录');
-        }}
+            <div class="record-actions">
+                <button class="btn-small" onclick='viewDetails({{ date|tojson }})'>
+                    <i class="fas fa-eye"></i> 查看详情
+                </button>
+                <span class="record-total">{{ total_projects }} 个项目</span>
+            </div>
+        </div>
+"""
+
+# 卡片模板源码，参与卡片缓存摘要的计算
+_CARD_SOURCE_BYTES = _CARD_SOURCE.encode('utf-8')
+
+_PAGE_SOURCE = """
+<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI项目雷达 - 历史记录</title>
+    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
+    <style>
+        {{ css }}
+    </style>
+</head>
+<body>
+    <div class="bg-gradient"></div>
+    
+    <div class="container">
+        <header class="header">
+            <h1><i class="fas fa-history"></i> AI项目雷达历史记录</h1>
+            <p>追踪每日AI项目发现趋势</p>
+            <div class="nav-buttons">
+                <a href="index.html" class="btn btn-secondary">
+                    <i class="fas fa-home"></i> 返回首页
+                </a>
+                <a href="#trends" class="btn">
+                    <i class="fas fa-chart-line"></i> 查看趋势
+                </a>
+            </div>
+        </header>
+        
+        <!-- 趋势图表区域 -->
+        <section id="trends" class="trends-section">
+            <h2><i class="fas fa-chart-line"></i> 趋势分析</h2>
+            <div class="charts-grid">
+                <div class="chart-container">
+                    <h3>每日AI项目发现数量</h3>
+                    {{ daily_chart }}
+                </div>
+                <div class="chart-container">
+                    <h3>编程语言分布</h3>
+                    {{ language_chart }}
+                </div>
+            </div>
+        </section>
+        
+        <!-- 历史记录列表 -->
+        <section class="records-section">
+            <h2><i class="fas fa-calendar-alt"></i> 每日记录</h2>
+            <div class="records-grid">
+                {% for card in cards %}{{ card }}{% endfor %}
+            </div>
+        </section>
+        
+        <footer class="footer">
+            <p>数据更新时间: {{ updated_at }}</p>
+            <p>
+                <a href="https://github.com/huangzhongping/AIProjectCrawler" target="_blank">
+                    <i class="fab fa-github"></i> 项目源码
+                </a>
+            </p>
+        </footer>
+    </div>
+    
+    <script>
+        {{ javascript }}
+    </script>
+</body>
+</html>
+"""
+
+
+@lru_cache(maxsize=1)
+def _get_environment() -> Environment:
+    """获取模板环境（开启自动转义）"""
+    env = Environment(loader=BaseLoader(), autoescape=True)
+    env.filters['thousands'] = '{:,}'.format
+    env.policies['json.dumps_function'] = _dumps_json
+    return env
+
+
+@lru_cache(maxsize=None)
+def _get_template(source: str) -> Template:
+    """
+    编译模板，首次使用时编译并缓存，不生成页面时无需付出编译开销
+    
+    Args:
+        source: 模板源码
+    
+    Returns:
+        编译后的模板
+    """
+    return _get_environment().from_string(source)
+
+
+class HistoryPageGenerator:
+    """历史记录页面生成器"""
+    
+    def __init__(self, config: Dict[str, Any]):
+        """初始化"""
+        self.config = config
+        self.records_manager = DailyRecordsManager(config)
+        self.output_dir = Path(config.get('data', {}).get('paths', {}).get('output', 'output'))
+        self.cache_dir = Path(config.get('data', {}).get('paths', {}).get('cache', 'data/cache'))
+        
+        # 上次生成页面时输入数据的摘要，保存在磁盘上，跨进程运行时输入未变化也直接复用已生成的页面
+        self._page_key_path = self.cache_dir / 'history_page.key'
+        
+        # 已渲染的记录卡片，按记录内容摘要索引，内存中与磁盘上各保存一份；
+        # 历史记录不变，跨进程运行时也只需渲染新增或变化的日期
+        self._card_cache: Dict[str, Markup] = {}
+        self._card_dir = self.cache_dir / 'history_cards'
+    
+    def generate_history_page(self, days: int = 30) -> str:
+        """生成历史记录页面"""
+        # 获取最近的记录与趋势分析数据（一次加锁完成全部查询）
+        recent_records, trend_data = self.records_manager.get_recent_and_trend(days)
+        
+        output_path = self.output_dir / "history.html"
+        
+        page_key = hashlib.blake2b(
+            orjson.dumps([days, recent_records, trend_data]), digest_size=16
+        ).hexdigest()
+        if output_path.exists() and self._read_page_key() == page_key:
+            logger.info(f"历史记录未变化，沿用已有页面: {output_path}")
+            return str(output_path)
+        
+        # 生成HTML页面，模板分块渲染并直接写入文件，不在内存中拼接整页
+        # 先写临时文件再原子替换，读取方不会看到写了一半的页面
+        tmp_path = output_path.with_suffix('.html.tmp')
+        replaced = False
+        try:
+            with open(tmp_path, 'wb', buffering=1 << 20) as f:
+                self._stream_html(recent_records, trend_data).dump(f, encoding='utf-8')
+            os.replace(tmp_path, output_path)
+            replaced = True
+        except (OSError, ValueError) as e:
+            logger.error(f"生成历史记录页面失败: {e}")
+            return ""
+        finally:
+            # 任何异常（包括模板渲染错误）中断写入时都清理临时文件
+            if not replaced:
+                tmp_path.unlink(missing_ok=True)
+        
+        self._write_page_key(page_key)
+        
+        logger.info(f"历史记录页面生成成功: {output_path}")
+        return str(output_path)
+    
+    def _read_page_key(self) -> Optional[str]:
+        """读取上次生成页面时的输入摘要，不存在时返回None"""
+        try:
+            return self._page_key_path.read_text(encoding='utf-8')
+        except OSError:
+            return None
+    
+    def _write_page_key(self, page_key: str) -> None:
+        """
+        保存本次生成页面的输入摘要
+        
+        Args:
+            page_key: 输入数据摘要
+        """
+        try:
+            self._page_key_path.parent.mkdir(parents=True, exist_ok=True)
+            self._page_key_path.write_text(page_key, encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"保存历史页面缓存摘要失败: {e}")
+    
+    def _stream_html(self, records: List[Dict[str, Any]], 
+                     trend_data: Dict[str, Any]) -> TemplateStream:
+        """生成HTML内容（按块产出的模板流）"""
+        
+        # 生成趋势图表数据
+        chart_data = self._prepare_chart_data(trend_data)
+        
+        return _get_template(_PAGE_SOURCE).stream(
+            cards=self._render_record_cards(records),
+            daily_chart=_render_line_svg(chart_data['daily']['labels'], chart_data['daily']['values']),
+            language_chart=_render_doughnut_svg(chart_data['languages']['labels'],
+                                                chart_data['languages']['values']),
+            css=Markup(self._get_css_styles()),
+            javascript=Markup(self._get_javascript()),
+            updated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
+    
+    def _render_record_cards(self, records: List[Dict[str, Any]]) -> List[Markup]:
+        """
+        渲染记录卡片，内容未变化的记录复用内存或磁盘上已渲染的卡片
+        
+        Args:
+            records: 记录列表
+        
+        Returns:
+            卡片HTML列表
+        """
+        card_cache = {}
+        cards = []
+        for record in records:
+            # 摘要包含卡片模板，模板修改后旧卡片自然失效
+            key = hashlib.blake2b(
+                orjson.dumps(record, option=orjson.OPT_SORT_KEYS) + _CARD_SOURCE_BYTES, digest_size=16
+            ).hexdigest()
+            card = self._card_cache.get(key)
+            if card is None:
+                card = self._load_or_render_card(key, record)
+            card_cache[key] = card
+            cards.append(card)
+        
+        # 只保留本次仍在页面上的卡片
+        self._card_cache = card_cache
+        self._prune_card_files(card_cache)
+        return cards
+    
+    def _load_or_render_card(self, key: str, record: Dict[str, Any]) -> Markup:
+        """
+        从磁盘读取已渲染的卡片，不存在时渲染并保存
+        
+        Args:
+            key: 记录内容摘要
+            record: 每日记录
+        
+        Returns:
+            卡片HTML
+        """
+        path = self._card_dir / f"{key}.html"
+        try:
+            return Markup(path.read_text(encoding='utf-8'))
+        except OSError:
+            pass
+        
+        card = Markup(_get_template(_CARD_SOURCE).render(_card_context(record)))
+        
+        # 先写临时文件再原子替换，不会读到写了一半的卡片
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            self._card_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(card, encoding='utf-8')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"保存历史记录卡片缓存失败: {e}")
+            tmp_path.unlink(missing_ok=True)
+        
+        return card
+    
+    def _prune_card_files(self, card_cache: Dict[str, Markup]) -> None:
+        """
+        删除磁盘上不再出现在页面中的卡片
+        
+        Args:
+            card_cache: 本次页面使用的卡片
         """
+        try:
+            for path in self._card_dir.glob('*.html'):
+                if path.stem not in card_cache:
+                    path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"清理历史记录卡片缓存失败: {e}")
+    
+    def _prepare_chart_data(self, trend_data: Dict[str, Any]) -> Dict[str, Any]:
+        """准备图表数据"""
+        daily_counts = trend_data.get('daily_counts', [])
+        language_trends = trend_data.get('language_trends', [])
+        
+        # 每日数量数据
+        daily_labels, daily_values = _split_pairs(map(_get_daily_point, daily_counts))
+        
+        # 语言分布数据
+        language_labels, language_values = _split_pairs(map(_get_language_point, language_trends[:8]))
+        
+        return {
+            'daily': {
+                'labels': daily_labels,
+                'values': daily_values
+            },
+            'languages': {
+                'labels': language_labels,
+                'values': language_values
+            }
+        }
+    
+    def _get_css_styles(self) -> str:
+        """获取CSS样式"""
+        return _CSS_STYLES
+    
+    def _get_javascript(self) -> str:
+        """获取JavaScript代码"""
+        return _JAVASCRIPT
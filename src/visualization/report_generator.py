@@ -2,18 +2,515 @@
 报告生成器
 """
 
+import os
+import re
 import json
+import math
+import time
+import asyncio
+import hashlib
+import threading
 from pathlib import Path
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Deque, List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from collections import Counter
+from collections import Counter, deque
+import numpy as np
+import orjson
+from jinja2 import BaseLoader, Environment, Template
+from markupsafe import Markup
 from openai import AsyncOpenAI
 from loguru import logger
 
+from utils.config import load_prompts
+
+
+# 趋势分析单次请求的最大输出token数
+_TREND_MAX_TOKENS = 1000
+
+# 分片趋势分析的汇总提示词
+_TREND_REDUCE_PROMPT = """以下是对同一批AI项目分批得到的趋势分析结果（JSON数组，每批基于相同的整体统计和不同的代表性项目）：
+{analyses}
+
+请将它们合并为一份整体趋势分析：hot_trends、emerging_tech、focus_areas合并去重并按重要性排序，
+trend_analysis写成一段连贯的整体分析，不要逐批罗列。
+返回包含hot_trends、emerging_tech、focus_areas、trend_analysis字段的JSON对象。"""
+
+# 汇总时传给模型的分片结果字段
+_TREND_FIELDS = ('hot_trends', 'emerging_tech', 'focus_areas', 'trend_analysis')
+
+# HTML报告样式（静态内容，不随报告数据变化）
+_REPORT_CSS = """\
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f8f9fa;
+        }
+        .header {
+            text-align: center;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 40px 20px;
+            border-radius: 10px;
+            margin-bottom: 30px;
+        }
+        .header h1 {
+            margin: 0;
+            font-size: 2.5em;
+        }
+        .header p {
+            margin: 10px 0 0 0;
+            opacity: 0.9;
+        }
+        .stats {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            margin-bottom: 30px;
+        }
+        .stat-card {
+            background: white;
+            padding: 20px;
+            border-radius: 8px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            text-align: center;
+        }
+        .stat-number {
+            font-size: 2em;
+            font-weight: bold;
+            color: #667eea;
+        }
+        .section {
+            background: white;
+            margin-bottom: 30px;
+            border-radius: 8px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            overflow: hidden;
+        }
+        .section-header {
+            background: #667eea;
+            color: white;
+            padding: 20px;
+            font-size: 1.3em;
+            font-weight: bold;
+        }
+        .section-content {
+            padding: 20px;
+        }
+        .project-item {
+            border-bottom: 1px solid #eee;
+            padding: 20px 0;
+        }
+        .project-item:last-child {
+            border-bottom: none;
+        }
+        .project-item h3 {
+            margin: 0 0 10px 0;
+            color: #333;
+        }
+        .project-item h3 a {
+            color: #667eea;
+            text-decoration: none;
+        }
+        .project-item h3 a:hover {
+            text-decoration: underline;
+        }
+        .project-meta {
+            margin-bottom: 10px;
+        }
+        .project-meta span {
+            display: inline-block;
+            margin-right: 15px;
+            padding: 4px 8px;
+            background: #f1f3f4;
+            border-radius: 4px;
+            font-size: 0.9em;
+        }
+        .description {
+            color: #666;
+            margin: 0;
+        }
+        .trend-analysis {
+            background: #f8f9fa;
+            padding: 20px;
+            border-radius: 8px;
+            margin: 20px 0;
+        }
+        .chart-container {
+            margin: 20px 0;
+            text-align: center;
+        }
+        .footer {
+            text-align: center;
+            padding: 20px;
+            color: #666;
+            border-top: 1px solid #eee;
+            margin-top: 40px;
+        }
+"""
+
+# HTML报告模板（样式为静态内容，直接编入模板）
+_HTML_REPORT_SOURCE = """
+<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI爆款项目雷达 - {{ date }}</title>
+    <style>
+""" + _REPORT_CSS + """    </style>
+    <script src="{{ plotly_js_url }}"></script>
+</head>
+<body>
+    <div class="header">
+        <h1>🚀 AI爆款项目雷达</h1>
+        <p>发现最新最热的AI项目趋势 | {{ date }}</p>
+    </div>
+
+    <div class="stats">
+        <div class="stat-card">
+            <div class="stat-number">{{ total_projects }}</div>
+            <div>AI项目总数</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-number">{{ high_star_count }}</div>
+            <div>高星项目</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-number">{{ average_stars }}</div>
+            <div>平均星标数</div>
+        </div>
+    </div>
+
+    <div class="section">
+        <div class="section-header">📈 趋势分析</div>
+        <div class="section-content">
+            <div class="trend-analysis">
+                {% if hot_trends %}<h3>🔥 热门趋势</h3><ul>{% for trend in hot_trends %}<li>{{ trend }}</li>{% endfor %}</ul>{% endif %}\
+{% if emerging_tech %}<h3>🚀 新兴技术</h3><ul>{% for tech in emerging_tech %}<li>{{ tech }}</li>{% endfor %}</ul>{% endif %}
+                <div style="margin-top: 20px;">
+                    <h3>📊 详细分析</h3>
+                    <p>{{ analysis_text }}</p>
+                </div>
+            </div>
+        </div>
+    </div>
+
+    <div class="section">
+        <div class="section-header">📊 数据可视化</div>
+        <div class="section-content">
+            {{ charts_html }}
+        </div>
+    </div>
+
+    <div class="section">
+        <div class="section-header">🏆 热门AI项目</div>
+        <div class="section-content">
+            {% for project in projects %}
+            <div class="project-item">
+                <h3>#{{ loop.index }} <a href="{{ project.get('url', '#') }}" target="_blank">{{ project.get('name', 'Unknown') }}</a></h3>
+                <div class="project-meta">
+                    <span class="stars">⭐ {{ project.get('stars', 0) }}</span>
+                    <span class="language">💻 {{ project.get('language', '未知') }}</span>
+                    <span class="source">📊 {{ project.get('source', 'Unknown') }}</span>
+                </div>
+                <p class="description">{{ project.short_description }}</p>
+            </div>
+            {% endfor %}
+        </div>
+    </div>
+
+    <div class="footer">
+        <p>📅 报告生成时间: {{ generated_at }}</p>
+        <p>🤖 由AI爆款项目雷达自动生成</p>
+    </div>
+</body>
+</html>
+        """
+
+# Markdown报告模板
+_MARKDOWN_REPORT_SOURCE = """# 🚀 AI爆款项目雷达
+
+> 发现最新最热的AI项目趋势 | {{ date }}
+
+## 📊 今日概览
+
+- 🎯 **AI项目总数**: {{ total_projects }}
+- ⭐ **高星项目** (>100 stars): {{ high_star_count }}
+- 📈 **平均星标数**: {{ average_stars }}
+- 📅 **报告日期**: {{ date }}
+
+## 📈 趋势分析
+
+{% if hot_trends %}#### 🔥 热门趋势
+
+{% for trend in hot_trends %}- {{ trend }}
+{% endfor %}
+{% endif %}{% if emerging_tech %}#### 🚀 新兴技术
+
+{% for tech in emerging_tech %}- {{ tech }}
+{% endfor %}
+{% endif %}
+
+### 📊 详细分析
+
+{{ analysis_text }}
+
+## 💻 编程语言分布
+
+{% for lang, count in language_stats %}- {{ lang }}: {{ count }} 个项目
+{% endfor %}
+
+## 🔥 热门关键词
+
+{% for keyword, count in keyword_stats %}- {{ keyword }}: {{ count }} 次
+{% endfor %}
+
+## 🏆 热门AI项目
+
+{% for project in projects %}
+### {{ loop.index }}. [{{ project.get('name', 'Unknown') }}]({{ project.get('url', '#') }})
+
+- ⭐ **星标数**: {{ project.get('stars', 0) }}
+- 💻 **语言**: {{ project.get('language', '未知') }}
+- 📊 **来源**: {{ project.get('source', 'Unknown') }}
+- 📝 **描述**: {{ project.get('description', '') }}
+
+---
+{% endfor %}
+
+## 📝 说明
+
+- 数据来源：GitHub Trending、Product Hunt
+- 更新频率：每日自动更新
+- 筛选标准：AI相关性分析 + 热度排序
+- 生成时间：{{ generated_at }}
+
+---
+
+*🤖 本报告由AI爆款项目雷达自动生成*
+"""
+
+
+@lru_cache(maxsize=None)
+def _get_environment(autoescape: bool) -> Environment:
+    """获取模板环境（HTML开启自动转义，Markdown不转义）"""
+    return Environment(loader=BaseLoader(), autoescape=autoescape, keep_trailing_newline=True)
+
+
+@lru_cache(maxsize=None)
+def _get_template(source: str, autoescape: bool = True) -> Template:
+    """
+    编译模板，首次使用时编译并缓存
+    
+    Args:
+        source: 模板源码
+        autoescape: 是否自动转义
+    
+    Returns:
+        编译后的模板
+    """
+    return _get_environment(autoescape).from_string(source)
+
+
+# 图表文件中从第一个<div到最后一个</div>的内容（贪婪匹配，包含嵌套的div）
+_CHART_DIV_RE = re.compile(rb'<div.*</div>', re.DOTALL)
+
+
+def _read_chart_div(chart_path: str) -> str:
+    """
+    读取图表的嵌入内容，文件未变化时复用上次的结果
+    
+    优先使用同名的图表JSON，没有时从图表HTML中提取div
+    
+    Args:
+        chart_path: 图表文件路径
+    
+    Returns:
+        图表嵌入内容，文件不存在或没有div时返回空字符串
+    """
+    json_path = Path(chart_path).with_suffix('.json')
+    try:
+        stat = json_path.stat()
+    except OSError:
+        pass
+    else:
+        return _load_chart_json(str(json_path), stat.st_mtime_ns, stat.st_size)
+    
+    try:
+        stat = Path(chart_path).stat()
+    except OSError:
+        return ""
+    return _load_chart_div(str(chart_path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=64)
+def _load_chart_json(json_path: str, mtime_ns: int, size: int) -> str:
+    """
+    读取图表JSON并生成由报告页面中的plotly.js绘制的图表（按路径、修改时间与大小缓存）
+    
+    Args:
+        json_path: 图表JSON文件路径
+        mtime_ns: 文件修改时间，仅用于缓存键
+        size: 文件大小，仅用于缓存键
+    
+    Returns:
+        图表div与绘制脚本
+    """
+    with open(json_path, 'rb') as f:
+        figure_json = f.read()
+    
+    # JSON直接嵌入<script>，转义<、>、&防止标签提前闭合（这些字符在JSON中只会出现在字符串内）
+    figure_json = figure_json.replace(b'&', b'\\u0026').replace(b'<', b'\\u003c').replace(b'>', b'\\u003e').decode('utf-8')
+    chart_id = 'chart-' + re.sub(r'[^\w-]', '-', Path(json_path).stem)
+    
+    return (
+        f'<div id="{chart_id}" class="plotly-graph-div"></div>'
+        f'<script>(function (figure) {{ Plotly.newPlot("{chart_id}", figure.data, figure.layout, '
+        f'{{responsive: true}}); }})({figure_json});</script>'
+    )
+
+
+@lru_cache(maxsize=1)
+def _plotly_js_url() -> str:
+    """获取与已安装plotly版本一致的plotly.js CDN地址（图表JSON按该版本生成）"""
+    from plotly.offline import get_plotlyjs_version
+    return f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+
+@lru_cache(maxsize=64)
+def _load_chart_div(chart_path: str, mtime_ns: int, size: int) -> str:
+    """
+    读取并提取图表div（按路径、修改时间与大小缓存）
+    
+    Args:
+        chart_path: 图表文件路径
+        mtime_ns: 文件修改时间，仅用于缓存键
+        size: 文件大小，仅用于缓存键
+    
+    Returns:
+        图表div内容
+    """
+    with open(chart_path, 'rb') as f:
+        chart_content = f.read()
+    
+    # 提取从第一个<div到最后一个</div>的内容，只解码匹配部分
+    match = _CHART_DIV_RE.search(chart_content)
+    return match.group().decode('utf-8') if match else ""
+
+
+def _count_projects(projects: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    统计项目列表的语言、关键词、数据源与星标数
+    
+    先按列取出字段，再由Counter在C层计数，避免逐项目在Python循环中更新计数器
+    
+    Args:
+        projects: 项目列表
+    
+    Returns:
+        统计结果字典（Counter按首次出现顺序计数，与分别统计时一致）
+    """
+    languages = [p.get('language') for p in projects]
+    sources = [p.get('source', '') for p in projects]
+    # 关键词逐项目流式计数，不生成展开后的关键词列表，内存只与不同关键词数有关
+    keywords = (p.get('keywords', {}).get('keywords', []) for p in projects)
+    stars = np.fromiter((p.get('stars', 0) for p in projects), dtype=np.int64, count=len(projects))
+    
+    return {
+        'languages': Counter(filter(None, languages)),
+        'keywords': Counter(chain.from_iterable(keywords)),
+        'sources': Counter(sources),
+        'stars': stars,
+        'stars_sum': int(stars.sum()),
+        'high_star_count': int((stars > 100).sum())
+    }
+
+
+def _with_short_description(project: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    复制项目并附加截断后的描述（超过200字符时截断并加省略号）
+    
+    Args:
+        project: 项目信息
+    
+    Returns:
+        带short_description字段的项目副本
+    """
+    description = project.get('description') or ''
+    return {
+        **project,
+        'short_description': description if len(description) <= 200 else description[:200] + '...'
+    }
+
+
+def _top_project_indices(stars: np.ndarray, n: int) -> np.ndarray:
+    """
+    按星标数降序选出前n个项目的下标，星标数相同时保持原有顺序（与稳定排序一致）
+    
+    Args:
+        stars: 各项目星标数
+        n: 选取数量
+    
+    Returns:
+        项目下标数组
+    """
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    
+    if n < len(stars):
+        # 先部分排序找出第n大的星标数，再只对不低于该值的候选（含全部并列项）稳定排序
+        threshold = stars[np.argpartition(-stars, n - 1)[n - 1]]
+        candidates = np.flatnonzero(stars >= threshold)
+    else:
+        candidates = np.arange(len(stars))
+    
+    return candidates[np.argsort(-stars[candidates], kind='stable')][:n]
+
+
+def _merge_trend_analyses(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    合并各分片的趋势分析结果（汇总请求失败时的后备），趋势按出现的分片数排序，
+    分析文本取第一个分片的结果
+    
+    Args:
+        results: 各分片的趋势分析结果
+    
+    Returns:
+        合并后的趋势分析结果
+    """
+    if len(results) == 1:
+        return results[0]
+    
+    merged = {}
+    for field in ('hot_trends', 'emerging_tech', 'focus_areas'):
+        counter = Counter()
+        for result in results:
+            counter.update(dict.fromkeys(result.get(field, []), 1))
+        merged[field] = [item for item, count in counter.most_common()]
+    
+    merged['trend_analysis'] = next(
+        (result['trend_analysis'] for result in results if result.get('trend_analysis')), ''
+    )
+    merged['analysis_method'] = 'ai' if any(
+        result.get('analysis_method') == 'ai' for result in results
+    ) else 'text_fallback'
+    return merged
+
 
 class ReportGenerator:
     """报告生成器"""
     
+    # 最近一分钟的(时间, token数)记录，所有生成器实例共享同一个每分钟token预算
+    _token_usage: Deque[Tuple[float, int]] = deque()
+    _token_lock = threading.Lock()
+    
     def __init__(self, config: Dict[str, Any]):
         """
         初始化报告生成器
@@ -38,6 +535,21 @@ class ReportGenerator:
         report_config = config.get('visualization', {}).get('reports', {})
         self.max_projects = report_config.get('max_projects_per_report', 50)
         
+        # 趋势分析分片数（默认不分片；大于1时各分片并发分析，再请求一次汇总为整体分析）
+        self.trend_shards = max(1, report_config.get('trend_analysis_shards', 1))
+        
+        # API并发与速率限制；预计超出每分钟token预算（所有实例共享）时提前等待，避免触发429（0表示不限制）
+        self.max_concurrent_requests = max(1, api_config.get('max_concurrent', 4))
+        self.tokens_per_minute = api_config.get('tokens_per_minute', 0)
+        
+        # 并发信号量在事件循环内按需创建，避免绑定到创建实例时的其他事件循环
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
+        self._request_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # API响应缓存（按提示词哈希存储，有效期内相同提示词不重复请求；0表示不缓存）
+        self.cache_dir = Path(config.get('data', {}).get('paths', {}).get('cache', 'data/cache'))
+        self.cache_ttl_hours = config.get('visualization', {}).get('cache_ttl_hours', 24)
+        
         # 模板路径
         self.template_path = Path(__file__).parent / "templates"
         self.template_path.mkdir(exist_ok=True)
@@ -55,13 +567,10 @@ class ReportGenerator:
             提示词模板
         """
         try:
-            import yaml
-            
-            prompts_path = Path(__file__).parent.parent.parent / "config" / "prompts.yaml"
-            if prompts_path.exists():
-                with open(prompts_path, 'r', encoding='utf-8') as f:
-                    prompts = yaml.safe_load(f)
-                    return prompts.get('trend_analysis_prompt', self._get_default_trend_prompt())
+            # 提示词文件按修改时间缓存解析结果，多次创建生成器时不重复解析
+            prompts = load_prompts()
+            if prompts:
+                return prompts.get('trend_analysis_prompt', self._get_default_trend_prompt())
         except Exception as e:
             logger.warning(f"加载趋势分析提示词失败: {e}")
         
@@ -107,13 +616,14 @@ class ReportGenerator:
         logger.info(f"开始生成每日报告，共 {len(projects)} 个项目")
         
         # 生成报告数据
-        report_data = await self._prepare_report_data(projects)
-        
-        # 生成HTML报告
-        html_report = self._generate_html_report(report_data, charts)
+        report_data = await self._prepare_report_data(projects, datetime.now())
         
-        # 生成Markdown报告
-        markdown_report = self._generate_markdown_report(report_data)
+        # 在线程中生成HTML与Markdown报告，渲染与读取图表文件时不阻塞事件循环
+        loop = asyncio.get_running_loop()
+        html_report, markdown_report = await asyncio.gather(
+            loop.run_in_executor(None, self._generate_html_report, report_data, charts),
+            loop.run_in_executor(None, self._generate_markdown_report, report_data)
+        )
         
         logger.info("每日报告生成完成")
         
@@ -123,138 +633,310 @@ class ReportGenerator:
             'data': report_data
         }
     
-    async def _prepare_report_data(self, projects: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _prepare_report_data(self, projects: List[Dict[str, Any]],
+                                   now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         准备报告数据
         
         Args:
             projects: 项目列表
+            now: 报告生成时间，默认为当前时间（报告日期与各处显示的生成时间均取自该值）
         
         Returns:
             报告数据字典
         """
+        if now is None:
+            now = datetime.now()
+        
         # 基础统计
         total_projects = len(projects)
         
-        # 按星标数排序，取前N个
-        top_projects = sorted(projects, key=lambda x: x.get('stars', 0), reverse=True)[:self.max_projects]
-        
-        # 统计编程语言
-        languages = [p.get('language', '') for p in projects if p.get('language')]
-        language_stats = dict(Counter(languages).most_common(10))
+        # 统计编程语言、关键词、数据源与星标数，报告、摘要与后备分析共用这一次统计
+        counts = _count_projects(projects)
         
-        # 统计关键词
-        all_keywords = []
-        for project in projects:
-            keywords = project.get('keywords', {}).get('keywords', [])
-            all_keywords.extend(keywords)
-        keyword_stats = dict(Counter(all_keywords).most_common(20))
+        # 按星标数排序，取前N个；复制项目并预先截断描述，HTML与Markdown报告共用，不修改原项目
+        top_projects = [
+            _with_short_description(projects[i])
+            for i in _top_project_indices(counts['stars'], self.max_projects)
+        ]
         
-        # 统计数据源
-        sources = [p.get('source', '') for p in projects]
-        source_stats = dict(Counter(sources))
+        # 语言与关键词统计直接保留most_common的有序(名称, 次数)列表
+        language_stats = counts['languages'].most_common(10)
+        keyword_stats = counts['keywords'].most_common(20)
+        source_stats = dict(counts['sources'])
         
         # 生成趋势分析
-        trend_analysis = await self._generate_trend_analysis(projects)
+        trend_analysis = await self._generate_trend_analysis(projects, counts)
         
         return {
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'date': now.strftime('%Y-%m-%d'),
             'total_projects': total_projects,
             'top_projects': top_projects,
             'language_stats': language_stats,
             'keyword_stats': keyword_stats,
             'source_stats': source_stats,
             'trend_analysis': trend_analysis,
-            'generated_at': datetime.now().isoformat()
+            'generated_at': now.isoformat()
         }
     
-    async def _generate_trend_analysis(self, projects: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _generate_trend_analysis(self, projects: List[Dict[str, Any]],
+                                       counts: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         生成趋势分析
         
         Args:
             projects: 项目列表
+            counts: 项目统计结果，默认重新统计
         
         Returns:
             趋势分析结果
         """
+        if counts is None:
+            counts = _count_projects(projects)
+        
         if not self.client:
-            return self._generate_basic_trend_analysis(projects)
+            return self._generate_basic_trend_analysis(projects, counts)
         
         try:
-            # 准备项目概览数据
-            projects_summary = self._prepare_projects_summary(projects)
+            # 整体统计只生成一次，每个分片都附带整体统计和本分片的代表性项目
+            stats_summary = self._prepare_stats_summary(projects, counts)
+            
+            # 项目分片，各分片并发请求，总耗时约为单次请求延迟
+            shard_size = max(1, math.ceil(len(projects) / self.trend_shards))
+            shards = [projects[i:i + shard_size] for i in range(0, len(projects), shard_size)] or [projects]
+            
+            results = await asyncio.gather(
+                *[self._analyze_trend_shard(stats_summary, shard) for shard in shards],
+                return_exceptions=True
+            )
             
-            # 构建提示词
-            prompt = self.trend_prompt.format(projects_summary=projects_summary)
+            valid_results = []
+            for i, result in enumerate(results):
+                if isinstance(result, Exception):
+                    logger.error(f"趋势分析分片 {i} 失败: {result}")
+                else:
+                    valid_results.append(result)
+            
+            if not valid_results:
+                return self._generate_basic_trend_analysis(projects, counts)
+            
+            logger.debug(f"AI趋势分析生成完成，共 {len(shards)} 个分片")
+            if len(valid_results) == 1:
+                return valid_results[0]
+            return await self._reduce_trend_analyses(valid_results)
+            
+        except Exception as e:
+            logger.error(f"AI趋势分析生成失败: {e}")
+            return self._generate_basic_trend_analysis(projects, counts)
+    
+    async def _analyze_trend_shard(self, stats_summary: str,
+                                   projects: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        调用API分析一个分片的趋势
+        
+        Args:
+            stats_summary: 全部项目的统计概览
+            projects: 分片内的项目列表
+        
+        Returns:
+            趋势分析结果
+        """
+        # 准备项目概览数据
+        projects_summary = stats_summary + self._format_representative_projects(projects)
+        
+        # 构建提示词
+        prompt = self.trend_prompt.format(projects_summary=projects_summary)
+        
+        # 调用OpenAI API（命中缓存时跳过）
+        content = await self._cached_completion(prompt)
+        
+        # 解析响应
+        return self._parse_trend_analysis(content)
+    
+    async def _reduce_trend_analyses(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        请求一次汇总，将各分片的趋势分析合并为一份整体分析；失败时按规则合并
+        
+        Args:
+            results: 各分片的趋势分析结果
+        
+        Returns:
+            合并后的趋势分析结果
+        """
+        analyses = [{field: result.get(field) for field in _TREND_FIELDS} for result in results]
+        prompt = _TREND_REDUCE_PROMPT.format(
+            analyses=orjson.dumps(analyses).decode('utf-8')
+        )
+        
+        try:
+            reduced = self._parse_trend_analysis(await self._cached_completion(prompt))
+            if reduced['analysis_method'] == 'ai':
+                return reduced
+        except Exception as e:
+            logger.error(f"趋势分析汇总失败: {e}")
+        
+        return _merge_trend_analyses(results)
+    
+    async def _cached_completion(self, prompt: str) -> str:
+        """
+        请求趋势分析，相同模型与提示词在缓存有效期内直接返回缓存的响应
+        
+        Args:
+            prompt: 提示词
+        
+        Returns:
+            API响应内容
+        """
+        key = hashlib.blake2b(f"{self.model}\n{prompt}".encode('utf-8'), digest_size=16).hexdigest()
+        cache_path = self.cache_dir / f"trend_{key}.json"
+        
+        if self.cache_ttl_hours > 0:
+            try:
+                if time.time() - cache_path.stat().st_mtime < self.cache_ttl_hours * 3600:
+                    with open(cache_path, 'r', encoding='utf-8') as f:
+                        content = json.load(f)['content']
+                    logger.debug(f"趋势分析命中缓存: {cache_path.name}")
+                    return content
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"读取趋势分析缓存失败: {e}")
+        
+        async with self._get_request_semaphore():
+            # 按提示词长度（中文约每字1个token，偏保守）加最大输出长度预估本次消耗
+            await self._wait_for_token_budget(len(prompt) + _TREND_MAX_TOKENS)
             
-            # 调用OpenAI API
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "你是一个专业的AI技术趋势分析师。"},
+                    {"role": "system", "content": "你是一个专业的AI技术趋势分析师。只返回JSON对象，不要包含其他文本。"},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=1000,
-                temperature=0.3
+                max_tokens=_TREND_MAX_TOKENS,
+                temperature=0.3,
+                response_format={"type": "json_object"}
             )
+        content = response.choices[0].message.content
+        
+        if self.cache_ttl_hours > 0:
+            # 先写临时文件再原子替换，并发读取不会读到不完整的缓存
+            tmp_path = cache_path.with_suffix('.json.tmp')
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'content': content}, f, ensure_ascii=False)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logger.warning(f"写入趋势分析缓存失败: {e}")
+        
+        return content
+    
+    def _get_request_semaphore(self) -> asyncio.Semaphore:
+        """
+        获取当前事件循环中的请求并发信号量
+        
+        Returns:
+            信号量（在新的事件循环中首次使用时创建）
+        """
+        loop = asyncio.get_running_loop()
+        if self._request_semaphore is None or self._request_semaphore_loop is not loop:
+            self._request_semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._request_semaphore_loop = loop
+        return self._request_semaphore
+    
+    async def _wait_for_token_budget(self, tokens: int) -> None:
+        """
+        等待最近一分钟的token用量留出足够预算后登记本次用量
+        
+        Args:
+            tokens: 本次请求预估消耗的token数
+        """
+        if self.tokens_per_minute <= 0:
+            return
+        
+        usage = self._token_usage
+        while True:
+            # 检查与登记在同一次加锁内完成，多个实例或线程并发请求时不会同时占用同一份预算
+            with self._token_lock:
+                now = time.monotonic()
+                while usage and now - usage[0][0] >= 60:
+                    usage.popleft()
+                
+                # 单次请求超出预算时，等窗口清空后放行，避免永久等待
+                if not usage or sum(used for _, used in usage) + tokens <= self.tokens_per_minute:
+                    usage.append((now, tokens))
+                    return
+                
+                wait = 60 - (now - usage[0][0])
             
-            # 解析响应
-            content = response.choices[0].message.content
-            result = self._parse_trend_analysis(content)
-            
-            logger.debug("AI趋势分析生成完成")
-            return result
-            
-        except Exception as e:
-            logger.error(f"AI趋势分析生成失败: {e}")
-            return self._generate_basic_trend_analysis(projects)
+            logger.debug(f"趋势分析请求接近每分钟token上限，等待 {wait:.1f} 秒")
+            await asyncio.sleep(wait)
     
-    def _prepare_projects_summary(self, projects: List[Dict[str, Any]]) -> str:
+    def _prepare_projects_summary(self, projects: List[Dict[str, Any]],
+                                  counts: Optional[Dict[str, Any]] = None) -> str:
         """
         准备项目概览数据
         
         Args:
             projects: 项目列表
+            counts: 项目统计结果，默认重新统计
         
         Returns:
             项目概览字符串
         """
-        # 统计信息
+        return self._prepare_stats_summary(projects, counts) + self._format_representative_projects(projects)
+    
+    def _prepare_stats_summary(self, projects: List[Dict[str, Any]],
+                               counts: Optional[Dict[str, Any]] = None) -> str:
+        """
+        准备项目统计概览
+        
+        Args:
+            projects: 项目列表
+            counts: 项目统计结果，默认重新统计
+        
+        Returns:
+            统计概览字符串（以代表性项目标题结尾）
+        """
+        # 统计信息（复用报告数据的统计结果）
         total_count = len(projects)
+        if counts is None:
+            counts = _count_projects(projects)
         
         # 热门语言
-        languages = [p.get('language', '') for p in projects if p.get('language')]
-        top_languages = dict(Counter(languages).most_common(5))
+        top_languages = dict(counts['languages'].most_common(5))
         
         # 热门关键词
-        all_keywords = []
-        for project in projects:
-            keywords = project.get('keywords', {}).get('keywords', [])
-            all_keywords.extend(keywords)
-        top_keywords = dict(Counter(all_keywords).most_common(10))
-        
-        # 高星项目
-        high_star_projects = [p for p in projects if p.get('stars', 0) > 100]
+        top_keywords = dict(counts['keywords'].most_common(10))
         
-        summary = f"""
+        # 统计数据以紧凑JSON嵌入提示词，减少token消耗
+        return f"""
 总项目数: {total_count}
-高星项目数 (>100 stars): {len(high_star_projects)}
+高星项目数 (>100 stars): {counts['high_star_count']}
 
 热门编程语言:
-{json.dumps(top_languages, ensure_ascii=False, indent=2)}
+{orjson.dumps(top_languages).decode('utf-8')}
 
 热门技术关键词:
-{json.dumps(top_keywords, ensure_ascii=False, indent=2)}
+{orjson.dumps(top_keywords).decode('utf-8')}
 
 代表性项目:
 """
+    
+    def _format_representative_projects(self, projects: List[Dict[str, Any]]) -> str:
+        """
+        格式化代表性项目列表
         
-        # 添加代表性项目
-        for i, project in enumerate(projects[:5]):
-            summary += f"{i+1}. {project.get('name', 'Unknown')} - {project.get('description', '')[:100]}...\n"
+        Args:
+            projects: 项目列表
         
-        return summary
+        Returns:
+            前5个项目的名称与描述
+        """
+        return "".join(
+            f"{i+1}. {project.get('name', 'Unknown')} - {(project.get('description') or '')[:100]}...\n"
+            for i, project in enumerate(islice(projects, 5))
+        )
     
     def _parse_trend_analysis(self, content: str) -> Dict[str, Any]:
         """
@@ -267,13 +949,9 @@ class ReportGenerator:
             解析后的结果
         """
         try:
-            # 尝试解析JSON
-            if '{' in content and '}' in content:
-                json_start = content.find('{')
-                json_end = content.rfind('}') + 1
-                json_str = content[json_start:json_end]
-                result = json.loads(json_str)
-                
+            # 请求时要求模型返回JSON对象，直接解析即可
+            result = json.loads(content)
+            if isinstance(result, dict):
                 return {
                     'hot_trends': result.get('hot_trends', []),
                     'emerging_tech': result.get('emerging_tech', []),
@@ -281,7 +959,7 @@ class ReportGenerator:
                     'trend_analysis': result.get('trend_analysis', ''),
                     'analysis_method': 'ai'
                 }
-        except (json.JSONDecodeError, ValueError) as e:
+        except (json.JSONDecodeError, TypeError) as e:
             logger.warning(f"解析趋势分析结果失败: {e}")
         
         # 如果解析失败，使用原始内容
@@ -293,29 +971,26 @@ class ReportGenerator:
             'analysis_method': 'text_fallback'
         }
     
-    def _generate_basic_trend_analysis(self, projects: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _generate_basic_trend_analysis(self, projects: List[Dict[str, Any]],
+                                       counts: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         生成基础趋势分析（后备方案）
         
         Args:
             projects: 项目列表
+            counts: 项目统计结果，默认重新统计
         
         Returns:
             基础趋势分析结果
         """
-        # 统计热门技术
-        all_keywords = []
-        for project in projects:
-            keywords = project.get('keywords', {}).get('keywords', [])
-            all_keywords.extend(keywords)
+        if counts is None:
+            counts = _count_projects(projects)
         
-        keyword_counts = Counter(all_keywords)
-        hot_trends = [kw for kw, count in keyword_counts.most_common(5)]
+        # 统计热门技术
+        hot_trends = [kw for kw, count in counts['keywords'].most_common(5)]
         
         # 统计编程语言
-        languages = [p.get('language', '') for p in projects if p.get('language')]
-        language_counts = Counter(languages)
-        focus_areas = [lang for lang, count in language_counts.most_common(3)]
+        focus_areas = [lang for lang, count in counts['languages'].most_common(3)]
         
         # 生成基础分析文本
         analysis_text = f"""
@@ -329,8 +1004,8 @@ class ReportGenerator:
 
 📊 项目分布：
 - 总项目数：{len(projects)}
-- 高星项目（>100 stars）：{len([p for p in projects if p.get('stars', 0) > 100])}
-- 平均星标数：{sum(p.get('stars', 0) for p in projects) // len(projects) if projects else 0}
+- 高星项目（>100 stars）：{counts['high_star_count']}
+- 平均星标数：{counts['stars_sum'] // len(projects) if projects else 0}
 
 这些数据反映了当前AI技术发展的热点方向和开发者关注的重点领域。
 """
@@ -354,340 +1029,75 @@ class ReportGenerator:
         Returns:
             HTML报告内容
         """
-        date = report_data['date']
-        total_projects = report_data['total_projects']
-        top_projects = report_data['top_projects']
-        trend_analysis = report_data['trend_analysis']
-
-        # 生成项目列表HTML
-        projects_html = ""
-        for i, project in enumerate(top_projects[:20], 1):
-            stars = project.get('stars', 0)
-            language = project.get('language', '未知')
-            description = project.get('description', '')[:200] + '...' if len(project.get('description', '')) > 200 else project.get('description', '')
-            url = project.get('url', '#')
+        # 图表为本地生成的可信内容，不转义
+        return _get_template(_HTML_REPORT_SOURCE).render(
+            charts_html=Markup(self._extract_chart_divs(charts)),
+            plotly_js_url=_plotly_js_url(),
+            **self._template_context(report_data)
+        )
 
-            projects_html += f"""
-            <div class="project-item">
-                <h3>#{i} <a href="{url}" target="_blank">{project.get('name', 'Unknown')}</a></h3>
-                <div class="project-meta">
-                    <span class="stars">⭐ {stars}</span>
-                    <span class="language">💻 {language}</span>
-                    <span class="source">📊 {project.get('source', 'Unknown')}</span>
-                </div>
-                <p class="description">{description}</p>
-            </div>
-            """
-
-        # 生成趋势分析HTML
-        trends_html = ""
-        if trend_analysis.get('hot_trends'):
-            trends_html += "<h3>🔥 热门趋势</h3><ul>"
-            for trend in trend_analysis['hot_trends'][:5]:
-                trends_html += f"<li>{trend}</li>"
-            trends_html += "</ul>"
-
-        if trend_analysis.get('emerging_tech'):
-            trends_html += "<h3>🚀 新兴技术</h3><ul>"
-            for tech in trend_analysis['emerging_tech'][:5]:
-                trends_html += f"<li>{tech}</li>"
-            trends_html += "</ul>"
-
-        # 生成图表嵌入HTML
-        charts_html = ""
-        for chart_name, chart_path in charts.items():
-            if Path(chart_path).exists():
-                with open(chart_path, 'r', encoding='utf-8') as f:
-                    chart_content = f.read()
-                    # 提取图表的div内容
-                    if '<div' in chart_content and '</div>' in chart_content:
-                        start = chart_content.find('<div')
-                        end = chart_content.rfind('</div>') + 6
-                        chart_div = chart_content[start:end]
-                        charts_html += f'<div class="chart-container">{chart_div}</div>'
-
-        # HTML模板
-        html_template = f"""
-<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI爆款项目雷达 - {date}</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f8f9fa;
-        }}
-        .header {{
-            text-align: center;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 40px 20px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 2.5em;
-        }}
-        .header p {{
-            margin: 10px 0 0 0;
-            opacity: 0.9;
-        }}
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        .stat-card {{
-            background: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            text-align: center;
-        }}
-        .stat-number {{
-            font-size: 2em;
-            font-weight: bold;
-            color: #667eea;
-        }}
-        .section {{
-            background: white;
-            margin-bottom: 30px;
-            border-radius: 8px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }}
-        .section-header {{
-            background: #667eea;
-            color: white;
-            padding: 20px;
-            font-size: 1.3em;
-            font-weight: bold;
-        }}
-        .section-content {{
-            padding: 20px;
-        }}
-        .project-item {{
-            border-bottom: 1px solid #eee;
-            padding: 20px 0;
-        }}
-        .project-item:last-child {{
-            border-bottom: none;
-        }}
-        .project-item h3 {{
-            margin: 0 0 10px 0;
-            color: #333;
-        }}
-        .project-item h3 a {{
-            color: #667eea;
-            text-decoration: none;
-        }}
-        .project-item h3 a:hover {{
-            text-decoration: underline;
-        }}
-        .project-meta {{
-            margin-bottom: 10px;
-        }}
-        .project-meta span {{
-            display: inline-block;
-            margin-right: 15px;
-            padding: 4px 8px;
-            background: #f1f3f4;
-            border-radius: 4px;
-            font-size: 0.9em;
-        }}
-        .description {{
-            color: #666;
-            margin: 0;
-        }}
-        .trend-analysis {{
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 8px;
-            margin: 20px 0;
-        }}
-        .chart-container {{
-            margin: 20px 0;
-            text-align: center;
-        }}
-        .footer {{
-            text-align: center;
-            padding: 20px;
-            color: #666;
-            border-top: 1px solid #eee;
-            margin-top: 40px;
-        }}
-    </style>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-</head>
-<body>
-    <div class="header">
-        <h1>🚀 AI爆款项目雷达</h1>
-        <p>发现最新最热的AI项目趋势 | {date}</p>
-    </div>
-
-    <div class="stats">
-        <div class="stat-card">
-            <div class="stat-number">{total_projects}</div>
-            <div>AI项目总数</div>
-        </div>
-        <div class="stat-card">
-            <div class="stat-number">{len([p for p in top_projects if p.get('stars', 0) > 100])}</div>
-            <div>高星项目</div>
-        </div>
-        <div class="stat-card">
-            <div class="stat-number">{sum(p.get('stars', 0) for p in top_projects) // len(top_projects) if top_projects else 0}</div>
-            <div>平均星标数</div>
-        </div>
-    </div>
-
-    <div class="section">
-        <div class="section-header">📈 趋势分析</div>
-        <div class="section-content">
-            <div class="trend-analysis">
-                {trends_html}
-                <div style="margin-top: 20px;">
-                    <h3>📊 详细分析</h3>
-                    <p>{trend_analysis.get('trend_analysis', '暂无详细分析')}</p>
-                </div>
-            </div>
-        </div>
-    </div>
-
-    <div class="section">
-        <div class="section-header">📊 数据可视化</div>
-        <div class="section-content">
-            {charts_html}
-        </div>
-    </div>
+    def _extract_chart_divs(self, charts: Dict[str, str]) -> str:
+        """
+        从图表文件中提取图表div，用于嵌入报告
 
-    <div class="section">
-        <div class="section-header">🏆 热门AI项目</div>
-        <div class="section-content">
-            {projects_html}
-        </div>
-    </div>
+        Args:
+            charts: 图表文件路径字典
 
-    <div class="footer">
-        <p>📅 报告生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        <p>🤖 由AI爆款项目雷达自动生成</p>
-    </div>
-</body>
-</html>
+        Returns:
+            图表HTML片段
         """
+        if not charts:
+            return ""
+        
+        # 多个图表文件并行读取，保持原有顺序
+        with ThreadPoolExecutor(max_workers=min(len(charts), 8)) as executor:
+            chart_divs = executor.map(_read_chart_div, charts.values())
+        
+        return "".join(
+            f'<div class="chart-container">{chart_div}</div>' for chart_div in chart_divs if chart_div
+        )
 
-        return html_template
-
-    def _generate_markdown_report(self, report_data: Dict[str, Any]) -> str:
+    def _template_context(self, report_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        生成Markdown报告
+        准备HTML与Markdown报告共用的模板变量
 
         Args:
             report_data: 报告数据
 
         Returns:
-            Markdown报告内容
+            模板变量字典
         """
-        date = report_data['date']
-        total_projects = report_data['total_projects']
         top_projects = report_data['top_projects']
         trend_analysis = report_data['trend_analysis']
-        language_stats = report_data['language_stats']
-        keyword_stats = report_data['keyword_stats']
-
-        # 生成项目列表
-        projects_md = ""
-        for i, project in enumerate(top_projects[:20], 1):
-            name = project.get('name', 'Unknown')
-            url = project.get('url', '#')
-            stars = project.get('stars', 0)
-            language = project.get('language', '未知')
-            description = project.get('description', '')
-
-            projects_md += f"""
-### {i}. [{name}]({url})
-
-- ⭐ **星标数**: {stars}
-- 💻 **语言**: {language}
-- 📊 **来源**: {project.get('source', 'Unknown')}
-- 📝 **描述**: {description}
-
----
-"""
-
-        # 生成趋势分析
-        trends_md = ""
-        if trend_analysis.get('hot_trends'):
-            trends_md += "#### 🔥 热门趋势\n\n"
-            for trend in trend_analysis['hot_trends'][:5]:
-                trends_md += f"- {trend}\n"
-            trends_md += "\n"
-
-        if trend_analysis.get('emerging_tech'):
-            trends_md += "#### 🚀 新兴技术\n\n"
-            for tech in trend_analysis['emerging_tech'][:5]:
-                trends_md += f"- {tech}\n"
-            trends_md += "\n"
 
-        # 生成统计信息
-        lang_stats_md = ""
-        for lang, count in list(language_stats.items())[:5]:
-            lang_stats_md += f"- {lang}: {count} 个项目\n"
-
-        keyword_stats_md = ""
-        for keyword, count in list(keyword_stats.items())[:10]:
-            keyword_stats_md += f"- {keyword}: {count} 次\n"
-
-        # Markdown模板
-        markdown_template = f"""# 🚀 AI爆款项目雷达
-
-> 发现最新最热的AI项目趋势 | {date}
-
-## 📊 今日概览
-
-- 🎯 **AI项目总数**: {total_projects}
-- ⭐ **高星项目** (>100 stars): {len([p for p in top_projects if p.get('stars', 0) > 100])}
-- 📈 **平均星标数**: {sum(p.get('stars', 0) for p in top_projects) // len(top_projects) if top_projects else 0}
-- 📅 **报告日期**: {date}
-
-## 📈 趋势分析
+        # 与报告数据使用同一生成时间
+        generated_at = report_data.get('generated_at')
+        generated_at = datetime.fromisoformat(generated_at) if generated_at else datetime.now()
 
-{trends_md}
-
-### 📊 详细分析
-
-{trend_analysis.get('trend_analysis', '暂无详细分析')}
-
-## 💻 编程语言分布
-
-{lang_stats_md}
-
-## 🔥 热门关键词
-
-{keyword_stats_md}
-
-## 🏆 热门AI项目
-
-{projects_md}
-
-## 📝 说明
-
-- 数据来源：GitHub Trending、Product Hunt
-- 更新频率：每日自动更新
-- 筛选标准：AI相关性分析 + 热度排序
-- 生成时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        return {
+            'date': report_data['date'],
+            'total_projects': report_data['total_projects'],
+            'high_star_count': sum(1 for p in top_projects if p.get('stars', 0) > 100),
+            'average_stars': sum(p.get('stars', 0) for p in top_projects) // len(top_projects) if top_projects else 0,
+            'projects': top_projects[:20],
+            'hot_trends': (trend_analysis.get('hot_trends') or [])[:5],
+            'emerging_tech': (trend_analysis.get('emerging_tech') or [])[:5],
+            'analysis_text': trend_analysis.get('trend_analysis', '暂无详细分析'),
+            'language_stats': report_data.get('language_stats', [])[:5],
+            'keyword_stats': report_data.get('keyword_stats', [])[:10],
+            'generated_at': generated_at.strftime('%Y-%m-%d %H:%M:%S')
+        }
 
----
+    def _generate_markdown_report(self, report_data: Dict[str, Any]) -> str:
+        """
+        生成Markdown报告
 
-*🤖 本报告由AI爆款项目雷达自动生成*
-"""
+        Args:
+            report_data: 报告数据
 
-        return markdown_template
+        Returns:
+            Markdown报告内容
+        """
+        return _get_template(_MARKDOWN_REPORT_SOURCE, autoescape=False).render(
+            **self._template_context(report_data)
+        )
@@ -2,20 +2,35 @@
 测试配置文件
 """
 
+import copy
+import json
 import pytest
 import sys
 from pathlib import Path
-import tempfile
-import shutil
-from unittest.mock import Mock
+from types import SimpleNamespace
 
 # 添加src目录到Python路径
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from ai_analysis.classifier import AIProjectClassifier
+from ai_analysis.keyword_extractor import KeywordExtractor
+from ai_analysis.summarizer import ProjectSummarizer
 
-@pytest.fixture
-def test_config():
-    """测试配置"""
+# 模拟的OpenAI API响应内容
+MOCK_OPENAI_CONTENT = '''
+    {
+        "is_ai_related": true,
+        "confidence_score": 0.9,
+        "reasoning": "This project uses machine learning and AI technologies",
+        "ai_categories": ["Machine Learning", "Artificial Intelligence"],
+        "tech_stack": ["Python", "TensorFlow", "PyTorch"]
+    }
+    '''
+
+
+@pytest.fixture(scope="session")
+def base_config():
+    """测试配置模板，整个测试会话只构建一次，测试中不要直接修改"""
     return {
         'api': {
             'openai': {
@@ -60,7 +75,8 @@ def test_config():
                 'raw_data': 'test_data/raw',
                 'processed_data': 'test_data/processed',
                 'archive_data': 'test_data/archive',
-                'output': 'test_output'
+                'output': 'test_output',
+                'cache': 'test_data/cache'
             },
             'retention_days': 7,
             'deduplication': {
@@ -91,11 +107,62 @@ def test_config():
 
 
 @pytest.fixture
-def temp_dir():
-    """临时目录"""
-    temp_path = tempfile.mkdtemp()
-    yield Path(temp_path)
-    shutil.rmtree(temp_path)
+def test_config(base_config, tmp_path):
+    """测试配置：深拷贝配置模板，并将数据与日志路径指向本测试的临时目录"""
+    config = copy.deepcopy(base_config)
+    
+    # 各组件在初始化时自行创建所需目录，这里只改写路径
+    paths = config['data']['paths']
+    for key, path in paths.items():
+        paths[key] = str(tmp_path / path)
+    
+    config['logging']['file_path'] = str(tmp_path / "test_logs" / "app.log")
+    return config
+
+
+@pytest.fixture
+def temp_dir(tmp_path):
+    """临时目录（与test_config中的路径位于同一目录下）"""
+    return tmp_path
+
+
+class FakeAIProjectClassifier(AIProjectClassifier):
+    """直接使用关键词分类的分类器，跳过API客户端分支"""
+    
+    async def classify(self, project):
+        return self._classify_by_keywords(project)
+
+
+class FakeKeywordExtractor(KeywordExtractor):
+    """直接使用规则提取的关键词提取器，跳过API客户端分支"""
+    
+    async def extract(self, project):
+        return self._extract_by_rules(project)
+
+
+class FakeProjectSummarizer(ProjectSummarizer):
+    """直接生成基础总结的项目总结器，跳过API客户端分支"""
+    
+    async def summarize(self, project):
+        return self._generate_basic_summary(project)
+
+
+@pytest.fixture
+def fake_classifier(test_config):
+    """关键词分类器"""
+    return FakeAIProjectClassifier(test_config)
+
+
+@pytest.fixture
+def fake_keyword_extractor(test_config):
+    """规则关键词提取器"""
+    return FakeKeywordExtractor(test_config)
+
+
+@pytest.fixture
+def fake_summarizer(test_config):
+    """基础项目总结器"""
+    return FakeProjectSummarizer(test_config)
 
 
 @pytest.fixture
@@ -144,21 +211,16 @@ def sample_projects():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_openai_response():
-    """模拟OpenAI API响应"""
-    mock_response = Mock()
-    mock_response.choices = [Mock()]
-    mock_response.choices[0].message.content = '''
-    {
-        "is_ai_related": true,
-        "confidence_score": 0.9,
-        "reasoning": "This project uses machine learning and AI technologies",
-        "ai_categories": ["Machine Learning", "Artificial Intelligence"],
-        "tech_stack": ["Python", "TensorFlow", "PyTorch"]
-    }
-    '''
-    return mock_response
+    """模拟OpenAI API响应（只读，仅提供choices[0].message.content）"""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=MOCK_OPENAI_CONTENT))])
+
+
+@pytest.fixture(scope="session")
+def mock_openai_parsed():
+    """模拟OpenAI API响应内容解析后的结果"""
+    return json.loads(MOCK_OPENAI_CONTENT)
 
 
 @pytest.fixture
@@ -178,24 +240,3 @@ def mock_html_content():
     </body>
     </html>
     '''
-
-
-@pytest.fixture(autouse=True)
-def setup_test_environment(temp_dir, test_config):
-    """设置测试环境"""
-    # 创建测试目录
-    for path in test_config['data']['paths'].values():
-        (temp_dir / path).mkdir(parents=True, exist_ok=True)
-    
-    # 创建日志目录
-    (temp_dir / "test_logs").mkdir(exist_ok=True)
-    
-    # 更新配置中的路径为临时目录
-    for key, path in test_config['data']['paths'].items():
-        test_config['data']['paths'][key] = str(temp_dir / path)
-    
-    test_config['logging']['file_path'] = str(temp_dir / "test_logs" / "app.log")
-    
-    yield
-    
-    # 清理工作在temp_dir fixture中完成
@@ -2,6 +2,7 @@
 完整流水线集成测试
 """
 
+import copy
 import pytest
 import asyncio
 from pathlib import Path
@@ -24,8 +25,8 @@ class TestFullPipeline:
     @pytest.fixture
     def pipeline_config(self, test_config, temp_dir):
         """流水线测试配置"""
-        # 确保所有路径都指向临时目录
-        config = test_config.copy()
+        # 确保所有路径都指向临时目录，深拷贝避免修改test_config
+        config = copy.deepcopy(test_config)
         config['data']['paths'] = {
             'raw_data': str(temp_dir / 'raw'),
             'processed_data': str(temp_dir / 'processed'),
@@ -178,7 +179,8 @@ class TestFullPipeline:
         assert '## 📊 今日概览' in md_content
     
     @pytest.mark.asyncio
-    async def test_end_to_end_pipeline(self, pipeline_config, sample_projects):
+    async def test_end_to_end_pipeline(self, pipeline_config, sample_projects, fake_classifier,
+                                       fake_keyword_extractor, fake_summarizer):
         """测试端到端流水线"""
         # 模拟完整的每日更新流程
         
@@ -186,22 +188,18 @@ class TestFullPipeline:
         cleaner = DataCleaner(pipeline_config)
         cleaned_data = cleaner.clean_and_deduplicate(sample_projects)
         
-        # 2. AI分析（使用关键词分析）
+        # 2. AI分析（使用关键词分析，真实分析器由test_ai_analysis_pipeline覆盖）
         pipeline_config['api']['openai']['api_key'] = '${OPENAI_API_KEY}'
         
-        classifier = AIProjectClassifier(pipeline_config)
-        extractor = KeywordExtractor(pipeline_config)
-        summarizer = ProjectSummarizer(pipeline_config)
-        
         ai_projects = []
         for project in cleaned_data:
             # AI分类
-            classification = await classifier.classify(project)
+            classification = await fake_classifier.classify(project)
             if classification['is_ai_related']:
                 # 关键词提取
-                keywords = await extractor.extract(project)
+                keywords = await fake_keyword_extractor.extract(project)
                 # 项目总结
-                summary = await summarizer.summarize(project)
+                summary = await fake_summarizer.summarize(project)
                 
                 project.update({
                     'ai_classification': classification,
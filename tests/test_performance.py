@@ -2,37 +2,52 @@
 性能测试
 """
 
+import copy
 import pytest
 import time
 import asyncio
+from functools import lru_cache
 from unittest.mock import patch
 from utils.data_cleaner import DataCleaner
 from ai_analysis.classifier import AIProjectClassifier
 
 
+def generate_large_dataset(size=1000):
+    """生成大型测试数据集"""
+    projects = []
+    for i in range(size):
+        projects.append({
+            'name': f'project-{i}',
+            'description': f'This is test project {i} for artificial intelligence and machine learning',
+            'url': f'https://github.com/user/project-{i}',
+            'stars': i * 10,
+            'forks': i * 2,
+            'language': 'Python' if i % 2 == 0 else 'JavaScript',
+            'author': f'user-{i}',
+            'tags': ['ai', 'ml', 'test'],
+            'source': 'github',
+            'created_at': '2023-01-01T00:00:00Z',
+            'updated_at': '2023-12-01T00:00:00Z'
+        })
+    return projects
+
+
+@pytest.fixture(scope="session")
+def dataset_factory():
+    """按大小缓存的测试数据集工厂，各测试共享只读数据，需要修改时传入mutable=True获取副本"""
+    cached_dataset = lru_cache(maxsize=None)(generate_large_dataset)
+    
+    def factory(size=1000, mutable=False):
+        projects = cached_dataset(size)
+        return copy.deepcopy(projects) if mutable else projects
+    
+    return factory
+
+
 class TestPerformance:
     """性能测试类"""
     
-    def generate_large_dataset(self, size=1000):
-        """生成大型测试数据集"""
-        projects = []
-        for i in range(size):
-            projects.append({
-                'name': f'project-{i}',
-                'description': f'This is test project {i} for artificial intelligence and machine learning',
-                'url': f'https://github.com/user/project-{i}',
-                'stars': i * 10,
-                'forks': i * 2,
-                'language': 'Python' if i % 2 == 0 else 'JavaScript',
-                'author': f'user-{i}',
-                'tags': ['ai', 'ml', 'test'],
-                'source': 'github',
-                'created_at': '2023-01-01T00:00:00Z',
-                'updated_at': '2023-12-01T00:00:00Z'
-            })
-        return projects
-    
-    def test_data_cleaning_performance(self, test_config):
+    def test_data_cleaning_performance(self, test_config, dataset_factory):
         """测试数据清洗性能"""
         cleaner = DataCleaner(test_config)
         
@@ -40,7 +55,7 @@ class TestPerformance:
         sizes = [100, 500, 1000]
         
         for size in sizes:
-            projects = self.generate_large_dataset(size)
+            projects = dataset_factory(size)
             
             start_time = time.time()
             cleaned = cleaner.clean_and_deduplicate(projects)
@@ -58,17 +73,16 @@ class TestPerformance:
             assert all('cleaned_at' in project for project in cleaned)
     
     @pytest.mark.asyncio
-    async def test_ai_classification_performance(self, test_config):
+    async def test_ai_classification_performance(self, dataset_factory, fake_classifier):
         """测试AI分类性能"""
         # 使用关键词分类（不需要API调用）
-        test_config['api']['openai']['api_key'] = '${OPENAI_API_KEY}'
-        classifier = AIProjectClassifier(test_config)
+        classifier = fake_classifier
         
         # 测试批量分类性能
         sizes = [50, 100, 200]
         
         for size in sizes:
-            projects = self.generate_large_dataset(size)
+            projects = dataset_factory(size)
             
             start_time = time.time()
             results = await classifier.batch_classify(projects)
@@ -85,7 +99,7 @@ class TestPerformance:
             assert len(results) == size
             assert all('is_ai_related' in result for result in results)
     
-    def test_memory_usage(self, test_config):
+    def test_memory_usage(self, test_config, dataset_factory):
         """测试内存使用"""
         import psutil
         import os
@@ -95,7 +109,7 @@ class TestPerformance:
         
         # 处理大量数据
         cleaner = DataCleaner(test_config)
-        large_dataset = self.generate_large_dataset(5000)
+        large_dataset = dataset_factory(5000)
         
         cleaned = cleaner.clean_and_deduplicate(large_dataset)
         
@@ -115,7 +129,7 @@ class TestPerformance:
         import gc
         gc.collect()
     
-    def test_concurrent_processing(self, test_config):
+    def test_concurrent_processing(self, test_config, dataset_factory):
         """测试并发处理性能"""
         import concurrent.futures
         import threading
@@ -124,7 +138,7 @@ class TestPerformance:
         
         def process_batch(batch_id):
             """处理一批数据"""
-            projects = self.generate_large_dataset(100)
+            projects = dataset_factory(100)
             return cleaner.clean_and_deduplicate(projects)
         
         # 测试并发处理
@@ -148,12 +162,12 @@ class TestPerformance:
         assert processing_time < 10  # 应该在10秒内完成
     
     @pytest.mark.asyncio
-    async def test_async_performance(self, test_config):
+    async def test_async_performance(self, test_config, dataset_factory):
         """测试异步处理性能"""
         test_config['api']['openai']['api_key'] = '${OPENAI_API_KEY}'
         classifier = AIProjectClassifier(test_config)
         
-        projects = self.generate_large_dataset(100)
+        projects = dataset_factory(100)
         
         # 测试串行处理
         start_time = time.time()
@@ -177,14 +191,14 @@ class TestPerformance:
         # 验证结果一致性
         assert len(serial_results) == len(concurrent_results)
     
-    def test_large_file_processing(self, test_config, temp_dir):
+    def test_large_file_processing(self, test_config, temp_dir, dataset_factory):
         """测试大文件处理性能"""
         from utils.storage import DataStorage
         
         storage = DataStorage(test_config)
         
         # 生成大量数据
-        large_dataset = self.generate_large_dataset(2000)
+        large_dataset = dataset_factory(2000)
         
         # 测试保存性能
         start_time = time.time()
@@ -207,14 +221,14 @@ class TestPerformance:
         # 验证数据完整性
         assert len(loaded_data) == len(large_dataset)
     
-    def test_chart_generation_performance(self, test_config):
+    def test_chart_generation_performance(self, test_config, dataset_factory):
         """测试图表生成性能"""
         from visualization.chart_generator import ChartGenerator
         
         chart_generator = ChartGenerator(test_config)
         
         # 生成测试数据
-        projects = self.generate_large_dataset(500)
+        projects = dataset_factory(500, mutable=True)
         
         # 添加必要的分析结果
         for project in projects:
@@ -238,7 +252,7 @@ class TestPerformance:
         assert isinstance(charts, dict)
         assert len(charts) > 0
     
-    def test_report_generation_performance(self, test_config):
+    def test_report_generation_performance(self, test_config, dataset_factory):
         """测试报告生成性能"""
         from visualization.report_generator import ReportGenerator
         
@@ -246,7 +260,7 @@ class TestPerformance:
         report_generator = ReportGenerator(test_config)
         
         # 生成测试数据
-        projects = self.generate_large_dataset(200)
+        projects = dataset_factory(200, mutable=True)
         
         # 添加必要的分析结果
         for project in projects:
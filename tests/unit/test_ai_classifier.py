@@ -108,7 +108,8 @@ class TestAIProjectClassifier:
     
     @pytest.mark.asyncio
     @patch('ai_analysis.classifier.AsyncOpenAI')
-    async def test_classify_with_api_success(self, mock_openai, test_config, mock_openai_response):
+    async def test_classify_with_api_success(self, mock_openai, test_config, mock_openai_response,
+                                             mock_openai_parsed):
         """测试API调用成功的分类"""
         # 设置mock
         mock_client = AsyncMock()
@@ -129,6 +130,7 @@ class TestAIProjectClassifier:
         
         assert result['is_ai_related'] is True
         assert result['confidence_score'] == 0.9
+        assert result['ai_categories'] == mock_openai_parsed['ai_categories']
         assert mock_client.chat.completions.create.called
     
     @pytest.mark.asyncio
@@ -0,0 +1,70 @@
+"""
+图表生成器测试
+"""
+
+import json
+import pandas as pd
+from pathlib import Path
+from visualization.chart_generator import ChartGenerator
+
+
+class TestChartGenerator:
+    """图表生成器测试类"""
+
+    def test_generate_daily_charts(self, test_config, sample_projects):
+        """测试生成全部每日图表"""
+        generator = ChartGenerator(test_config)
+
+        charts = generator.generate_daily_charts(sample_projects)
+
+        assert set(charts) == {
+            'language_distribution', 'stars_distribution', 'keyword_cloud',
+            'ai_categories', 'source_distribution', 'dashboard'
+        }
+        assert all(Path(path).exists() for path in charts.values())
+
+    def test_charts_reference_plotlyjs_cdn(self, test_config, sample_projects):
+        """测试图表通过CDN引用plotly.js而不内联"""
+        generator = ChartGenerator(test_config)
+
+        html = Path(generator.create_dashboard(sample_projects)).read_text(encoding='utf-8')
+
+        assert 'cdn.plot.ly' in html
+        assert len(html) < 100_000
+
+    def test_charts_saved_with_json(self, test_config, sample_projects):
+        """测试图表同时保存为JSON，供报告直接嵌入"""
+        generator = ChartGenerator(test_config)
+
+        path = Path(generator.create_language_distribution_chart(sample_projects))
+        figure = json.loads(path.with_suffix('.json').read_text(encoding='utf-8'))
+
+        assert figure['data'][0]['type'] == 'pie'
+        assert 'layout' in figure
+
+    def test_generate_charts_with_missing_fields(self, test_config):
+        """测试项目缺少字段或列表为空时仍能生成图表"""
+        generator = ChartGenerator(test_config)
+
+        assert len(generator.generate_daily_charts([{'name': 'bare-project'}])) == 6
+        assert len(generator.generate_daily_charts([])) == 6
+
+    def test_language_counts(self, test_config, sample_projects):
+        """测试编程语言统计忽略空值，并列时保持首次出现顺序"""
+        generator = ChartGenerator(test_config)
+        sample_projects.append({'name': 'no-language', 'language': ''})
+        sample_projects.append({'name': 'go-project', 'language': 'Go'})
+
+        counts = generator._language_counts(pd.DataFrame(sample_projects), 2)
+
+        assert counts.to_dict() == {'Python': 2, 'JavaScript': 1}
+
+    def test_histogram_bar(self, test_config):
+        """测试星标数预先分箱，只保留各箱计数"""
+        generator = ChartGenerator(test_config)
+
+        bar = generator._histogram_bar([0, 10, 10, 20, 100], 4)
+
+        assert list(bar.y) == [4, 0, 0, 1]
+        assert list(bar.x) == [12.5, 37.5, 62.5, 87.5]
+        assert list(bar.width) == [25.0] * 4
@@ -0,0 +1,199 @@
+"""
+每日记录管理器测试
+"""
+
+import json
+import sqlite3
+import pytest
+from datetime import datetime
+from utils.daily_records import DailyRecordsManager
+
+
+class TestDailyRecordsManager:
+    """每日记录管理器测试类"""
+
+    @pytest.fixture
+    def ai_projects(self, sample_projects):
+        """带AI分类结果的项目"""
+        for project in sample_projects:
+            project['ai_classification'] = {
+                'is_ai_related': True,
+                'confidence_score': 0.9,
+                'ai_categories': ['Machine Learning', 'NLP'] if project['source'] == 'github' else ['NLP']
+            }
+        return sample_projects
+
+    def test_save_and_get_daily_record(self, test_config, sample_projects, ai_projects):
+        """测试保存并读取每日记录"""
+        manager = DailyRecordsManager(test_config)
+
+        assert manager.save_daily_record('2023-12-01', sample_projects, ai_projects)
+
+        record = manager.get_daily_record('2023-12-01')
+
+        assert record is not None
+        assert record['summary']['total_projects'] == 3
+        assert record['summary']['ai_projects'] == 3
+        assert record['summary']['top_project_name'] == 'awesome-ai-project'
+        assert record['summary']['top_project_stars'] == 1500
+
+        assert [p['project_name'] for p in record['projects']] == \
+            ['awesome-ai-project', 'ml-toolkit', 'chatbot-framework']
+        assert [p['rank_in_day'] for p in record['projects']] == [1, 2, 3]
+
+    def test_save_trend_stats(self, test_config, sample_projects, ai_projects):
+        """测试趋势统计"""
+        manager = DailyRecordsManager(test_config)
+        manager.save_daily_record('2023-12-01', sample_projects, ai_projects)
+
+        stats = manager.get_daily_record('2023-12-01')['stats']
+        stat_values = {(s['stat_type'], s['stat_name']): s['stat_value'] for s in stats}
+
+        assert stat_values[('language', 'Python')] == 2
+        assert stat_values[('language', 'JavaScript')] == 1
+        assert stat_values[('category', 'NLP')] == 3
+        assert stat_values[('category', 'Machine Learning')] == 2
+
+    def test_save_daily_record_replaces_same_day(self, test_config, sample_projects, ai_projects):
+        """测试重复保存同一天时覆盖旧数据"""
+        manager = DailyRecordsManager(test_config)
+
+        manager.save_daily_record('2023-12-01', sample_projects, ai_projects)
+        manager.save_daily_record('2023-12-01', sample_projects, ai_projects[:1])
+
+        record = manager.get_daily_record('2023-12-01')
+
+        assert record['summary']['ai_projects'] == 1
+        assert len(record['projects']) == 1
+        assert len([s for s in record['stats'] if s['stat_type'] == 'language']) == 1
+
+    def test_export_records(self, test_config, sample_projects, ai_projects):
+        """测试导出记录"""
+        manager = DailyRecordsManager(test_config)
+        manager.save_daily_record('2023-12-01', sample_projects, ai_projects)
+        manager.save_daily_record('2023-12-03', sample_projects, ai_projects[:1])
+
+        file_path = manager.export_records('2023-12-01', '2023-12-03', 'json')
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+
+        assert [r['summary']['date'] for r in records] == ['2023-12-01', '2023-12-03']
+        assert len(records[0]['projects']) == 3
+        assert len(records[1]['projects']) == 1
+        assert json.loads(records[0]['projects'][0]['ai_categories']) == ['Machine Learning', 'NLP']
+
+    def test_export_records_ndjson(self, test_config, sample_projects, ai_projects):
+        """测试以NDJSON格式导出"""
+        manager = DailyRecordsManager(test_config)
+        manager.save_daily_record('2023-12-01', sample_projects, ai_projects)
+        manager.save_daily_record('2023-12-03', sample_projects, ai_projects[:1])
+
+        file_path = manager.export_records('2023-12-01', '2023-12-03', 'ndjson')
+
+        assert file_path.endswith('.ndjson')
+        with open(file_path, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+
+        assert [r['summary']['date'] for r in records] == ['2023-12-01', '2023-12-03']
+        assert len(records[1]['projects']) == 1
+
+    def test_export_records_default_and_unknown_format(self, test_config, sample_projects, ai_projects):
+        """测试默认导出JSON数组，未知格式不生成文件并返回None"""
+        manager = DailyRecordsManager(test_config)
+        manager.save_daily_record('2023-12-01', sample_projects, ai_projects)
+
+        file_path = manager.export_records('2023-12-01', '2023-12-03')
+
+        assert file_path.endswith('.json')
+        with open(file_path, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)) == 1
+
+        assert manager.export_records('2023-12-01', '2023-12-03', 'csv') is None
+        assert not (manager.output_dir / 'exports' / 'ai_trends_2023-12-01_to_2023-12-03.csv').exists()
+
+    def test_iter_records_between(self, test_config, sample_projects, ai_projects, monkeypatch):
+        """测试逐日迭代的记录与逐日查询一致，并跳过没有记录的日期"""
+        monkeypatch.setattr('utils.daily_records._FETCH_BATCH_SIZE', 2)
+        manager = DailyRecordsManager(test_config)
+        manager.save_daily_record('2023-12-01', sample_projects, ai_projects)
+        manager.save_daily_record('2023-12-03', sample_projects, ai_projects[1:])
+
+        records = list(manager.iter_records_between('2023-12-01', '2023-12-04'))
+
+        assert records == [manager.get_daily_record('2023-12-01'),
+                           manager.get_daily_record('2023-12-03')]
+
+    def test_connection_pragmas(self, test_config):
+        """测试连接使用WAL模式"""
+        manager = DailyRecordsManager(test_config)
+
+        assert manager._conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert manager._conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert manager._conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0] == 10000
+
+    def test_read_only_connection(self, test_config, sample_projects, ai_projects):
+        """测试读路径使用只读连接，且能读到写连接提交的数据"""
+        manager = DailyRecordsManager(test_config)
+
+        assert manager._ro_conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            manager._ro_conn.execute("DELETE FROM daily_records")
+
+        manager.save_daily_record('2023-12-01', sample_projects, ai_projects)
+        assert manager.get_daily_record('2023-12-01') is not None
+
+    def test_date_indexes(self, test_config):
+        """测试按日期查询使用索引"""
+        manager = DailyRecordsManager(test_config)
+
+        plan = manager._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM daily_projects WHERE date = ?", ('2023-12-01',)
+        ).fetchall()
+        assert 'idx_daily_projects_date' in str(plan)
+
+        plan = manager._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM trend_stats WHERE date = ?", ('2023-12-01',)
+        ).fetchall()
+        assert 'idx_trend_stats_date_type' in str(plan)
+
+    def test_close(self, test_config):
+        """测试关闭数据库连接"""
+        manager = DailyRecordsManager(test_config)
+
+        manager.close()
+        manager.close()  # 重复关闭不报错
+
+        assert manager._conn is None
+        assert manager._ro_conn is None
+
+    def test_get_missing_record(self, test_config):
+        """测试读取不存在的记录"""
+        manager = DailyRecordsManager(test_config)
+
+        assert manager.get_daily_record('2000-01-01') is None
+
+    def test_get_records_between(self, test_config, sample_projects, ai_projects):
+        """测试范围查询与逐日查询结果一致"""
+        manager = DailyRecordsManager(test_config)
+        manager.save_daily_record('2023-12-01', sample_projects, ai_projects)
+        manager.save_daily_record('2023-12-02', sample_projects, ai_projects[1:])
+        manager.save_daily_record('2023-12-05', sample_projects, ai_projects[:1])
+
+        records = manager.get_records_between('2023-12-01', '2023-12-04')
+
+        assert records == [manager.get_daily_record('2023-12-01'),
+                           manager.get_daily_record('2023-12-02')]
+
+    def test_get_recent_and_trend(self, test_config, sample_projects, ai_projects):
+        """测试合并查询与分别查询结果一致"""
+        manager = DailyRecordsManager(test_config)
+        today = datetime.now().date().isoformat()
+        manager.save_daily_record(today, sample_projects, ai_projects)
+
+        records, trend = manager.get_recent_and_trend(7)
+
+        assert records == manager.get_recent_records(7)
+        assert trend == manager.get_trend_analysis(7)
+        assert [r['date'] for r in records] == [today]
+        assert trend['language_trends'][0]['stat_name'] == 'Python'
@@ -2,7 +2,9 @@
 数据清洗器测试
 """
 
+import random
 import pytest
+from datasketch import MinHashLSH
 from utils.data_cleaner import DataCleaner
 
 
@@ -217,6 +219,36 @@ class TestDataCleaner:
         project1 = next(p for p in deduplicated if p['name'] == 'project1')
         assert project1['stars'] == 150
     
+    def test_deduplicate_similar_items(self, test_config):
+        """测试URL不同但内容相似的项目被合并"""
+        cleaner = DataCleaner(test_config)
+        
+        projects = [
+            {
+                'name': 'awesome-ai-project',
+                'description': 'An awesome AI project for machine learning',
+                'url': 'https://github.com/user/awesome-ai-project',
+                'stars': 100
+            },
+            {
+                'name': 'another-project',
+                'description': 'Something completely unrelated',
+                'url': 'https://github.com/other/another-project',
+                'stars': 50
+            },
+            {
+                'name': 'awesome-ai-project',
+                'description': 'An awesome AI project for machine learning',
+                'url': 'https://github.com/user/awesome-ai-project/',
+                'stars': 300
+            }
+        ]
+        
+        deduplicated = cleaner.deduplicate(projects)
+        
+        assert [p['name'] for p in deduplicated] == ['awesome-ai-project', 'another-project']
+        assert deduplicated[0]['stars'] == 300
+    
     def test_clean_and_deduplicate(self, test_config, sample_projects):
         """测试完整的清洗和去重流程"""
         cleaner = DataCleaner(test_config)
@@ -245,3 +277,112 @@ class TestDataCleaner:
             assert isinstance(project['stars'], int)  # 星数为整数
             if project.get('url'):
                 assert project['url'].startswith('http')  # URL有协议
+    
+    def test_clean_batch(self, test_config):
+        """测试按列批量清洗与逐项清洗结果一致"""
+        cleaner = DataCleaner(test_config)
+        
+        raw_data = [
+            {'name': '  my   project 🚀 ', 'description': 'desc\n with  spaces', 'url': ' github.com/a/b ',
+             'stars': '1.2k', 'author': ' bob ', 'tags': ['AI', 'ai'], 'source': 'github'},
+            {'name': 'x', 'description': 'too short name', 'url': 'https://x.com'},
+            {'name': 'no-link', 'description': '', 'url': ''},
+            {'name': 'desc-only', 'description': 'has description'}
+        ]
+        
+        now_iso = '2023-12-01T12:00:00'
+        result = cleaner.clean_batch(raw_data, now_iso)
+        
+        expected = [cleaner.clean_single_item(item, now_iso) for item in raw_data]
+        expected = [item for item in expected if cleaner.is_valid_item(item)]
+        
+        assert [item['name'] for item in result] == ['my project', 'desc-only']
+        assert result == expected
+        assert all(item['cleaned_at'] == now_iso for item in result)
+    
+    def test_values_similar_threshold(self, test_config):
+        """测试代表性项目对在默认阈值下的相似判断"""
+        cleaner = DataCleaner(test_config)
+        description = ('An open source framework for building retrieval augmented generation pipelines '
+                       'with vector databases, document loaders, rerankers and evaluation tools for '
+                       'large language model applications in production environments.')
+        typos = (description.replace('framework', 'framwork').replace('retrieval', 'retreival')
+                 .replace('pipelines', 'pipelnes').replace('databases', 'databses'))
+        pairs = [
+            ({'name': 'awesome-ai-project', 'description': 'An awesome AI project',
+              'url': 'https://github.com/user/awesome-ai-project'},
+             {'name': 'awesome-ai-project', 'description': 'An awesome AI project!',
+              'url': 'https://github.com/user/awesome-ai-project/'}, True),
+            ({'name': 'ml-toolkit', 'description': 'Machine learning toolkit',
+              'url': 'https://github.com/a/ml-toolkit'},
+             {'name': 'ml-tool-kit', 'description': 'Machine learning tool kit',
+              'url': 'https://github.com/b/ml-tool-kit'}, True),
+            ({'name': 'chatbot-framework', 'description': 'A chatbot framework',
+              'url': 'https://github.com/a/chatbot-framework'},
+             {'name': 'vision-framework', 'description': 'A vision framework',
+              'url': 'https://github.com/a/vision-framework'}, False),
+            # 长描述中的少量拼写差异：Indel相似度约0.99，SequenceMatcher（autojunk）仅约0.84
+            ({'name': '', 'description': description, 'url': ''},
+             {'name': '', 'description': typos, 'url': ''}, True),
+        ]
+        
+        for item1, item2, expected in pairs:
+            values1 = cleaner.normalize_compare_values(item1)
+            values2 = cleaner.normalize_compare_values(item2)
+            assert cleaner.values_similar(values1, values2) is expected
+    
+    def test_first_similar(self, test_config):
+        """测试批量相似度计算与逐对比较一致"""
+        cleaner = DataCleaner(test_config)
+        
+        values = cleaner.normalize_compare_values({
+            'name': 'ai-toolkit', 'description': 'A toolkit for AI', 'url': 'https://github.com/a/ai-toolkit'
+        })
+        candidates = [
+            cleaner.normalize_compare_values({'name': 'web-server', 'description': 'HTTP server', 'url': ''}),
+            cleaner.normalize_compare_values({'name': 'ai-toolkits', 'description': '', 'url': ''}),
+            cleaner.normalize_compare_values({'name': 'ai-toolkit', 'description': 'A toolkit for AI!', 'url': ''})
+        ]
+        
+        expected = [cleaner.values_similar(values, candidate) for candidate in candidates]
+        
+        assert expected == [False, True, True]
+        assert cleaner.first_similar(values, candidates) == 1
+        assert cleaner.first_similar(values, candidates[:1]) is None
+    
+    def test_lsh_candidates_cover_similar_pairs(self, test_config):
+        """测试默认阈值下LSH候选项覆盖逐对比较判定的全部相似项"""
+        cleaner = DataCleaner(test_config)
+        words = 'ai agent llm vision speech model toolkit framework graph data rag chat'.split()
+        
+        def mutate(text, rng, edits):
+            chars = list(text)
+            for _ in range(edits):
+                chars[rng.randrange(len(chars))] = rng.choice('abcdefghijklmnop ')
+            return ''.join(chars)
+        
+        for seed in range(20):
+            rng = random.Random(seed)
+            items = []
+            for i in range(20):
+                name = '-'.join(rng.sample(words, 3))
+                description = ' '.join(rng.sample(words, 6)) + ' project'
+                url = f'https://github.com/u{i}/{name}'
+                items.append({'name': name, 'description': description, 'url': url})
+                items.append({
+                    'name': mutate(name, rng, rng.randint(0, 2)),
+                    'description': mutate(description, rng, rng.randint(0, 4)),
+                    'url': url + rng.choice(['', '/', '-x'])
+                })
+            
+            values = [cleaner.normalize_compare_values(item) for item in items]
+            minhashes = [cleaner.build_minhash(item) for item in items]
+            lsh = MinHashLSH(threshold=cleaner.lsh_threshold, num_perm=cleaner.num_perm)
+            for i, minhash in enumerate(minhashes):
+                lsh.insert(i, minhash)
+            
+            for i in range(len(items)):
+                candidates = set(lsh.query(minhashes[i]))
+                for j in range(i + 1, len(items)):
+                    if cleaner.values_similar(values[i], values[j]):
+                        assert j in candidates, (seed, items[i], items[j])
@@ -2,6 +2,7 @@
 GitHub爬虫测试
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from crawlers.github_crawler import GitHubCrawler
@@ -132,6 +133,39 @@ class TestGitHubCrawler:
         assert projects[0]['name'] == 'test-project'
         assert projects[1]['name'] == 'another-project'
     
+    def test_parse_project_list_ignores_page_chrome(self, test_config):
+        """测试只解析项目条目，忽略页面其他部分"""
+        crawler = GitHubCrawler(test_config)
+        
+        html = '''
+        <html>
+        <body>
+            <nav><h2 class="h3"><a href="/nav/link">nav/link</a></h2></nav>
+            <article class="Box-row extra-class">
+                <h2 class="h3">
+                    <a href="/user/test-project">user/test-project</a>
+                </h2>
+                <a href="/user/test-project/stargazers">1.2k</a>
+            </article>
+        </body>
+        </html>
+        '''
+        
+        projects = crawler.parse_project_list(html)
+        
+        assert len(projects) == 1
+        assert projects[0]['name'] == 'test-project'
+        assert projects[0]['stars'] == 1200
+    
+    def test_parse_project_list_shared_timestamp(self, test_config, mock_html_content):
+        """测试同一批次的项目共用时间戳"""
+        crawler = GitHubCrawler(test_config)
+        
+        projects = crawler.parse_project_list(mock_html_content, '2024-01-01T00:00:00')
+        
+        assert len(projects) == 1
+        assert projects[0]['updated_at'] == '2024-01-01T00:00:00'
+    
     def test_deduplicate_projects(self, test_config):
         """测试项目去重"""
         crawler = GitHubCrawler(test_config)
@@ -180,6 +214,40 @@ class TestGitHubCrawler:
         assert projects[0]['time_range'] == 'daily'
         assert 'crawled_at' in projects[0]
     
+    @pytest.mark.asyncio
+    async def test_parse_project_list_async_pool(self, test_config, mock_html_content):
+        """测试在解析进程池中解析项目列表"""
+        from concurrent.futures import ProcessPoolExecutor
+        
+        crawler = GitHubCrawler(test_config)
+        crawler._parse_pool = ProcessPoolExecutor(max_workers=1)
+        try:
+            projects = await crawler.parse_project_list_async(mock_html_content)
+        finally:
+            crawler._parse_pool.shutdown()
+        
+        assert len(projects) == 1
+        assert projects[0]['name'] == 'test-project'
+        assert projects[0]['stars'] == 1234
+    
+    def test_parse_worker_builds_parse_only_crawler(self, test_config, temp_dir, mock_html_content,
+                                                    monkeypatch):
+        """测试解析子进程内的爬虫实例不加载去重过滤器、不创建进程池"""
+        from crawlers import base_crawler
+        
+        monkeypatch.setattr(base_crawler, '_worker_crawlers', {})
+        test_config['crawler']['seen_filter'] = {'enabled': True, 'path': str(temp_dir / 'seen_urls.bloom')}
+        test_config['crawler']['parse_workers'] = 4
+        
+        projects = base_crawler._parse_project_list_in_worker(GitHubCrawler, test_config, mock_html_content)
+        crawler = base_crawler._worker_crawlers[GitHubCrawler]
+        
+        assert projects[0]['name'] == 'test-project'
+        assert crawler.parse_only
+        assert crawler.seen_urls is None
+        assert crawler.parse_workers == 0
+        assert 'parse_only' not in test_config['crawler']
+    
     @pytest.mark.asyncio
     @patch('crawlers.github_crawler.GitHubCrawler.fetch_page')
     async def test_crawl_language_timerange_no_data(self, mock_fetch, test_config):
@@ -206,6 +274,46 @@ class TestGitHubCrawler:
         
         assert len(projects) == 0
     
+    @pytest.mark.asyncio
+    async def test_shared_session(self, test_config):
+        """测试多个爬虫共享同一个HTTP会话"""
+        from crawlers.base_crawler import BaseCrawler
+        from crawlers.producthunt_crawler import ProductHuntCrawler
+        
+        test_config['crawler']['parse_workers'] = 0
+        github_crawler = GitHubCrawler(test_config)
+        ph_crawler = ProductHuntCrawler(test_config)
+        
+        try:
+            async with github_crawler:
+                github_session = github_crawler.session
+            async with ph_crawler:
+                assert ph_crawler.session is github_session
+            
+            # 退出上下文不会关闭共享会话
+            assert not github_session.closed
+        finally:
+            await BaseCrawler.close_shared_session()
+        
+        assert github_session.closed
+    
+    def test_shared_session_replaced_on_new_loop(self):
+        """测试在新的事件循环中获取共享会话时关闭旧循环上的会话"""
+        from crawlers.base_crawler import BaseCrawler
+        
+        first = asyncio.run(BaseCrawler.get_shared_session())
+        
+        async def second_run():
+            try:
+                return await BaseCrawler.get_shared_session()
+            finally:
+                await BaseCrawler.close_shared_session()
+        
+        second = asyncio.run(second_run())
+        
+        assert second is not first
+        assert first.closed
+    
     @pytest.mark.asyncio
     async def test_crawl_integration(self, test_config):
         """测试完整爬取流程（集成测试）"""
@@ -227,6 +335,86 @@ class TestGitHubCrawler:
             # 网络问题不应该导致测试失败
             pytest.skip(f"Network request failed: {e}")
     
+    def test_filter_seen_projects(self, test_config, temp_dir):
+        """测试跨运行去重"""
+        test_config['crawler']['seen_filter'] = {
+            'enabled': True,
+            'path': str(temp_dir / 'seen_urls.bloom'),
+            'capacity': 1000
+        }
+        projects = [
+            {'url': 'https://github.com/user/project1', 'name': 'project1'},
+            {'url': 'https://github.com/user/project2', 'name': 'project2'},
+        ]
+        
+        first_run = GitHubCrawler(test_config).filter_seen_projects(projects)
+        assert len(first_run) == 2
+        
+        # 新的爬虫实例从磁盘加载已见过的URL
+        projects.append({'url': 'https://github.com/user/project3', 'name': 'project3'})
+        second_run = GitHubCrawler(test_config).filter_seen_projects(projects)
+        assert [p['name'] for p in second_run] == ['project3']
+    
+    def test_filter_seen_projects_shared_file(self, test_config, temp_dir):
+        """测试多个爬虫实例先后保存时不会覆盖彼此记录的URL"""
+        test_config['crawler']['seen_filter'] = {
+            'enabled': True,
+            'path': str(temp_dir / 'seen_urls.bloom'),
+            'capacity': 1000
+        }
+        first, second = GitHubCrawler(test_config), GitHubCrawler(test_config)
+        project1 = {'url': 'https://github.com/user/project1', 'name': 'project1'}
+        project2 = {'url': 'https://github.com/user/project2', 'name': 'project2'}
+        
+        first.filter_seen_projects([project1])
+        second.filter_seen_projects([project2])
+        
+        next_run = GitHubCrawler(test_config)
+        assert next_run.filter_seen_projects([project1, project2]) == []
+        assert len(next_run.seen_urls) == 2
+    
+    @pytest.mark.parametrize('content', [b'', b'\x00' * 7, b'\x40\x00' + b'\x00' * 14 + b'\xff'])
+    def test_filter_seen_projects_corrupt_file(self, test_config, temp_dir, monkeypatch, content):
+        """测试过滤器文件截断或损坏时告警并从空过滤器开始"""
+        path = temp_dir / 'seen_urls.bloom'
+        path.write_bytes(content)
+        test_config['crawler']['seen_filter'] = {'enabled': True, 'path': str(path), 'capacity': 1000}
+        warning = Mock()
+        monkeypatch.setattr('utils.bloom_filter.logger.warning', warning)
+        project = {'url': 'https://github.com/user/project1', 'name': 'project1'}
+        
+        crawler = GitHubCrawler(test_config)
+        
+        assert len(crawler.seen_urls) == 0
+        assert warning.called
+        assert crawler.filter_seen_projects([project]) == [project]
+        assert GitHubCrawler(test_config).filter_seen_projects([project]) == []
+    
+    def test_filter_seen_projects_parameters_changed(self, test_config, temp_dir, monkeypatch):
+        """测试文件参数与当前过滤器不一致时告警后覆盖"""
+        path = temp_dir / 'seen_urls.bloom'
+        project1 = {'url': 'https://github.com/user/project1', 'name': 'project1'}
+        project2 = {'url': 'https://github.com/user/project2', 'name': 'project2'}
+        test_config['crawler']['seen_filter'] = {'enabled': True, 'path': str(path), 'capacity': 1000}
+        crawler = GitHubCrawler(test_config)
+        
+        # 另一实例以不同容量写入文件
+        test_config['crawler']['seen_filter']['capacity'] = 5000
+        GitHubCrawler(test_config).filter_seen_projects([project1])
+        
+        warning = Mock()
+        monkeypatch.setattr('utils.bloom_filter.logger.warning', warning)
+        crawler.filter_seen_projects([project2])
+        
+        assert '无法合并' in warning.call_args[0][0]
+    
+    def test_filter_seen_projects_disabled(self, test_config):
+        """测试未开启跨运行去重时原样返回"""
+        crawler = GitHubCrawler(test_config)
+        projects = [{'url': 'https://github.com/user/project1', 'name': 'project1'}]
+        
+        assert crawler.filter_seen_projects(projects) is projects
+    
     def test_standardize_project_data(self, test_config):
         """测试项目数据标准化"""
         crawler = GitHubCrawler(test_config)
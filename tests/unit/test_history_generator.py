@@ -0,0 +1,192 @@
+"""
+历史记录页面生成器测试
+"""
+
+import pytest
+from datetime import date, timedelta
+from pathlib import Path
+from visualization.history_generator import (
+    HistoryPageGenerator, _dumps_json, _format_record_date, _get_template, _render_doughnut_svg,
+    _render_line_svg
+)
+
+
+class TestHistoryPageGenerator:
+    """历史记录页面生成器测试类"""
+
+    @pytest.fixture
+    def generator(self, test_config, sample_projects):
+        """已保存最近两天记录的生成器"""
+        generator = HistoryPageGenerator(test_config)
+        today = date.today()
+        for offset in (1, 0):
+            day = (today - timedelta(days=offset)).isoformat()
+            generator.records_manager.save_daily_record(day, sample_projects, sample_projects[offset:])
+        yield generator
+        generator.records_manager.close()
+
+    def test_generate_history_page(self, generator):
+        """测试生成历史记录页面，每天一张记录卡片"""
+        html = Path(generator.generate_history_page(7)).read_text(encoding='utf-8')
+
+        assert html.count('class="record-card"') == 2
+        assert 'awesome-ai-project' in html
+        assert f'data-date="{date.today().isoformat()}"' in html
+
+    def test_format_record_date(self):
+        """测试记录日期格式化，无法解析时原样返回"""
+        assert _format_record_date('2023-12-01') == ('12月01日', '周五')
+        assert _format_record_date('bad-date') == ('bad-date', '')
+        assert _format_record_date(None) == (None, '')
+
+    def test_reuse_page_when_records_unchanged(self, generator, sample_projects, monkeypatch):
+        """测试记录未变化时复用已生成的页面，记录变化后重新生成"""
+        renders = []
+        stream_html = generator._stream_html
+        monkeypatch.setattr(generator, '_stream_html',
+                            lambda *args: renders.append(args) or stream_html(*args))
+
+        path = generator.generate_history_page(7)
+        assert generator.generate_history_page(7) == path
+        assert len(renders) == 1
+
+        generator.records_manager.save_daily_record(date.today().isoformat(), sample_projects, sample_projects[:1])
+
+        assert generator.generate_history_page(7) == path
+        assert len(renders) == 2
+
+    def test_reuse_page_across_instances(self, generator, test_config, monkeypatch):
+        """测试输入摘要保存在磁盘上，新的生成器实例也能复用已生成的页面"""
+        path = generator.generate_history_page(7)
+
+        other = HistoryPageGenerator(test_config)
+        monkeypatch.setattr(other, '_stream_html', lambda *args: pytest.fail('页面不应重新渲染'))
+
+        assert other.generate_history_page(7) == path
+        other.records_manager.close()
+
+    def test_escape_record_fields(self, test_config):
+        """测试记录字段与图表数据经过转义，无法注入标签或脚本"""
+        generator = HistoryPageGenerator(test_config)
+        payload = "</script><script>alert('x')</script>"
+        record = {
+            'date': "2023-12-01');alert(1);('", 'total_projects': 1, 'ai_projects': 1,
+            'summary': payload, 'top_project_name': payload, 'top_project_url': 'https://a.b/?x=1&y=2',
+            'top_project_stars': 10
+        }
+        trend_data = {'daily_counts': [], 'language_trends': [{'stat_name': payload, 'avg_percentage': 1}]}
+
+        html = ''.join(generator._stream_html([record], trend_data))
+        generator.records_manager.close()
+
+        assert payload not in html
+        assert "onclick='viewDetails(\"2023-12-01\\u0027);alert(1);(\\u0027\")'" in html
+        assert '&lt;/script&gt;' in html
+        assert '<title>&lt;/script&gt;&lt;script&gt;alert(&#39;x&#39;)&lt;/script&gt;: 1</title>' in html
+        assert 'https://a.b/?x=1&amp;y=2' in html
+
+    def test_dumps_json_options(self):
+        """测试tojson的sort_keys与indent参数生效"""
+        data = {'b': '中文', 'a': 1}
+
+        assert _dumps_json(data) == '{"b":"中文","a":1}'
+        assert _dumps_json(data, sort_keys=True) == '{"a":1,"b":"中文"}'
+        assert _dumps_json(data, sort_keys=True, indent=2) == '{\n  "a": 1,\n  "b": "中文"\n}'
+        assert _dumps_json(data, indent=4).startswith('{\n    "b"')
+        assert _get_template('{{ data|tojson }}').render(data=data) == '{"a":1,"b":"中文"}'
+
+    def test_render_svg_charts(self):
+        """测试趋势图在服务端渲染为SVG，每个数据点/分类各一个元素"""
+        line = _render_line_svg(['2023-12-01', '2023-12-02', '2023-12-03'], [1, 4, 2])
+        doughnut = _render_doughnut_svg(['Python', 'Go'], [75.0, 25.0])
+
+        assert line.startswith('<svg') and line.count('<circle') == 3
+        assert 'stroke-dasharray="447.68 149.23"' in doughnut
+        assert doughnut.count('<title>') == 2
+
+        assert '<polyline' not in _render_line_svg([], [])
+        assert '<title>' not in _render_doughnut_svg(['Python'], [0])
+
+    def test_reuse_unchanged_record_cards(self, test_config):
+        """测试内容未变化的记录卡片直接复用，变化的记录重新渲染"""
+        generator = HistoryPageGenerator(test_config)
+        records = [{'date': '2023-12-01', 'ai_projects': 1}, {'date': '2023-12-02', 'ai_projects': 2}]
+
+        first = generator._render_record_cards(records)
+        records[1] = {'date': '2023-12-02', 'ai_projects': 3}
+        second = generator._render_record_cards(records)
+        generator.records_manager.close()
+
+        assert second[0] is first[0]
+        assert second[1] is not first[1]
+        assert len(generator._card_cache) == 2
+
+    def test_record_cards_cached_on_disk(self, test_config, monkeypatch):
+        """测试已渲染的卡片保存在磁盘上，新的生成器实例直接读取，不再出现的卡片被清理"""
+        records = [{'date': '2023-12-01', 'ai_projects': 1}, {'date': '2023-12-02', 'ai_projects': 2}]
+        generator = HistoryPageGenerator(test_config)
+        first = generator._render_record_cards(records)
+        generator.records_manager.close()
+
+        other = HistoryPageGenerator(test_config)
+        monkeypatch.setattr('visualization.history_generator._card_context',
+                            lambda record: pytest.fail('卡片不应重新渲染'))
+        second = other._render_record_cards(records)
+        other.records_manager.close()
+
+        assert second == first
+        assert len(list(other._card_dir.glob('*.html'))) == 2
+
+        monkeypatch.undo()
+        other._render_record_cards(records[:1])
+        assert len(list(other._card_dir.glob('*.html'))) == 1
+
+    def test_templates_compiled_once(self, generator):
+        """测试模板首次使用时编译，之后复用同一个编译结果"""
+        _get_template.cache_clear()
+
+        generator.generate_history_page(7)
+        generator._page_key_path.unlink()
+        generator.generate_history_page(7)
+
+        assert _get_template.cache_info().misses == 2
+        assert _get_template.cache_info().hits > 0
+
+    def test_write_failure_returns_empty_path(self, generator):
+        """测试页面写入失败时记录错误并返回空路径"""
+        generator.output_dir = generator.output_dir / 'missing' / 'dir'
+
+        assert generator.generate_history_page(7) == ""
+
+    def test_render_failure_keeps_previous_page(self, generator, monkeypatch):
+        """测试渲染中途失败时保留原页面，不留下临时文件"""
+        path = Path(generator.generate_history_page(7))
+        previous = path.read_text(encoding='utf-8')
+
+        def broken_stream(records, trend_data):
+            raise ValueError('render failed')
+
+        generator._page_key_path.unlink()
+        monkeypatch.setattr(generator, '_stream_html', broken_stream)
+
+        assert generator.generate_history_page(7) == ""
+        assert path.read_text(encoding='utf-8') == previous
+        assert not path.with_suffix('.html.tmp').exists()
+
+    def test_unexpected_render_error_removes_tmp_file(self, generator, monkeypatch):
+        """测试渲染时抛出其他异常也不留下临时文件，原页面保持不变"""
+        path = Path(generator.generate_history_page(7))
+        previous = path.read_text(encoding='utf-8')
+
+        class BrokenStream:
+            def dump(self, f, encoding):
+                f.write(b'<html>')
+                raise TypeError('bad value')
+
+        generator._page_key_path.unlink()
+        monkeypatch.setattr(generator, '_stream_html', lambda records, trend_data: BrokenStream())
+
+        with pytest.raises(TypeError):
+            generator.generate_history_page(7)
+        assert path.read_text(encoding='utf-8') == previous
+        assert not path.with_suffix('.html.tmp').exists()
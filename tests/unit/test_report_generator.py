@@ -0,0 +1,329 @@
+"""
+报告生成器测试
+"""
+
+import os
+import json
+import asyncio
+from collections import deque
+from datetime import datetime
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, Mock
+from utils.config import _parse_prompts, load_prompts
+from visualization.report_generator import (
+    ReportGenerator, _count_projects, _get_template, _load_chart_div, _read_chart_div,
+    _top_project_indices
+)
+
+
+class TestReportGenerator:
+    """报告生成器测试类"""
+
+    @pytest.fixture
+    def generator(self, test_config):
+        """未配置API密钥的报告生成器（使用基础趋势分析）"""
+        test_config['api']['openai']['api_key'] = '${OPENAI_API_KEY}'
+        return ReportGenerator(test_config)
+
+    @pytest.fixture
+    def keyword_projects(self, sample_projects):
+        """带关键词的项目"""
+        for project, keywords in zip(sample_projects, (['ai', 'ml'], ['ml'], ['nlp', 'ai'])):
+            project['keywords'] = {'keywords': keywords}
+        return sample_projects
+
+    @pytest.mark.asyncio
+    async def test_prepare_report_data(self, generator, keyword_projects):
+        """测试报告数据统计"""
+        keyword_projects.append({'name': 'no-language', 'language': '', 'source': 'github'})
+
+        data = await generator._prepare_report_data(keyword_projects)
+
+        assert data['total_projects'] == 4
+        assert [p['name'] for p in data['top_projects'][:2]] == ['awesome-ai-project', 'ml-toolkit']
+        assert data['language_stats'] == [('Python', 2), ('JavaScript', 1)]
+        assert data['keyword_stats'] == [('ai', 2), ('ml', 2), ('nlp', 1)]
+        assert data['trend_analysis']['analysis_method'] == 'basic'
+        assert data['trend_analysis']['hot_trends'] == ['ai', 'ml', 'nlp']
+
+    @pytest.mark.asyncio
+    async def test_top_projects_short_description(self, generator, keyword_projects):
+        """测试热门项目附带截断后的描述，且不修改原项目"""
+        keyword_projects[0]['description'] = 'x' * 250
+        keyword_projects[1]['description'] = None
+
+        top_projects = (await generator._prepare_report_data(keyword_projects))['top_projects']
+
+        assert top_projects[0]['short_description'] == 'x' * 200 + '...'
+        assert top_projects[1]['short_description'] == ''
+        assert top_projects[2]['short_description'] == keyword_projects[2]['description']
+        assert 'short_description' not in keyword_projects[0]
+
+    @pytest.mark.asyncio
+    async def test_count_projects_once_per_report(self, generator, keyword_projects, monkeypatch):
+        """测试一次报告只统计一次项目，统计结果传给后备趋势分析；原地修改项目后统计随之更新"""
+        calls = []
+
+        def counting(projects):
+            calls.append(projects)
+            return _count_projects(projects)
+
+        monkeypatch.setattr('visualization.report_generator._count_projects', counting)
+
+        await generator._prepare_report_data(keyword_projects)
+        assert len(calls) == 1
+
+        for project in keyword_projects:
+            project['language'] = 'Rust'
+        data = await generator._prepare_report_data(keyword_projects)
+
+        assert len(calls) == 2
+        assert data['language_stats'] == [('Rust', 3)]
+        assert data['trend_analysis']['focus_areas'] == ['Rust']
+
+    @pytest.mark.asyncio
+    async def test_trend_analysis_shards_reduced(self, test_config, keyword_projects, tmp_path):
+        """测试分片请求都附带整体统计，并再请求一次汇总为整体分析"""
+        test_config['visualization']['reports']['trend_analysis_shards'] = 2
+        generator = ReportGenerator(test_config)
+        generator.cache_dir = tmp_path
+        generator.trend_prompt = '{projects_summary}'
+
+        def response(hot_trends):
+            content = json.dumps({'hot_trends': hot_trends, 'trend_analysis': ','.join(hot_trends)})
+            return Mock(choices=[Mock(message=Mock(content=content))])
+
+        generator.client = AsyncMock()
+        generator.client.chat.completions.create.side_effect = [
+            response(['RAG', 'Agents']), response(['Agents']), response(['Agents', 'RAG'])
+        ]
+
+        result = await generator._generate_trend_analysis(keyword_projects)
+
+        calls = generator.client.chat.completions.create.call_args_list
+        shard_prompts = [call.kwargs['messages'][1]['content'] for call in calls[:2]]
+        assert all('总项目数: 3' in prompt for prompt in shard_prompts)
+        assert '"trend_analysis":"RAG,Agents"' in calls[2].kwargs['messages'][1]['content']
+        assert result['hot_trends'] == ['Agents', 'RAG']
+        assert result['trend_analysis'] == 'Agents,RAG'
+        assert result['analysis_method'] == 'ai'
+
+    @pytest.mark.asyncio
+    async def test_trend_analysis_merged_when_reduce_fails(self, test_config, keyword_projects, tmp_path):
+        """测试汇总请求失败时按出现次数合并趋势，只保留一段分析文本"""
+        test_config['visualization']['reports']['trend_analysis_shards'] = 2
+        generator = ReportGenerator(test_config)
+        generator.cache_dir = tmp_path
+        generator.trend_prompt = '{projects_summary}'
+
+        def response(hot_trends):
+            content = json.dumps({'hot_trends': hot_trends, 'trend_analysis': ','.join(hot_trends)})
+            return Mock(choices=[Mock(message=Mock(content=content))])
+
+        generator.client = AsyncMock()
+        generator.client.chat.completions.create.side_effect = [
+            response(['RAG', 'Agents']), response(['Agents']), RuntimeError('api down')
+        ]
+
+        result = await generator._generate_trend_analysis(keyword_projects)
+
+        assert result['hot_trends'] == ['Agents', 'RAG']
+        assert result['trend_analysis'] == 'RAG,Agents'
+
+    def test_trend_analysis_not_sharded_by_default(self, generator):
+        """测试默认不分片"""
+        assert generator.trend_shards == 1
+
+    @pytest.mark.asyncio
+    async def test_trend_analysis_falls_back_when_all_shards_fail(self, test_config, keyword_projects):
+        """测试所有分片请求失败时使用基础趋势分析"""
+        generator = ReportGenerator(test_config)
+        generator.cache_ttl_hours = 0
+        generator.client = AsyncMock()
+        generator.client.chat.completions.create.side_effect = RuntimeError('api down')
+
+        result = await generator._generate_trend_analysis(keyword_projects)
+
+        assert result['analysis_method'] == 'basic'
+
+    @pytest.mark.asyncio
+    async def test_cached_completion(self, test_config, tmp_path):
+        """测试相同提示词命中磁盘缓存，过期后重新请求"""
+        generator = ReportGenerator(test_config)
+        generator.cache_dir = tmp_path
+        generator.client = AsyncMock()
+        generator.client.chat.completions.create.return_value = Mock(
+            choices=[Mock(message=Mock(content='{"hot_trends": ["RAG"]}'))]
+        )
+
+        assert await generator._cached_completion('prompt') == '{"hot_trends": ["RAG"]}'
+        assert await generator._cached_completion('prompt') == '{"hot_trends": ["RAG"]}'
+        assert generator.client.chat.completions.create.await_count == 1
+        assert generator.client.chat.completions.create.call_args.kwargs['response_format'] == {'type': 'json_object'}
+        assert [p.name.startswith('trend_') for p in tmp_path.iterdir()] == [True]
+
+        cache_file = next(tmp_path.iterdir())
+        os.utime(cache_file, (0, 0))
+        await generator._cached_completion('prompt')
+        await generator._cached_completion('other prompt')
+
+        assert generator.client.chat.completions.create.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_token_budget_shared_across_generators(self, test_config, generator, monkeypatch):
+        """测试多个生成器共享每分钟token预算，预计超出时先等待最早的记录过期"""
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            ReportGenerator._token_usage.popleft()  # 模拟等待后最早的记录过期
+
+        monkeypatch.setattr(ReportGenerator, '_token_usage', deque())
+        monkeypatch.setattr('visualization.report_generator.asyncio.sleep', fake_sleep)
+        other = ReportGenerator(test_config)
+        generator.tokens_per_minute = other.tokens_per_minute = 1500
+
+        await generator._wait_for_token_budget(1000)
+        await other._wait_for_token_budget(400)
+        await other._wait_for_token_budget(1000)
+
+        assert len(sleeps) == 1 and 59 < sleeps[0] <= 60
+        assert [tokens for _, tokens in ReportGenerator._token_usage] == [400, 1000]
+
+    def test_request_semaphore_created_per_loop(self, generator):
+        """测试并发信号量在运行中的事件循环内创建，同一循环内复用"""
+        async def get_twice():
+            return generator._get_request_semaphore(), generator._get_request_semaphore()
+
+        first, again = asyncio.run(get_twice())
+        second, _ = asyncio.run(get_twice())
+
+        assert first is again
+        assert second is not first
+
+    def test_parse_trend_analysis(self, generator):
+        """测试直接解析JSON响应，无法解析时保留原文"""
+        result = generator._parse_trend_analysis('{"hot_trends": ["RAG"], "trend_analysis": "{ok}"}')
+
+        assert result['hot_trends'] == ['RAG']
+        assert result['trend_analysis'] == '{ok}'
+        assert result['analysis_method'] == 'ai'
+
+        assert generator._parse_trend_analysis('没有JSON')['analysis_method'] == 'text_fallback'
+        assert generator._parse_trend_analysis('["RAG"]')['analysis_method'] == 'text_fallback'
+        assert generator._parse_trend_analysis('{"broken": ')['trend_analysis'] == '{"broken": '
+
+    @pytest.mark.asyncio
+    async def test_generate_reports(self, generator, keyword_projects, tmp_path):
+        """测试HTML报告转义项目字段并嵌入图表，Markdown报告保留原文"""
+        keyword_projects[0]['description'] = '<script>alert(1)</script>'
+        chart_path = tmp_path / 'chart.html'
+        chart_path.write_text('<html><body><div id="chart">plot</div></body></html>', encoding='utf-8')
+        data = await generator._prepare_report_data(keyword_projects)
+
+        html = generator._generate_html_report(data, {'chart': str(chart_path)})
+        markdown = generator._generate_markdown_report(data)
+
+        assert '&lt;script&gt;alert(1)&lt;/script&gt;' in html
+        assert '<script>alert(1)</script>' not in html
+        assert '<div class="chart-container"><div id="chart">plot</div></div>' in html
+        assert '#1 <a href="https://github.com/user/awesome-ai-project"' in html
+        assert '- 📝 **描述**: <script>alert(1)</script>' in markdown
+        assert '- Python: 2 个项目\n- JavaScript: 1 个项目\n' in markdown
+        assert markdown.endswith('*🤖 本报告由AI爆款项目雷达自动生成*\n')
+
+    def test_report_templates_compiled_once(self, generator, keyword_projects):
+        """测试报告模板只编译一次"""
+        data = {'date': '2023-12-01', 'total_projects': 3, 'top_projects': keyword_projects,
+                'trend_analysis': {}, 'language_stats': [], 'keyword_stats': []}
+        _get_template.cache_clear()
+
+        generator._generate_html_report(data, {})
+        generator._generate_html_report(data, {})
+        generator._generate_markdown_report(data)
+
+        assert _get_template.cache_info().misses == 2
+
+    def test_chart_divs_cached_until_file_changes(self, generator, tmp_path):
+        """测试图表div按文件状态缓存，文件更新后重新读取，缺失文件被跳过"""
+        chart_path = tmp_path / 'chart.html'
+        chart_path.write_text('<body><div>v1</div></body>', encoding='utf-8')
+        charts = {'chart': str(chart_path), 'missing': str(tmp_path / 'missing.html')}
+        _load_chart_div.cache_clear()
+
+        assert generator._extract_chart_divs(charts) == '<div class="chart-container"><div>v1</div></div>'
+        generator._extract_chart_divs(charts)
+        assert _load_chart_div.cache_info().hits == 1
+
+        chart_path.write_text('<body><div>v22</div></body>', encoding='utf-8')
+        assert generator._extract_chart_divs(charts) == '<div class="chart-container"><div>v22</div></div>'
+
+    def test_read_chart_div(self, tmp_path):
+        """测试提取最外层图表div，包含嵌套div与非ASCII内容"""
+        chart_path = tmp_path / 'chart.html'
+        chart_path.write_text('<head></head><body><div id="a"><div>语言</div></div><script></script></body>',
+                              encoding='utf-8')
+        empty_path = tmp_path / 'empty.html'
+        empty_path.write_text('<body></div><div></body>', encoding='utf-8')
+
+        assert _read_chart_div(str(chart_path)) == '<div id="a"><div>语言</div></div>'
+        assert _read_chart_div(str(empty_path)) == ''
+
+    def test_top_project_indices(self):
+        """测试前N个项目按星标数降序选出，并列时保持原有顺序"""
+        stars = np.array([5, 9, 5, 1, 9, 5], dtype=np.int64)
+
+        assert list(_top_project_indices(stars, 4)) == [1, 4, 0, 2]
+        assert list(_top_project_indices(stars, 10)) == [1, 4, 0, 2, 5, 3]
+        assert list(_top_project_indices(stars, 0)) == []
+
+    def test_prepare_projects_summary(self, generator, keyword_projects):
+        """测试提示词概览以紧凑JSON嵌入统计，并列出代表性项目"""
+        summary = generator._prepare_projects_summary(keyword_projects)
+
+        assert '{"Python":2,"JavaScript":1}' in summary
+        assert '{"ai":2,"ml":2,"nlp":1}' in summary
+        assert summary.endswith('3. chatbot-framework - A modern chatbot framework powered by large language models...\n')
+
+    def test_prompts_parsed_once(self, test_config, tmp_path):
+        """测试提示词文件只解析一次，修改后重新解析"""
+        prompts_path = tmp_path / 'prompts.yaml'
+        prompts_path.write_text('trend_analysis_prompt: "v1 {projects_summary}"\n', encoding='utf-8')
+        _parse_prompts.cache_clear()
+
+        assert load_prompts(prompts_path)['trend_analysis_prompt'] == 'v1 {projects_summary}'
+        load_prompts(prompts_path)
+        assert _parse_prompts.cache_info().misses == 1
+
+        prompts_path.write_text('trend_analysis_prompt: "version 2"\n', encoding='utf-8')
+        assert load_prompts(prompts_path)['trend_analysis_prompt'] == 'version 2'
+        assert load_prompts(tmp_path / 'missing.yaml') == {}
+
+    @pytest.mark.asyncio
+    async def test_generate_daily_report(self, generator, keyword_projects):
+        """测试生成每日报告的全部内容"""
+        report = await generator.generate_daily_report(keyword_projects, {})
+
+        assert set(report) == {'html', 'markdown', 'data'}
+        generated_at = datetime.fromisoformat(report['data']['generated_at'])
+        assert report['data']['date'] == generated_at.strftime('%Y-%m-%d')
+        assert f"报告生成时间: {generated_at:%Y-%m-%d %H:%M:%S}" in report['html']
+        assert f"生成时间：{generated_at:%Y-%m-%d %H:%M:%S}" in report['markdown']
+        assert report['html'].lstrip().startswith('<!DOCTYPE html>')
+        assert report['markdown'].startswith('# 🚀 AI爆款项目雷达')
+        assert report['data']['total_projects'] == 3
+
+    def test_read_chart_json(self, tmp_path):
+        """测试优先嵌入图表JSON，由页面中的plotly.js绘制，并转义脚本结束标签"""
+        chart_path = tmp_path / 'language_distribution.html'
+        chart_path.write_text('<body><div>html chart</div></body>', encoding='utf-8')
+        json_path = chart_path.with_suffix('.json')
+        json_path.write_text('{"data": [{"name": "</script>&"}], "layout": {}}', encoding='utf-8')
+
+        embed = _read_chart_div(str(chart_path))
+
+        assert embed.startswith('<div id="chart-language_distribution" class="plotly-graph-div"></div><script>')
+        assert 'Plotly.newPlot("chart-language_distribution", figure.data, figure.layout' in embed
+        assert '"\\u003c/script\\u003e\\u0026"' in embed
+        assert 'html chart' not in embed
@@ -0,0 +1,254 @@
+"""
+数据存储测试
+"""
+
+import os
+from datetime import datetime, timedelta
+import pytest
+from pathlib import Path
+from utils.storage import DataStorage
+
+
+class TestDataStorage:
+    """数据存储测试类"""
+
+    @pytest.fixture
+    def dated_projects(self, sample_projects):
+        """带抓取时间的项目"""
+        for project in sample_projects:
+            project['crawled_at'] = '2023-12-01T08:00:00'
+            project['keywords'] = {'keywords': ['ai', 'ml']}
+        return sample_projects
+
+    def test_save_daily_data(self, test_config, dated_projects):
+        """测试保存每日数据到数据库"""
+        storage = DataStorage(test_config)
+
+        storage.save_daily_data(dated_projects, '2023-12-01')
+
+        projects = storage.get_projects_by_date('2023-12-01')
+
+        assert [p['name'] for p in projects] == ['awesome-ai-project', 'ml-toolkit', 'chatbot-framework']
+        assert projects[0]['tags'] == ['ai', 'machine-learning', 'python']
+
+        stats = storage.get_daily_stats('2023-12-01')
+
+        assert stats['total_projects'] == 3
+        assert stats['top_languages'][0] == ['python', 2]
+        assert stats['top_keywords'] == [['ai', 3], ['ml', 3]]
+
+    def test_save_daily_data_skips_malformed_project(self, test_config, dated_projects):
+        """测试单个项目写入失败时跳过该项目，其余项目和每日统计照常保存"""
+        storage = DataStorage(test_config)
+        malformed = dict(dated_projects[0], name=None, url='https://github.com/test/malformed')
+
+        storage.save_daily_data([malformed] + dated_projects, '2023-12-01')
+
+        projects = storage.get_projects_by_date('2023-12-01')
+
+        assert [p['name'] for p in projects] == ['awesome-ai-project', 'ml-toolkit', 'chatbot-framework']
+        assert storage.get_daily_stats('2023-12-01')['total_projects'] == 4
+
+    def test_daily_stats_json_text(self, test_config, dated_projects):
+        """测试统计JSON以未转义的UTF-8文本保存，可直接用JSON1函数查询"""
+        storage = DataStorage(test_config)
+        dated_projects[0]['language'] = '中文'
+        storage.save_daily_data(dated_projects, '2023-12-01')
+
+        raw, first = storage._conn.execute(
+            "SELECT top_languages, json_extract(top_languages, '$[0][0]') FROM daily_stats"
+        ).fetchone()
+
+        assert '中文' in raw
+        assert first == '中文'
+
+    def test_save_skips_unserializable_project(self, test_config, dated_projects):
+        """测试无法序列化的项目被跳过，其余项目正常保存"""
+        storage = DataStorage(test_config)
+
+        dated_projects[1]['tags'] = {object()}
+        storage._save_to_database(storage._conn.cursor(), dated_projects)
+
+        projects = storage.get_projects_by_date('2023-12-01')
+
+        assert [p['name'] for p in projects] == ['awesome-ai-project', 'chatbot-framework']
+
+    def test_upsert_skips_unchanged_projects(self, test_config, dated_projects):
+        """测试重复保存时只写入有变化或跨天重新抓取的项目"""
+        storage = DataStorage(test_config)
+        cursor = storage._conn.cursor()
+        storage._save_to_database(cursor, dated_projects)
+
+        changes = storage._conn.total_changes
+        dated_projects[0]['stars'] = 2000
+        dated_projects[1]['crawled_at'] = '2023-12-01T20:00:00'
+        dated_projects[2]['crawled_at'] = '2023-12-02T08:00:00'
+        storage._save_to_database(cursor, dated_projects)
+
+        assert storage._conn.total_changes - changes == 2
+        assert [p['stars'] for p in storage.get_projects_by_date('2023-12-01')] == [2000, 800]
+        assert [p['name'] for p in storage.get_projects_by_date('2023-12-02')] == ['chatbot-framework']
+
+    def test_connection_pragmas(self, test_config):
+        """测试连接使用WAL模式"""
+        storage = DataStorage(test_config)
+
+        assert storage._conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert storage._conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert storage._conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    def test_close(self, test_config):
+        """测试关闭数据库连接"""
+        storage = DataStorage(test_config)
+
+        storage.close()
+        storage.close()  # 重复关闭不报错
+
+        assert storage._conn is None
+        assert storage._ro_conn is None
+
+    def test_queries_reuse_read_only_connection(self, test_config, dated_projects):
+        """测试查询复用同一个只读连接，查询结束后不遗留读事务"""
+        storage = DataStorage(test_config)
+        storage.save_daily_data(dated_projects, '2023-12-01')
+        ro_conn = storage._ro_conn
+
+        assert len(storage.get_projects_by_date('2023-12-01')) == 3
+        assert len(list(storage.iter_recent_projects(days=3650))) == 3
+
+        assert storage._ro_conn is ro_conn
+        assert not ro_conn.in_transaction
+
+    def test_get_projects_with_fields(self, test_config, dated_projects):
+        """测试只查询部分字段"""
+        storage = DataStorage(test_config)
+        storage.save_daily_data(dated_projects, '2023-12-01')
+
+        projects = storage.get_projects_by_date('2023-12-01', fields=['name', 'stars', 'keywords'])
+
+        assert projects[0] == {'name': 'awesome-ai-project', 'stars': 1500, 'keywords': {'keywords': ['ai', 'ml']}}
+
+        with pytest.raises(ValueError):
+            storage.get_projects_by_date('2023-12-01', fields=['name; DROP TABLE projects'])
+
+    def test_save_raw_data_parquet(self, test_config, dated_projects):
+        """测试原始数据以Parquet保存并能完整读回"""
+        storage = DataStorage(test_config)
+        dated_projects[0]['ai_classification'] = {'is_ai_related': True, 'ai_categories': ['NLP']}
+        dated_projects[1]['stars'] = '1.2k'  # 类型不一致的列以JSON文本保存
+
+        file_path = storage.save_raw_data(dated_projects, 'github', '20231201_120000')
+
+        assert file_path.endswith('github_20231201_120000.parquet')
+        assert not Path(file_path).with_suffix('.json').exists()
+        assert storage.load_data(file_path) == dated_projects
+
+    def test_save_raw_data_parquet_exact_types(self, test_config):
+        """测试int与float混合、显式None和缺失字段都能原样读回"""
+        storage = DataStorage(test_config)
+        projects = [
+            {'name': 'a', 'stars': 10, 'score': None, 'license': None, 'tags': [1, 2.5]},
+            {'name': 'b', 'stars': 2.5, 'score': 0.5, 'tags': []},
+            {'name': 'c', 'stars': 3, 'license': 'MIT', 'tags': None},
+        ]
+
+        loaded = storage.load_data(storage.save_raw_data(projects, 'github', '20231201_120000'))
+
+        assert loaded == projects
+        assert [type(p['stars']) for p in loaded] == [int, float, int]
+        assert [type(v) for v in loaded[0]['tags']] == [int, float]
+
+    def test_keep_json_sidecar(self, test_config, dated_projects):
+        """测试开启keep_json时额外保留JSON副本"""
+        test_config['data']['keep_json'] = True
+        storage = DataStorage(test_config)
+
+        file_path = storage.save_raw_data(dated_projects, 'github', '20231201_120000')
+        json_path = Path(file_path).with_suffix('.json')
+
+        assert json_path.exists()
+        assert storage.load_data(str(json_path)) == storage.load_data(file_path)
+
+    def test_save_empty_raw_data(self, test_config):
+        """测试保存空数据"""
+        storage = DataStorage(test_config)
+
+        file_path = storage.save_raw_data([], 'github', '20231201_120000')
+
+        assert storage.load_data(file_path) == []
+
+    def test_recent_projects_use_index(self, test_config):
+        """测试最近项目查询走复合索引，无需额外排序"""
+        storage = DataStorage(test_config)
+
+        plan = str(storage._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM projects WHERE crawled_at >= ? "
+            "ORDER BY crawled_at DESC, stars DESC", ('2023-12-01',)
+        ).fetchall())
+
+        assert 'idx_projects_crawled_stars' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_projects_by_date_use_index(self, test_config, dated_projects):
+        """测试按日期查询走索引范围扫描，且不包含相邻日期的项目"""
+        storage = DataStorage(test_config)
+        dated_projects[0]['crawled_at'] = '2023-11-30T23:59:59'
+        dated_projects[2]['crawled_at'] = '2023-12-02T00:00:00'
+        storage.save_daily_data(dated_projects, '2023-12-01')
+
+        plan = str(storage._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM projects WHERE crawled_at >= ? AND crawled_at < ?",
+            ('2023-12-01', '2023-12-02')
+        ).fetchall())
+
+        assert 'USING INDEX' in plan
+        assert [p['name'] for p in storage.get_projects_by_date('2023-12-01')] == ['ml-toolkit']
+
+    def test_get_recent_projects(self, test_config, sample_projects):
+        """测试按抓取时间获取最近项目"""
+        storage = DataStorage(test_config)
+        sample_projects[0]['crawled_at'] = '2000-01-01T08:00:00'
+
+        storage.save_daily_data(sample_projects, '2023-12-01')
+
+        projects = storage.get_recent_projects(days=7, fields=['name'])
+
+        assert [p['name'] for p in projects] == ['ml-toolkit', 'chatbot-framework']
+
+    def test_iter_recent_projects(self, test_config, sample_projects, monkeypatch):
+        """测试流式迭代最近项目，分批读取且迭代中途写入的数据不出现在结果中"""
+        monkeypatch.setattr('utils.storage._FETCH_BATCH_SIZE', 2)
+        storage = DataStorage(test_config)
+        storage.save_daily_data(sample_projects, '2023-12-01')
+
+        projects = storage.iter_recent_projects(days=7, fields=['name', 'tags'])
+        first = next(projects)
+        # 新项目的crawled_at更早，按索引顺序排在尚未读取的批次中
+        crawled_at = (datetime.now() - timedelta(days=1)).isoformat()
+        new_projects = [dict(project, url=project['url'] + '-new', name=project['name'] + '-new',
+                             crawled_at=crawled_at)
+                        for project in sample_projects]
+        storage.save_daily_data(new_projects, '2023-12-01')
+
+        assert first['tags'] == ['ai', 'machine-learning', 'python']
+        rows = [first, *projects]
+        assert len(rows) == 3
+        assert not any(row['name'].endswith('-new') for row in rows)
+        assert len(list(storage.iter_recent_projects(days=7, fields=['name']))) == 6
+
+        with pytest.raises(ValueError):
+            storage.iter_recent_projects(fields=['unknown'])
+
+    def test_cleanup_old_data(self, test_config, sample_projects):
+        """测试过期文件被归档，未过期文件保留"""
+        storage = DataStorage(test_config)
+
+        old_path = Path(storage.save_raw_data(sample_projects, 'github', '20000101_000000'))
+        new_path = Path(storage.save_raw_data(sample_projects, 'github', '20231201_120000'))
+        os.utime(old_path, (0, 0))
+
+        storage.cleanup_old_data()
+
+        assert not old_path.exists()
+        assert (storage.archive_data_path / old_path.name).exists()
+        assert new_path.exists()
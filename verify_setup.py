@@ -85,8 +85,14 @@ def check_dependencies():
         'openai',
         'pandas',
         'numpy',
+        'orjson',
+        'datasketch',
+        'rapidfuzz',
+        'xxhash',
+        'pyarrow',
         'matplotlib',
         'plotly',
+        'jinja2',
         'yaml',  # pyyaml imports as yaml
         'dotenv',  # python-dotenv imports as dotenv
         'loguru',